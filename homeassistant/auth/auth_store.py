@@ -9,7 +9,9 @@ from logging import getLogger
 from typing import Any
 
 from homeassistant.auth.const import ACCESS_TOKEN_EXPIRATION
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.device_registry import EVENT_DEVICE_REGISTRY_UPDATED
+from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from homeassistant.util import dt as dt_util
 
 from . import models
@@ -307,6 +309,18 @@ class AuthStore:
 
         self._perm_lookup = perm_lookup = PermissionLookup(ent_reg, dev_reg)
 
+        @callback
+        def _async_registry_updated(event: Event) -> None:
+            """Invalidate cached permission checks."""
+            perm_lookup.version += 1
+
+        self.hass.bus.async_listen(
+            EVENT_ENTITY_REGISTRY_UPDATED, _async_registry_updated
+        )
+        self.hass.bus.async_listen(
+            EVENT_DEVICE_REGISTRY_UPDATED, _async_registry_updated
+        )
+
         if data is None:
             self._set_defaults()
             return
@@ -48,6 +48,8 @@ class PolicyPermissions(AbstractPermissions):
         """Initialize the permission class."""
         self._policy = policy
         self._perm_lookup = perm_lookup
+        self._entity_results: dict[tuple[str, str], bool] = {}
+        self._entity_results_version = self._perm_lookup_version()
 
     def access_all_entities(self, key: str) -> bool:
         """Check if we have a certain access to all entities."""
@@ -57,6 +59,29 @@ class PolicyPermissions(AbstractPermissions):
         """Return a function that can test entity access."""
         return compile_entities(self._policy.get(CAT_ENTITIES), self._perm_lookup)
 
+    def check_entity(self, entity_id: str, key: str) -> bool:
+        """Check if we can access entity.
+
+        Results are cached until the entity or device registry changes.
+        """
+        if self._entity_results_version != (version := self._perm_lookup_version()):
+            self._entity_results.clear()
+            self._entity_results_version = version
+
+        result = self._entity_results.get((entity_id, key))
+        if result is None:
+            result = self._entity_results[(entity_id, key)] = super().check_entity(
+                entity_id, key
+            )
+        return result
+
+    def _perm_lookup_version(self) -> int | None:
+        """Return the version of the permission lookup, if there is one."""
+        # Users that are not loaded by the auth store have no lookup
+        if self._perm_lookup is None:
+            return None
+        return self._perm_lookup.version
+
     def __eq__(self, other: Any) -> bool:
         """Equals check."""
         return isinstance(other, PolicyPermissions) and other._policy == self._policy
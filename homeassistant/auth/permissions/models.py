@@ -18,3 +18,5 @@ class PermissionLookup:
 
     entity_registry: ent_reg.EntityRegistry = attr.ib()
     device_registry: dev_reg.DeviceRegistry = attr.ib()
+    # Increased when the registries change, to invalidate cached checks
+    version: int = attr.ib(default=0)
@@ -225,7 +225,7 @@ class APIStatesView(HomeAssistantView):
             for state in request.app["hass"].states.async_all()
             if entity_perm(state.entity_id, "read")
         ]
-        return self.json(states)
+        return self.json_states(states)
 
 
 class APIEntityStateView(HomeAssistantView):
@@ -243,7 +243,7 @@ class APIEntityStateView(HomeAssistantView):
 
         state = request.app["hass"].states.get(entity_id)
         if state:
-            return self.json(state)
+            return self.json_states(state)
         return self.json_message("Entity not found.", HTTP_NOT_FOUND)
 
     async def post(self, request, entity_id):
@@ -273,7 +273,7 @@ class APIEntityStateView(HomeAssistantView):
 
         # Read the state back for our response
         status_code = HTTP_CREATED if is_new_state else HTTP_OK
-        resp = self.json(hass.states.get(entity_id), status_code)
+        resp = self.json_states(hass.states.get(entity_id), status_code)
 
         resp.headers.add("Location", f"/api/states/{entity_id}")
 
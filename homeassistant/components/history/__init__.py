@@ -15,6 +15,8 @@ from homeassistant.components import websocket_api
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder import history, models as history_models
 from homeassistant.components.recorder.statistics import (
+    PERIOD_HOUR,
+    PERIODS,
     list_statistic_ids,
     statistics_during_period,
 )
@@ -124,6 +126,7 @@ class LazyState(history_models.LazyState):
         vol.Required("start_time"): str,
         vol.Optional("end_time"): str,
         vol.Optional("statistic_ids"): [str],
+        vol.Optional("period", default=PERIOD_HOUR): vol.In(PERIODS),
     }
 )
 @websocket_api.async_response
@@ -157,6 +160,7 @@ async def ws_get_statistics_during_period(
         start_time,
         end_time,
         msg.get("statistic_ids"),
+        msg["period"],
     )
     connection.send_result(msg["id"], statistics)
 
@@ -235,6 +239,23 @@ class HistoryPeriodView(HomeAssistantView):
 
         minimal_response = "minimal_response" in request.query
 
+        bucket_size = None
+        max_points = None
+        try:
+            if bucket_size_str := request.query.get("bucket_size"):
+                bucket_size = timedelta(seconds=int(bucket_size_str))
+                if bucket_size <= timedelta(0):
+                    raise ValueError
+            if max_points_str := request.query.get("max_points"):
+                max_points = int(max_points_str)
+                if max_points <= 0:
+                    raise ValueError
+        except ValueError:
+            return self.json_message("Invalid downsampling", HTTP_BAD_REQUEST)
+        aggregate = request.query.get("aggregate", history.AGGREGATE_LAST)
+        if aggregate not in history.AGGREGATES:
+            return self.json_message("Invalid aggregate", HTTP_BAD_REQUEST)
+
         hass = request.app["hass"]
 
         if (
@@ -244,6 +265,24 @@ class HistoryPeriodView(HomeAssistantView):
         ):
             return self.json([])
 
+        # The entities are streamed in entity_id order,
+        # the include order needs the whole result
+        if "stream" in request.query and not (self.filters and self.use_include_order):
+            return await self.json_stream(
+                request,
+                self._iter_significant_states,
+                hass,
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                bucket_size,
+                max_points,
+                aggregate,
+            )
+
         return cast(
             web.Response,
             await hass.async_add_executor_job(
@@ -255,9 +294,43 @@ class HistoryPeriodView(HomeAssistantView):
                 include_start_time_state,
                 significant_changes_only,
                 minimal_response,
+                bucket_size,
+                max_points,
+                aggregate,
             ),
         )
 
+    def _iter_significant_states(
+        self,
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        bucket_size,
+        max_points,
+        aggregate,
+    ):
+        """Yield the significant states of each entity from the database."""
+        with session_scope(hass=hass) as session:
+            for _, states in history.iter_significant_states(
+                hass,
+                session,
+                start_time,
+                end_time,
+                entity_ids,
+                self.filters,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                bucket_size,
+                max_points,
+                aggregate,
+            ):
+                yield states
+
     def _sorted_significant_states_json(
         self,
         hass,
@@ -267,6 +340,9 @@ class HistoryPeriodView(HomeAssistantView):
         include_start_time_state,
         significant_changes_only,
         minimal_response,
+        bucket_size,
+        max_points,
+        aggregate,
     ):
         """Fetch significant stats from the database as json."""
         timer_start = time.perf_counter()
@@ -283,6 +359,9 @@ class HistoryPeriodView(HomeAssistantView):
                     include_start_time_state,
                     significant_changes_only,
                     minimal_response,
+                    bucket_size,
+                    max_points,
+                    aggregate,
                 )
             )
 
@@ -2,12 +2,13 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Iterable
 import json
 import logging
+import threading
 from typing import Any
 
-from aiohttp import web
+from aiohttp import hdrs, web
 from aiohttp.typedefs import LooseHeaders
 from aiohttp.web_exceptions import (
     HTTPBadRequest,
@@ -19,13 +20,18 @@ import voluptuous as vol
 
 from homeassistant import exceptions
 from homeassistant.const import CONTENT_TYPE_JSON, HTTP_OK, HTTP_SERVICE_UNAVAILABLE
-from homeassistant.core import Context, is_callback
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.core import Context, State, is_callback
+from homeassistant.helpers.json import JSONEncoder, json_dumps
 
 from .const import KEY_AUTHENTICATED, KEY_HASS
 
 _LOGGER = logging.getLogger(__name__)
 
+# Streamed JSON is written to the client in chunks of about this many bytes
+JSON_STREAM_CHUNK_SIZE = 65536
+# Chunks serialized ahead of the client before the serializing job waits
+JSON_STREAM_MAX_PENDING_CHUNKS = 4
+
 
 class HomeAssistantView:
     """Base view for all views."""
@@ -57,13 +63,123 @@ class HomeAssistantView:
         except (ValueError, TypeError) as err:
             _LOGGER.error("Unable to serialize to JSON: %s\n%s", err, result)
             raise HTTPInternalServerError from err
-        response = web.Response(
-            body=msg,
-            content_type=CONTENT_TYPE_JSON,
-            status=status_code,
-            headers=headers,
+        return _json_response(msg, status_code, headers)
+
+    @staticmethod
+    def json_states(
+        result: State | Iterable[State],
+        status_code: int = HTTP_OK,
+        headers: LooseHeaders | None = None,
+    ) -> web.Response:
+        """Return a JSON response of a state or a list of states.
+
+        The states are inserted with their cached JSON.
+        """
+        try:
+            if isinstance(result, State):
+                msg = result.as_json()
+            else:
+                msg = f"[{','.join(state.as_json() for state in result)}]"
+        except (ValueError, TypeError) as err:
+            _LOGGER.error("Unable to serialize to JSON: %s\n%s", err, result)
+            raise HTTPInternalServerError from err
+        return _json_response(msg.encode("UTF-8"), status_code, headers)
+
+    @staticmethod
+    async def json_stream(
+        request: web.Request,
+        items_job: Callable[..., Iterable[Any]],
+        *args: Any,
+    ) -> web.StreamResponse:
+        """Return a streamed JSON list of the items yielded by a job.
+
+        The job runs in the executor where the items are serialized
+        as they are yielded. They are written to the client in chunks,
+        so the whole response is never held in memory.
+
+        An item that can not be serialized before the first chunk is
+        written results in an internal server error. Once the response
+        started, the connection is closed without ending the response,
+        so the client sees it is incomplete.
+        """
+        hass = request.app[KEY_HASS]
+        chunks: asyncio.Queue[bytes | None] = asyncio.Queue(
+            JSON_STREAM_MAX_PENDING_CHUNKS
         )
-        response.enable_compression()
+        cancel = threading.Event()
+        failed = threading.Event()
+
+        def put_chunk(chunk: bytes | None) -> None:
+            """Wait for room in the queue and put a chunk in it."""
+            asyncio.run_coroutine_threadsafe(chunks.put(chunk), hass.loop).result()
+
+        def serialize_items() -> None:
+            """Serialize the items and queue them in chunks."""
+            items = iter(items_job(*args))
+            try:
+                buffer = [b"["]
+                size = 1
+                separator = b""
+                for item in items:
+                    if cancel.is_set():
+                        return
+                    try:
+                        data = separator + json_dumps(item).encode("UTF-8")
+                    except (ValueError, TypeError) as err:
+                        _LOGGER.error("Unable to serialize to JSON: %s\n%s", err, item)
+                        failed.set()
+                        return
+                    separator = b","
+                    buffer.append(data)
+                    size += len(data)
+                    if size >= JSON_STREAM_CHUNK_SIZE:
+                        put_chunk(b"".join(buffer))
+                        buffer = []
+                        size = 0
+                buffer.append(b"]")
+                put_chunk(b"".join(buffer))
+            finally:
+                # Close a generator in this thread, it may hold a database session
+                if (close := getattr(items, "close", None)) is not None:
+                    close()
+                put_chunk(None)
+
+        async def async_drain() -> None:
+            """Discard the chunks until the job stopped."""
+            while await chunks.get() is not None:
+                pass
+
+        job = hass.async_add_executor_job(serialize_items)
+        response = None
+        finished = False
+        try:
+            while (chunk := await chunks.get()) is not None:
+                if response is None:
+                    response = web.StreamResponse(
+                        headers={hdrs.CONTENT_TYPE: CONTENT_TYPE_JSON}
+                    )
+                    response.enable_compression()
+                    await response.prepare(request)
+                await response.write(chunk)
+            finished = True
+        finally:
+            if not finished:
+                cancel.set()
+                hass.async_create_task(async_drain())
+
+        await job
+        if failed.is_set():
+            if response is None:
+                raise HTTPInternalServerError
+            # The status and part of the list were sent already, close the
+            # connection without ending the chunked body so the client does
+            # not take the truncated list for a complete response
+            if (transport := request.transport) is not None:
+                transport.close()
+            return response
+
+        assert response is not None
+        await response.write_eof()
         return response
 
     def json_message(
@@ -163,3 +279,17 @@ def request_handler_factory(
         return web.Response(body=bresult, status=status_code)
 
     return handle
+
+
+def _json_response(
+    body: bytes, status_code: int, headers: LooseHeaders | None
+) -> web.Response:
+    """Return a compressed response with a JSON body."""
+    response = web.Response(
+        body=body,
+        content_type=CONTENT_TYPE_JSON,
+        status=status_code,
+        headers=headers,
+    )
+    response.enable_compression()
+    return response
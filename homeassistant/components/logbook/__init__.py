@@ -2,7 +2,6 @@
 from contextlib import suppress
 from datetime import timedelta
 from itertools import groupby
-import json
 import re
 
 import sqlalchemy
@@ -13,8 +12,10 @@ import voluptuous as vol
 from homeassistant.components.automation import EVENT_AUTOMATION_TRIGGERED
 from homeassistant.components.history import sqlalchemy_filter_from_include_exclude_conf
 from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.recorder.const import SQLITE_MAX_BIND_VARS
 from homeassistant.components.recorder.models import (
     Events,
+    StateAttributes,
     States,
     process_timestamp_to_utc_isoformat,
 )
@@ -45,13 +46,16 @@ from homeassistant.helpers.entityfilter import (
 from homeassistant.helpers.integration_platform import (
     async_process_integration_platforms,
 )
+from homeassistant.helpers.json import json_loads
 from homeassistant.loader import bind_hass
 import homeassistant.util.dt as dt_util
 
-ENTITY_ID_JSON_TEMPLATE = '"entity_id": "{}"'
-ENTITY_ID_JSON_EXTRACT = re.compile('"entity_id": "([^"]+)"')
-DOMAIN_JSON_EXTRACT = re.compile('"domain": "([^"]+)"')
-ICON_JSON_EXTRACT = re.compile('"icon": "([^"]+)"')
+# Rows written before the recorder used the compact JSON codec
+# have a space after the colons
+ENTITY_ID_JSON_TEMPLATES = ['"entity_id":"{}"', '"entity_id": "{}"']
+ENTITY_ID_JSON_EXTRACT = re.compile('"entity_id": ?"([^"]+)"')
+DOMAIN_JSON_EXTRACT = re.compile('"domain": ?"([^"]+)"')
+ICON_JSON_EXTRACT = re.compile('"icon": ?"([^"]+)"')
 
 ATTR_MESSAGE = "message"
 
@@ -59,6 +63,8 @@ CONTINUOUS_DOMAINS = ["proximity", "sensor"]
 
 DOMAIN = "logbook"
 
+DATA_ENTITY_ATTR_CACHE = "logbook_entity_attr_cache"
+
 GROUP_BY_MINUTES = 15
 
 EMPTY_JSON_OBJECT = "{}"
@@ -87,6 +93,7 @@ ALL_EVENT_TYPES = [
 ]
 
 EVENT_COLUMNS = [
+    Events.event_id,
     Events.event_type,
     Events.event_data,
     Events.time_fired,
@@ -95,6 +102,11 @@ EVENT_COLUMNS = [
     Events.context_parent_id,
 ]
 
+# Used to fetch the states of the requested entities
+STATES_ENTITY_ID_LAST_UPDATED_INDEX = "ix_states_entity_id_last_updated"
+
+CONTEXT_LOOKUP_BATCH_SIZE = 1000
+
 SCRIPT_AUTOMATION_EVENTS = [EVENT_AUTOMATION_TRIGGERED, EVENT_SCRIPT_STARTED]
 
 LOG_MESSAGE_SCHEMA = vol.Schema(
@@ -128,6 +140,16 @@ def async_log_entry(hass, name, message, domain=None, entity_id=None, context=No
 async def async_setup(hass, config):
     """Logbook setup."""
     hass.data[DOMAIN] = {}
+    entity_attr_cache = hass.data[DATA_ENTITY_ATTR_CACHE] = EntityAttributeCache(hass)
+
+    @callback
+    def _async_state_changed(event):
+        """Drop cached attributes of an entity when they change."""
+        entity_attr_cache.async_invalidate(
+            event.data[ATTR_ENTITY_ID], event.data.get("new_state")
+        )
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _async_state_changed)
 
     @callback
     def log_message(service):
@@ -239,6 +261,20 @@ class LogbookView(HomeAssistantView):
                 "Can't combine entity with context_id", HTTP_BAD_REQUEST
             )
 
+        if "stream" in request.query:
+            return await self.json_stream(
+                request,
+                _iter_events,
+                hass,
+                start_day,
+                end_day,
+                entity_ids,
+                self.filters,
+                self.entities_filter,
+                entity_matches_only,
+                context_id,
+            )
+
         def json_events():
             """Fetch events and generate JSON."""
             return self.json(
@@ -422,18 +458,49 @@ def _get_events(
     context_id=None,
 ):
     """Get events for a period of time."""
+    return list(
+        _iter_events(
+            hass,
+            start_day,
+            end_day,
+            entity_ids,
+            filters,
+            entities_filter,
+            entity_matches_only,
+            context_id,
+        )
+    )
+
+
+def _iter_events(
+    hass,
+    start_day,
+    end_day,
+    entity_ids=None,
+    filters=None,
+    entities_filter=None,
+    entity_matches_only=False,
+    context_id=None,
+):
+    """Yield the logbook entries of the events in a period of time."""
     assert not (
         entity_ids and context_id
     ), "can't pass in both entity_ids and context_id"
 
-    entity_attr_cache = EntityAttributeCache(hass)
+    entity_attr_cache = hass.data.get(DATA_ENTITY_ATTR_CACHE) or EntityAttributeCache(
+        hass
+    )
     context_lookup = {None: None}
+    # When looking up the entries of entities the contexts are resolved
+    # from the whole database instead of the events in the response
+    lookup_contexts = entity_ids is not None and not entity_matches_only
 
     def yield_events(query):
         """Yield Events that are not filtered away."""
         for row in query.yield_per(1000):
             event = LazyEventPartialState(row)
-            context_lookup.setdefault(event.context_id, event)
+            if not lookup_contexts:
+                context_lookup.setdefault(event.context_id, event)
             if event.event_type == EVENT_CALL_SERVICE:
                 continue
             if event.event_type == EVENT_STATE_CHANGED or _keep_event(
@@ -453,10 +520,11 @@ def _get_events(
             query = _apply_event_types_filter(
                 hass, query, ALL_EVENT_TYPES_EXCEPT_STATE_CHANGED
             )
-            if entity_matches_only:
-                # When entity_matches_only is provided, contexts and events that do not
-                # contain the entity_ids are not included in the logbook response.
-                query = _apply_event_entity_id_matchers(query, entity_ids)
+            # Only events that contain the entity_ids can make it into the
+            # response. When entity_matches_only is provided, contexts that do
+            # not contain the entity_ids are not included either, otherwise they
+            # are looked up in batches as the events are processed.
+            query = _apply_event_entity_id_matchers(query, entity_ids)
 
             query = query.union_all(
                 _generate_states_query(
@@ -482,9 +550,63 @@ def _get_events(
 
         query = query.order_by(Events.time_fired)
 
-        return list(
-            humanify(hass, yield_events(query), entity_attr_cache, context_lookup)
+        events = yield_events(query)
+        if lookup_contexts:
+            events = _yield_events_with_contexts(session, events, context_lookup)
+
+        yield from humanify(hass, events, entity_attr_cache, context_lookup)
+
+
+def _yield_events_with_contexts(session, events, context_lookup):
+    """Yield the events once the contexts of their batch are looked up."""
+    batch = []
+    for event in events:
+        batch.append(event)
+        if len(batch) == CONTEXT_LOOKUP_BATCH_SIZE:
+            _lookup_contexts(session, batch, context_lookup)
+            yield from batch
+            batch = []
+
+    if batch:
+        _lookup_contexts(session, batch, context_lookup)
+        yield from batch
+
+
+def _lookup_contexts(session, events, context_lookup):
+    """Add the first event of each context and context parent to the lookup."""
+    context_ids = set()
+    for event in events:
+        context_ids.add(event.context_id)
+        context_ids.add(event.context_parent_id)
+    context_ids = list(context_ids.difference(context_lookup))
+
+    for idx in range(0, len(context_ids), SQLITE_MAX_BIND_VARS):
+        chunk = context_ids[idx : idx + SQLITE_MAX_BIND_VARS]
+        for context_id in chunk:
+            context_lookup[context_id] = None
+        first_event_ids = (
+            session.query(sqlalchemy.func.min(Events.event_id))
+            .filter(Events.context_id.in_(chunk))
+            .group_by(Events.context_id)
+        )
+        query = (
+            _generate_events_query(session)
+            .outerjoin(States, (Events.event_id == States.event_id))
+            .outerjoin(
+                StateAttributes,
+                (States.attributes_id == StateAttributes.attributes_id),
+            )
+            .filter(Events.event_id.in_(first_event_ids))
         )
+        for row in query:
+            context_lookup[row.context_id] = LazyEventPartialState(row)
+
+    # The event that started a context must be the same object
+    # as the one being processed so it is not linked to itself
+    for event in events:
+        context_event = context_lookup[event.context_id]
+        if context_event is not None and context_event.event_id == event.event_id:
+            context_lookup[event.context_id] = event
 
 
 def _generate_events_query(session):
@@ -494,6 +616,7 @@ def _generate_events_query(session):
         States.entity_id,
         States.domain,
         States.attributes,
+        StateAttributes.shared_attrs,
     )
 
 
@@ -504,14 +627,23 @@ def _generate_events_query_without_states(session):
         literal(value=None, type_=sqlalchemy.String).label("entity_id"),
         literal(value=None, type_=sqlalchemy.String).label("domain"),
         literal(value=None, type_=sqlalchemy.Text).label("attributes"),
+        literal(value=None, type_=sqlalchemy.Text).label("shared_attrs"),
     )
 
 
 def _generate_states_query(session, start_day, end_day, old_state, entity_ids):
     return (
         _generate_events_query(session)
+        # SQLite already picks the index, MySQL may prefer the one
+        # on last_updated when the period is long
+        .with_hint(
+            States, f"FORCE INDEX ({STATES_ENTITY_ID_LAST_UPDATED_INDEX})", "mysql"
+        )
         .outerjoin(Events, (States.event_id == Events.event_id))
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+        )
         .filter(_missing_state_matcher(old_state))
         .filter(_continuous_entity_matcher())
         .filter((States.last_updated > start_day) & (States.last_updated < end_day))
@@ -526,6 +658,9 @@ def _apply_events_types_and_states_filter(hass, query, old_state):
     events_query = (
         query.outerjoin(States, (Events.event_id == States.event_id))
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+        )
         .filter(
             (Events.event_type != EVENT_STATE_CHANGED)
             | _missing_state_matcher(old_state)
@@ -553,9 +688,14 @@ def _continuous_entity_matcher():
     # Prefilter out continuous domains that have
     # ATTR_UNIT_OF_MEASUREMENT as its much faster in sql.
     #
+    # Rows recorded before the attributes were shared only
+    # have States.attributes, newer rows only have shared_attrs
     return sqlalchemy.or_(
         sqlalchemy.not_(States.domain.in_(CONTINUOUS_DOMAINS)),
         sqlalchemy.not_(States.attributes.contains(UNIT_OF_MEASUREMENT_JSON)),
+        sqlalchemy.not_(
+            StateAttributes.shared_attrs.contains(UNIT_OF_MEASUREMENT_JSON)
+        ),
     )
 
 
@@ -575,8 +715,9 @@ def _apply_event_entity_id_matchers(events_query, entity_ids):
     return events_query.filter(
         sqlalchemy.or_(
             *[
-                Events.event_data.contains(ENTITY_ID_JSON_TEMPLATE.format(entity_id))
+                Events.event_data.contains(template.format(entity_id))
                 for entity_id in entity_ids
+                for template in ENTITY_ID_JSON_TEMPLATES
             ]
         )
     )
@@ -684,6 +825,8 @@ class LazyEventPartialState:
         "_event_data",
         "_time_fired_isoformat",
         "_attributes",
+        "_attributes_json",
+        "event_id",
         "event_type",
         "entity_id",
         "state",
@@ -700,6 +843,8 @@ class LazyEventPartialState:
         self._event_data = None
         self._time_fired_isoformat = None
         self._attributes = None
+        self._attributes_json = self._row.shared_attrs or self._row.attributes
+        self.event_id = self._row.event_id
         self.event_type = self._row.event_type
         self.entity_id = self._row.entity_id
         self.state = self._row.state
@@ -715,7 +860,7 @@ class LazyEventPartialState:
         if self._attributes:
             return self._attributes.get(ATTR_ICON)
 
-        result = ICON_JSON_EXTRACT.search(self._row.attributes)
+        result = ICON_JSON_EXTRACT.search(self._attributes_json)
         return result and result.group(1)
 
     @property
@@ -741,12 +886,12 @@ class LazyEventPartialState:
         """State attributes."""
         if not self._attributes:
             if (
-                self._row.attributes is None
-                or self._row.attributes == EMPTY_JSON_OBJECT
+                self._attributes_json is None
+                or self._attributes_json == EMPTY_JSON_OBJECT
             ):
                 self._attributes = {}
             else:
-                self._attributes = json.loads(self._row.attributes)
+                self._attributes = json_loads(self._attributes_json)
         return self._attributes
 
     @property
@@ -756,7 +901,7 @@ class LazyEventPartialState:
             if self._row.event_data == EMPTY_JSON_OBJECT:
                 self._event_data = {}
             else:
-                self._event_data = json.loads(self._row.event_data)
+                self._event_data = json_loads(self._row.event_data)
         return self._event_data
 
     @property
@@ -774,7 +919,9 @@ class EntityAttributeCache:
     """A cache to lookup static entity_id attribute.
 
     This class should not be used to lookup attributes
-    that are expected to change state.
+    that are expected to change state. The logbook keeps
+    one cache across requests and invalidates an entity
+    when one of its cached attributes changes.
     """
 
     def __init__(self, hass):
@@ -784,20 +931,36 @@ class EntityAttributeCache:
 
     def get(self, entity_id, attribute, event):
         """Lookup an attribute for an entity or get it from the cache."""
-        if entity_id in self._cache:
-            if attribute in self._cache[entity_id]:
-                return self._cache[entity_id][attribute]
-        else:
-            self._cache[entity_id] = {}
+        # The cache is read from the executor and invalidated from the
+        # event loop so each entity is only looked up once per call
+        entity_cache = self._cache.get(entity_id)
+        if entity_cache is None:
+            entity_cache = self._cache[entity_id] = {}
+        elif attribute in entity_cache:
+            return entity_cache[attribute]
 
         current_state = self._hass.states.get(entity_id)
         if current_state:
             # Try the current state as its faster than decoding the
             # attributes
-            self._cache[entity_id][attribute] = current_state.attributes.get(attribute)
+            value = current_state.attributes.get(attribute)
         else:
             # If the entity has been removed, decode the attributes
             # instead
-            self._cache[entity_id][attribute] = event.attributes.get(attribute)
+            value = event.attributes.get(attribute)
+
+        entity_cache[attribute] = value
+        return value
+
+    @callback
+    def async_invalidate(self, entity_id, new_state):
+        """Drop an entity if the new state changes a cached attribute."""
+        entity_cache = self._cache.get(entity_id)
+        if entity_cache is None:
+            return
 
-        return self._cache[entity_id][attribute]
+        if new_state is None or any(
+            new_state.attributes.get(attribute) != value
+            for attribute, value in list(entity_cache.items())
+        ):
+            self._cache.pop(entity_id, None)
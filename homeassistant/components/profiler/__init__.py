@@ -15,8 +15,9 @@ from pyprof2calltree import convert
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
+from homeassistant.const import CONF_COUNT, CONF_SCAN_INTERVAL, CONF_TYPE
 from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.helpers import profiling
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.service import async_register_admin_service
@@ -30,6 +31,7 @@ SERVICE_STOP_LOG_OBJECTS = "stop_log_objects"
 SERVICE_DUMP_LOG_OBJECTS = "dump_log_objects"
 SERVICE_LOG_THREAD_FRAMES = "log_thread_frames"
 SERVICE_LOG_EVENT_LOOP_SCHEDULED = "log_event_loop_scheduled"
+SERVICE_LOG_TIMINGS = "log_timings"
 
 
 SERVICES = (
@@ -40,6 +42,7 @@ SERVICES = (
     SERVICE_DUMP_LOG_OBJECTS,
     SERVICE_LOG_THREAD_FRAMES,
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
+    SERVICE_LOG_TIMINGS,
 )
 
 DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
@@ -128,6 +131,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             arepr.max_string = original_maxstring
             arepr.max_other = original_maxother
 
+    async def _async_log_timings(call: ServiceCall) -> None:
+        """Log the slowest templates, script steps and conditions."""
+        timings = profiling.async_get(hass).as_dict(call.data[CONF_COUNT])
+        for category, category_timings in timings.items():
+            for key, call_timings in category_timings.items():
+                _LOGGER.critical(
+                    "%s %s: %s calls, %.6fs total, %.6fs mean, %.6fs p99",
+                    category,
+                    key,
+                    call_timings["count"],
+                    call_timings["total"],
+                    call_timings["mean"],
+                    call_timings["p99"],
+                )
+
     async_register_admin_service(
         hass,
         DOMAIN,
@@ -191,6 +209,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _async_dump_scheduled,
     )
 
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_LOG_TIMINGS,
+        _async_log_timings,
+        schema=vol.Schema(
+            {vol.Optional(CONF_COUNT, default=10): vol.All(int, vol.Range(min=1))}
+        ),
+    )
+
     return True
 
 
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import asyncio
+from collections import OrderedDict
 import concurrent.futures
 from datetime import datetime, timedelta
 import logging
@@ -44,13 +45,35 @@ from homeassistant.helpers.integration_platform import (
     async_process_integration_platforms,
 )
 from homeassistant.helpers.service import async_extract_entity_ids
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.loader import bind_hass
 import homeassistant.util.dt as dt_util
 
 from . import history, migration, purge, statistics
-from .const import CONF_DB_INTEGRITY_CHECK, DATA_INSTANCE, DOMAIN, SQLITE_URL_PREFIX
-from .models import Base, Events, RecorderRuns, States
+from .backlog import create_backlog
+from .const import (
+    BACKLOG_POLICIES,
+    BACKLOG_POLICY_SPILL,
+    BACKLOG_POLICY_STOP,
+    CONF_DB_INTEGRITY_CHECK,
+    DATA_INSTANCE,
+    DOMAIN,
+    PURGE_PROGRESS_STORAGE_KEY,
+    PURGE_PROGRESS_STORAGE_VERSION,
+    SQLITE_MAX_BIND_VARS,
+    SQLITE_URL_PREFIX,
+)
+from .models import (
+    EMPTY_JSON_OBJECT,
+    Base,
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+    Statistics,
+    StatisticsShortTerm,
+)
 from .pool import RecorderPool
 from .util import (
     dburl_to_path,
@@ -74,6 +97,18 @@ ATTR_REPACK = "repack"
 ATTR_APPLY_FILTER = "apply_filter"
 
 MAX_QUEUE_BACKLOG = 30000
+# Events held by the backlog policy once the queue is full
+MAX_BACKLOG_SIZE = 30000
+# Events the spill backlog policy keeps in its journal on disk
+MAX_SPILL_BACKLOG_SIZE = 1000000
+# Events replayed from the backlog between commits
+REPLAY_COMMIT_EVENTS = 1000
+
+# The seconds a purge keeps deleting chunks before it goes back
+# to the end of the queue, it stops earlier when events are waiting
+PURGE_TIME_BUDGET = 1
+# The seconds to wait before storing the progress of a purge
+PURGE_PROGRESS_SAVE_DELAY = 10
 
 SERVICE_PURGE_SCHEMA = vol.Schema(
     {
@@ -103,12 +138,21 @@ DEFAULT_DB_INTEGRITY_CHECK = True
 DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
 DEFAULT_COMMIT_INTERVAL = 1
+DEFAULT_BATCH_INSERT = False
 KEEPALIVE_TIME = 30
 
 # Controls how often we clean up
 # States and Events objects
 EXPIRE_AFTER_COMMITS = 120
 
+# The number of attribute ids to cache in memory
+#
+# Based on:
+# - The number of overlapping attributes
+# - How frequently states with overlapping attributes will change
+# - How much memory our low end hardware has
+STATE_ATTRIBUTES_ID_CACHE_SIZE = 2048
+
 CONF_AUTO_PURGE = "auto_purge"
 CONF_DB_URL = "db_url"
 CONF_DB_MAX_RETRIES = "db_max_retries"
@@ -117,6 +161,8 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_BATCH_INSERT = "batch_insert"
+CONF_BACKLOG_POLICY = "backlog_policy"
 
 INVALIDATED_ERR = "Database connection invalidated"
 CONNECTIVITY_ERR = "Error in database connectivity during commit"
@@ -145,6 +191,12 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_COMMIT_INTERVAL, default=DEFAULT_COMMIT_INTERVAL
                     ): cv.positive_int,
+                    vol.Optional(
+                        CONF_BATCH_INSERT, default=DEFAULT_BATCH_INSERT
+                    ): cv.boolean,
+                    vol.Optional(
+                        CONF_BACKLOG_POLICY, default=BACKLOG_POLICY_STOP
+                    ): vol.In(BACKLOG_POLICIES),
                     vol.Optional(
                         CONF_DB_MAX_RETRIES, default=DEFAULT_DB_MAX_RETRIES
                     ): cv.positive_int,
@@ -222,6 +274,8 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     auto_purge = conf[CONF_AUTO_PURGE]
     keep_days = conf[CONF_PURGE_KEEP_DAYS]
     commit_interval = conf[CONF_COMMIT_INTERVAL]
+    batch_insert = conf[CONF_BATCH_INSERT]
+    backlog_policy = conf[CONF_BACKLOG_POLICY]
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
     db_url = conf.get(CONF_DB_URL) or DEFAULT_URL.format(
@@ -234,6 +288,8 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         auto_purge=auto_purge,
         keep_days=keep_days,
         commit_interval=commit_interval,
+        batch_insert=batch_insert,
+        backlog_policy=backlog_policy,
         uri=db_url,
         db_max_retries=db_max_retries,
         db_retry_wait=db_retry_wait,
@@ -327,10 +383,20 @@ class StatisticsTask(NamedTuple):
     start: datetime.datetime
 
 
+class HourlyStatisticsTask(NamedTuple):
+    """An object to insert into the recorder queue to compile an hour of statistics."""
+
+    start: datetime.datetime
+
+
 class WaitTask:
     """An object to insert into the recorder queue to tell it set the _queue_watch event."""
 
 
+class ReplayBacklogTask:
+    """An object to insert into the recorder queue to replay the events in the backlog."""
+
+
 class Recorder(threading.Thread):
     """A threaded recorder class."""
 
@@ -340,6 +406,8 @@ class Recorder(threading.Thread):
         auto_purge: bool,
         keep_days: int,
         commit_interval: int,
+        batch_insert: bool,
+        backlog_policy: str,
         uri: str,
         db_max_retries: int,
         db_retry_wait: int,
@@ -353,7 +421,17 @@ class Recorder(threading.Thread):
         self.auto_purge = auto_purge
         self.keep_days = keep_days
         self.commit_interval = commit_interval
+        self.batch_insert = batch_insert
         self.queue: Any = queue.SimpleQueue()
+        self.backlog_policy = backlog_policy
+        self._backlog = create_backlog(
+            hass,
+            backlog_policy,
+            MAX_SPILL_BACKLOG_SIZE
+            if backlog_policy == BACKLOG_POLICY_SPILL
+            else MAX_BACKLOG_SIZE,
+        )
+        self._last_processed_time_fired: datetime | None = None
         self.recording_start = dt_util.utcnow()
         self.db_url = uri
         self.db_max_retries = db_max_retries
@@ -371,7 +449,16 @@ class Recorder(threading.Thread):
         self._commits_without_expire = 0
         self._keepalive_count = 0
         self._old_states = {}
+        self._state_attributes_ids: OrderedDict[str, int] = OrderedDict()
+        self._pending_state_attributes: dict[str, StateAttributes] = {}
         self._pending_expunge = []
+        self._pending_rows: list[tuple[dict, tuple[dict, str] | None]] = []
+        self._last_state_ids: dict[str, int] = {}
+        self.purge_progress: purge.PurgeProgress | None = None
+        self._purge_progress_stored = False
+        self._purge_store = Store(
+            hass, PURGE_PROGRESS_STORAGE_VERSION, PURGE_PROGRESS_STORAGE_KEY
+        )
         self.event_session = None
         self.get_session = None
         self._completed_first_database_setup = None
@@ -404,7 +491,8 @@ class Recorder(threading.Thread):
         """
         size = self.queue.qsize()
         _LOGGER.debug("Recorder queue size is: %s", size)
-        if self.queue.qsize() <= MAX_QUEUE_BACKLOG:
+        # The backlog keeps the queue from growing past the maximum
+        if self._backlog is not None or self.queue.qsize() <= MAX_QUEUE_BACKLOG:
             return
         _LOGGER.error(
             "The recorder queue reached the maximum size of %s; Events are no longer being recorded",
@@ -462,9 +550,22 @@ class Recorder(threading.Thread):
     def do_adhoc_statistics(self, **kwargs):
         """Trigger an adhoc statistics run."""
         start = kwargs.get("start")
+        if kwargs.get("period") == statistics.PERIOD_5MINUTE:
+            if not start:
+                start = statistics.get_short_term_start_time()
+            self.queue.put(StatisticsTask(start))
+            return
         if not start:
             start = statistics.get_start_time()
-        self.queue.put(StatisticsTask(start))
+        self._queue_hourly_statistics(start)
+
+    def _queue_hourly_statistics(self, start):
+        """Queue the short term statistics of an hour, then the hourly statistics."""
+        period_start = start
+        while period_start < start + Statistics.duration:
+            self.queue.put(StatisticsTask(period_start))
+            period_start += StatisticsShortTerm.duration
+        self.queue.put(HourlyStatisticsTask(start))
 
     @callback
     def async_register(self, shutdown_task, hass_started):
@@ -530,8 +631,28 @@ class Recorder(threading.Thread):
     def _async_recorder_ready(self):
         """Finish start and mark recorder ready."""
         self._async_setup_periodic_tasks()
+        self.hass.async_create_task(self._async_resume_purge())
         self.async_recorder_ready.set()
 
+    async def _async_resume_purge(self):
+        """Resume a purge that was interrupted by a restart."""
+        if not (data := await self._purge_store.async_load()):
+            return
+        try:
+            progress = purge.PurgeProgress.from_dict(data)
+        except (KeyError, TypeError, ValueError):
+            _LOGGER.warning("Ignoring invalid stored purge progress: %s", data)
+            return
+        _LOGGER.info(
+            "Resuming the purge of data before %s",
+            progress.purge_before.isoformat(sep=" ", timespec="seconds"),
+        )
+        self.purge_progress = progress
+        self._purge_progress_stored = True
+        self.queue.put(
+            PurgeTask(progress.purge_before, progress.repack, progress.apply_filter)
+        )
+
     @callback
     def async_nightly_tasks(self, now):
         """Trigger the purge."""
@@ -545,10 +666,13 @@ class Recorder(threading.Thread):
             self.queue.put(PerodicCleanupTask())
 
     @callback
-    def async_hourly_statistics(self, now):
-        """Trigger the hourly statistics run."""
-        start = statistics.get_start_time()
+    def async_periodic_statistics(self, now):
+        """Trigger the short term statistics run."""
+        start = statistics.get_short_term_start_time(now)
         self.queue.put(StatisticsTask(start))
+        # The last 5 minutes of the hour complete the hourly statistics
+        if (end := start + StatisticsShortTerm.duration).minute == 0:
+            self.queue.put(HourlyStatisticsTask(end - Statistics.duration))
 
     def _async_setup_periodic_tasks(self):
         """Prepare periodic tasks."""
@@ -556,9 +680,10 @@ class Recorder(threading.Thread):
         async_track_time_change(
             self.hass, self.async_nightly_tasks, hour=4, minute=12, second=0
         )
-        # Compile hourly statistics every hour at *:12
+        # Compile short term statistics every 5 minutes, the hourly
+        # statistics are compiled with the last ones of the hour
         async_track_time_change(
-            self.hass, self.async_hourly_statistics, minute=12, second=0
+            self.hass, self.async_periodic_statistics, minute=range(0, 60, 5), second=10
         )
 
     def run(self):
@@ -615,6 +740,11 @@ class Recorder(threading.Thread):
 
     def _run_event_loop(self):
         """Run the event loop for the recorder."""
+        # Events spilled to the journal before a restart
+        # have not been recorded yet
+        if self._backlog is not None:
+            self._backlog.load()
+            self._process_one_event_or_recover(ReplayBacklogTask())
         # Use a session for the event read loop
         # with a commit every time the event time
         # has changed. This reduces the disk io.
@@ -699,18 +829,67 @@ class Recorder(threading.Thread):
             persistent_notification.dismiss(self.hass, "recorder_database_migration")
 
     def _run_purge(self, purge_before, repack, apply_filter):
-        """Purge the database."""
-        if purge.purge_old_data(self, purge_before, repack, apply_filter):
-            # We always need to do the db cleanups after a purge
-            # is finished to ensure the WAL checkpoint and other
-            # tasks happen after a vacuum.
-            perodic_db_cleanups(self)
-            return
-        # Schedule a new purge task if this one didn't finish
-        self.queue.put(PurgeTask(purge_before, repack, apply_filter))
+        """Purge the database in chunks until the time budget is spent."""
+        # Pending states may reference cached attributes ids, they
+        # must be committed to prevent their attributes being purged
+        self._commit_event_session_or_retry()
+        progress = self.purge_progress
+        if progress is None or progress.purge_before != purge_before:
+            progress = self.purge_progress = purge.PurgeProgress(
+                purge_before, repack, apply_filter
+            )
+        deadline = time.monotonic() + PURGE_TIME_BUDGET
+        while True:
+            chunk_start = time.monotonic()
+            finished = purge.purge_old_data(
+                self, purge_before, repack, apply_filter, progress
+            )
+            progress.elapsed += time.monotonic() - chunk_start
+            if finished:
+                break
+            if not self.queue.empty() or time.monotonic() >= deadline:
+                # Schedule a new purge task to continue once
+                # the events waiting in the queue are recorded
+                progress.remaining_events = purge.estimate_events_to_purge(
+                    self, purge_before
+                )
+                _LOGGER.debug(
+                    "Purged %s rows (%.0f rows/s), about %s events remaining",
+                    progress.purged_rows,
+                    progress.rows_per_second,
+                    progress.remaining_events,
+                )
+                self._save_purge_progress(progress)
+                self.queue.put(PurgeTask(purge_before, repack, apply_filter))
+                return
+
+        _LOGGER.info(
+            "Purged %s rows in %.1f seconds (%.0f rows/s)",
+            progress.purged_rows,
+            progress.elapsed,
+            progress.rows_per_second,
+        )
+        self.purge_progress = None
+        if self._purge_progress_stored:
+            self._save_purge_progress(None)
+        # We always need to do the db cleanups after a purge
+        # is finished to ensure the WAL checkpoint and other
+        # tasks happen after a vacuum.
+        perodic_db_cleanups(self)
+
+    def _save_purge_progress(self, progress):
+        """Store the progress of a purge, None once it finished."""
+        data = progress.as_dict() if progress is not None else {}
+        self._purge_progress_stored = progress is not None
+        self.hass.add_job(
+            self._purge_store.async_delay_save,
+            lambda: data,
+            PURGE_PROGRESS_SAVE_DELAY,
+        )
 
     def _run_purge_entities(self, entity_filter):
         """Purge entities from the database."""
+        self._commit_event_session_or_retry()
         if purge.purge_entity_data(self, entity_filter):
             return
         # Schedule a new purge task if this one didn't finish
@@ -723,6 +902,13 @@ class Recorder(threading.Thread):
         # Schedule a new statistics task if this one didn't finish
         self.queue.put(StatisticsTask(start))
 
+    def _run_hourly_statistics(self, start):
+        """Run hourly statistics task."""
+        if statistics.compile_hourly_statistics(self, start):
+            return
+        # Schedule a new hourly statistics task if this one didn't finish
+        self.queue.put(HourlyStatisticsTask(start))
+
     def _process_one_event(self, event):
         """Process one event."""
         if isinstance(event, PurgeTask):
@@ -737,9 +923,15 @@ class Recorder(threading.Thread):
         if isinstance(event, StatisticsTask):
             self._run_statistics(event.start)
             return
+        if isinstance(event, HourlyStatisticsTask):
+            self._run_hourly_statistics(event.start)
+            return
         if isinstance(event, WaitTask):
             self._queue_watch.set()
             return
+        if isinstance(event, ReplayBacklogTask):
+            self._replay_backlog()
+            return
         if event.event_type == EVENT_TIME_CHANGED:
             self._keepalive_count += 1
             if self._keepalive_count >= KEEPALIVE_TIME:
@@ -752,9 +944,22 @@ class Recorder(threading.Thread):
                     self._commit_event_session_or_retry()
             return
 
+        self._last_processed_time_fired = event.time_fired
         if not self.enabled:
             return
 
+        if self.batch_insert:
+            self._process_event_into_batch(event)
+        else:
+            self._process_event_into_session(event)
+
+        # If they do not have a commit interval
+        # than we commit right away
+        if not self.commit_interval:
+            self._commit_event_session_or_retry()
+
+    def _process_event_into_session(self, event):
+        """Add the rows for an event to the event session."""
         try:
             if event.event_type == EVENT_STATE_CHANGED:
                 dbevent = Events.from_event(event, event_data="{}")
@@ -769,6 +974,7 @@ class Recorder(threading.Thread):
         if event.event_type == EVENT_STATE_CHANGED:
             try:
                 dbstate = States.from_event(event)
+                dbstate_attributes = StateAttributes.from_event(event)
                 has_new_state = event.data.get("new_state")
                 if dbstate.entity_id in self._old_states:
                     old_state = self._old_states.pop(dbstate.entity_id)
@@ -778,6 +984,7 @@ class Recorder(threading.Thread):
                         dbstate.old_state = old_state
                 if not has_new_state:
                     dbstate.state = None
+                self._link_state_attributes(dbstate, dbstate_attributes)
                 dbstate.event = dbevent
                 dbstate.created = event.time_fired
                 self.event_session.add(dbstate)
@@ -790,10 +997,86 @@ class Recorder(threading.Thread):
                     event.data.get("new_state"),
                 )
 
-        # If they do not have a commit interval
-        # than we commit right away
-        if not self.commit_interval:
-            self._commit_event_session_or_retry()
+    def _process_event_into_batch(self, event):
+        """Add the rows for an event to the batch written on the next commit."""
+        try:
+            if event.event_type == EVENT_STATE_CHANGED:
+                event_row = Events.row_from_event(event, event_data=EMPTY_JSON_OBJECT)
+            else:
+                event_row = Events.row_from_event(event)
+        except (TypeError, ValueError):
+            _LOGGER.warning("Event is not JSON serializable: %s", event)
+            return
+        event_row["created"] = event.time_fired
+
+        if event.event_type != EVENT_STATE_CHANGED:
+            self._pending_rows.append((event_row, None))
+            return
+
+        try:
+            shared_attrs = StateAttributes.shared_attrs_from_event(event)
+        except (TypeError, ValueError):
+            _LOGGER.warning(
+                "State is not JSON serializable: %s", event.data.get("new_state")
+            )
+            # Keep the event, as the session path does
+            self._pending_rows.append((event_row, None))
+            return
+
+        state_row = States.row_from_event(event)
+        if not event.data.get("new_state"):
+            state_row["state"] = None
+        state_row["created"] = event.time_fired
+        self._pending_rows.append((event_row, (state_row, shared_attrs)))
+
+    def _link_state_attributes(self, dbstate, dbstate_attributes):
+        """Point the state at a shared attributes row, adding one if needed."""
+        shared_attrs = dbstate_attributes.shared_attrs
+        # Matching attributes are waiting to be committed
+        if pending_attributes := self._pending_state_attributes.get(shared_attrs):
+            dbstate.state_attributes = pending_attributes
+            return
+        # Matching attributes id found in the cache
+        if attributes_id := self._state_attributes_ids.get(shared_attrs):
+            self._state_attributes_ids.move_to_end(shared_attrs)
+            dbstate.attributes_id = attributes_id
+            return
+        # Matching attributes found in the database
+        if attributes_id := self._find_shared_attributes_in_db(dbstate_attributes):
+            self._cache_state_attributes_id(shared_attrs, attributes_id)
+            dbstate.attributes_id = attributes_id
+            return
+        dbstate.state_attributes = dbstate_attributes
+        self._pending_state_attributes[shared_attrs] = dbstate_attributes
+        self.event_session.add(dbstate_attributes)
+
+    def _find_shared_attributes_in_db(self, dbstate_attributes):
+        """Find the attributes id of matching shared attributes in the database."""
+        # The hash is only used to narrow down the rows,
+        # crc32 collisions are resolved by comparing the json
+        for attributes_id, shared_attrs in (
+            self.event_session.query(
+                StateAttributes.attributes_id, StateAttributes.shared_attrs
+            )
+            .filter(StateAttributes.hash == dbstate_attributes.hash)
+            .all()
+        ):
+            if shared_attrs == dbstate_attributes.shared_attrs:
+                return attributes_id
+        return None
+
+    def _cache_state_attributes_id(self, shared_attrs, attributes_id):
+        """Remember the attributes id of shared attributes, evicting the oldest."""
+        self._state_attributes_ids[shared_attrs] = attributes_id
+        self._state_attributes_ids.move_to_end(shared_attrs)
+        if len(self._state_attributes_ids) > STATE_ATTRIBUTES_ID_CACHE_SIZE:
+            self._state_attributes_ids.popitem(last=False)
+
+    def _evict_purged_attributes_from_cache(self, attributes_ids):
+        """Evict purged attributes ids from the attributes ids cache."""
+        for shared_attrs, attributes_id in list(self._state_attributes_ids.items()):
+            if attributes_id in attributes_ids:
+                del self._state_attributes_ids[shared_attrs]
 
     def _handle_database_error(self, err):
         """Handle a database error that may result in moving away the corrupt db."""
@@ -807,7 +1090,11 @@ class Recorder(threading.Thread):
 
     def _commit_event_session_or_retry(self):
         """Commit the event session if there is work to do."""
-        if not self.event_session.new and not self.event_session.dirty:
+        if (
+            not self.event_session.new
+            and not self.event_session.dirty
+            and not self._pending_rows
+        ):
             return
         tries = 1
         while tries <= self.db_max_retries:
@@ -830,6 +1117,10 @@ class Recorder(threading.Thread):
     def _commit_event_session(self):
         self._commits_without_expire += 1
 
+        if self._pending_rows:
+            self._commit_pending_rows()
+            return
+
         if self._pending_expunge:
             self.event_session.flush()
             for dbstate in self._pending_expunge:
@@ -840,6 +1131,15 @@ class Recorder(threading.Thread):
             self._pending_expunge = []
         self.event_session.commit()
 
+        # The state attributes were just committed so we now
+        # know their attributes_id. Loading them into the cache
+        # saves a select for each state that shares them.
+        for dbstate_attributes in self._pending_state_attributes.values():
+            self._cache_state_attributes_id(
+                dbstate_attributes.shared_attrs, dbstate_attributes.attributes_id
+            )
+        self._pending_state_attributes = {}
+
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
         # do it after EXPIRE_AFTER_COMMITS commits
@@ -847,6 +1147,114 @@ class Recorder(threading.Thread):
             self._commits_without_expire = 0
             self.event_session.expire_all()
 
+    def _commit_pending_rows(self):
+        """Write the batched rows with Core inserts and commit them.
+
+        The ids are only remembered once the commit succeeds so
+        a failed commit can be retried with the same batch.
+        """
+        try:
+            last_state_ids, attributes_ids = self._write_pending_rows(
+                self.event_session.connection()
+            )
+            self.event_session.commit()
+        except SQLAlchemyError:
+            self.event_session.rollback()
+            raise
+
+        self._pending_rows = []
+        for entity_id, state_id in last_state_ids.items():
+            if state_id is None:
+                self._last_state_ids.pop(entity_id, None)
+            else:
+                self._last_state_ids[entity_id] = state_id
+        for shared_attrs, attributes_id in attributes_ids.items():
+            self._cache_state_attributes_id(shared_attrs, attributes_id)
+
+    def _write_pending_rows(self, connection):
+        """Insert the batched rows bypassing the ORM unit of work.
+
+        Consecutive events without a state are written with a single
+        executemany, so the event ids keep the order the events were fired
+        in. State changed events and states are inserted one by one as the
+        next state of the same entity needs the state_id for its
+        old_state_id, which executemany cannot return.
+        """
+        attributes_ids = self._write_pending_state_attributes(connection)
+        last_state_ids: dict[str, int | None] = {}
+        events_insert = Events.__table__.insert()
+        states_insert = States.__table__.insert()
+        event_rows: list[dict] = []
+
+        for event_row, state in self._pending_rows:
+            if state is None:
+                event_rows.append(event_row)
+                continue
+            if event_rows:
+                connection.execute(events_insert, event_rows)
+                event_rows = []
+            state_row, shared_attrs = state
+            entity_id = state_row["entity_id"]
+            if entity_id in last_state_ids:
+                old_state_id = last_state_ids[entity_id]
+            else:
+                old_state_id = self._last_state_ids.get(entity_id)
+            event_id = connection.execute(
+                events_insert, event_row
+            ).inserted_primary_key[0]
+            state_id = connection.execute(
+                states_insert,
+                {
+                    **state_row,
+                    "event_id": event_id,
+                    "old_state_id": old_state_id,
+                    "attributes_id": attributes_ids[shared_attrs],
+                },
+            ).inserted_primary_key[0]
+            # A removed entity does not have an old state next time
+            last_state_ids[entity_id] = (
+                state_id if state_row["state"] is not None else None
+            )
+
+        if event_rows:
+            connection.execute(events_insert, event_rows)
+
+        return last_state_ids, attributes_ids
+
+    def _write_pending_state_attributes(self, connection):
+        """Resolve the attributes ids of the batch, inserting the new ones."""
+        attributes_ids: dict[str, int] = {}
+        missing: dict[str, int] = {}
+        for _, state in self._pending_rows:
+            if state is None:
+                continue
+            shared_attrs = state[1]
+            if shared_attrs in attributes_ids or shared_attrs in missing:
+                continue
+            if attributes_id := self._state_attributes_ids.get(shared_attrs):
+                attributes_ids[shared_attrs] = attributes_id
+            else:
+                missing[shared_attrs] = StateAttributes.hash_shared_attrs(shared_attrs)
+
+        if not missing:
+            return attributes_ids
+
+        attributes_ids.update(_select_attributes_ids(connection, missing))
+        if new_attributes := {
+            shared_attrs: attr_hash
+            for shared_attrs, attr_hash in missing.items()
+            if shared_attrs not in attributes_ids
+        }:
+            connection.execute(
+                StateAttributes.__table__.insert(),
+                [
+                    {"shared_attrs": shared_attrs, "hash": attr_hash}
+                    for shared_attrs, attr_hash in new_attributes.items()
+                ],
+            )
+            attributes_ids.update(_select_attributes_ids(connection, new_attributes))
+        return attributes_ids
+
     def _handle_sqlite_corruption(self):
         """Handle the sqlite3 database being corrupt."""
         self._close_event_session()
@@ -858,6 +1266,10 @@ class Recorder(threading.Thread):
     def _close_event_session(self):
         """Close the event session."""
         self._old_states = {}
+        self._state_attributes_ids = OrderedDict()
+        self._pending_state_attributes = {}
+        self._last_state_ids = {}
+        self._pending_rows = []
 
         if not self.event_session:
             return
@@ -887,8 +1299,65 @@ class Recorder(threading.Thread):
 
     @callback
     def event_listener(self, event):
-        """Listen for new events and put them in the process queue."""
-        self.queue.put(event)
+        """Listen for new events and put them in the process queue.
+
+        Once the queue is full the events go to the backlog until
+        the recorder has caught up and replayed it. Time changed
+        events always go to the queue as they drive the commits.
+        """
+        if (
+            self._backlog is None
+            or event.event_type == EVENT_TIME_CHANGED
+            or (
+                not self._backlog.replay_pending
+                and self.queue.qsize() < MAX_QUEUE_BACKLOG
+            )
+        ):
+            self.queue.put(event)
+            return
+        if self._backlog.async_add(event):
+            _LOGGER.warning(
+                "The recorder queue reached the maximum size of %s; Applying the %s backlog policy",
+                MAX_QUEUE_BACKLOG,
+                self.backlog_policy,
+            )
+            self.queue.put(ReplayBacklogTask())
+
+    def _replay_backlog(self):
+        """Record the events in the backlog once the queue has caught up."""
+        dropped = self._backlog.dropped
+        self._backlog.dropped = 0
+        pending = len(self._backlog)
+        events = self._backlog.pop_all()
+        if pending or dropped:
+            _LOGGER.info(
+                "Replaying %s events from the recorder backlog, %s events were dropped",
+                pending,
+                dropped,
+            )
+        # Commit as the events are read to keep a large backlog out of memory
+        count = 0
+        for count, event in enumerate(events, 1):
+            self._process_one_event_or_recover(event)
+            if not count % REPLAY_COMMIT_EVENTS:
+                self._commit_event_session_or_retry()
+        if count % REPLAY_COMMIT_EVENTS:
+            self._commit_event_session_or_retry()
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of events waiting to be recorded."""
+        depth = self.queue.qsize()
+        if self._backlog is not None:
+            depth += len(self._backlog)
+        return depth
+
+    @property
+    def lag(self) -> float:
+        """Return how many seconds the recorder is behind when events are waiting."""
+        if not self.queue_depth or self._last_processed_time_fired is None:
+            return 0
+        return (dt_util.utcnow() - self._last_processed_time_fired).total_seconds()
 
     def block_till_done(self):
         """Block till all events processed.
@@ -984,3 +1453,19 @@ class Recorder(threading.Thread):
         self.hass.add_job(self._async_stop_queue_watcher_and_event_listener)
         self._end_session()
         self._close_connection()
+
+
+def _select_attributes_ids(connection, hashes_by_shared_attrs):
+    """Select the attributes ids of shared attributes by their hash."""
+    attributes_ids = {}
+    hashes = list(set(hashes_by_shared_attrs.values()))
+    for idx in range(0, len(hashes), SQLITE_MAX_BIND_VARS):
+        for attributes_id, shared_attrs in connection.execute(
+            select([StateAttributes.attributes_id, StateAttributes.shared_attrs]).where(
+                StateAttributes.hash.in_(hashes[idx : idx + SQLITE_MAX_BIND_VARS])
+            )
+        ):
+            # Rows with a colliding hash are not the ones we want
+            if shared_attrs in hashes_by_shared_attrs:
+                attributes_ids[shared_attrs] = attributes_id
+    return attributes_ids
@@ -0,0 +1,303 @@
+"""Backlog policies applied when the recorder queue overflows."""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from itertools import chain
+import json
+import logging
+import os
+import threading
+from typing import TextIO
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import (
+    Context,
+    Event,
+    EventOrigin,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.helpers.json import JSONEncoder
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    BACKLOG_JOURNAL,
+    BACKLOG_POLICY_COALESCE,
+    BACKLOG_POLICY_DROP,
+    BACKLOG_POLICY_SPILL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RecorderBacklog(ABC):
+    """Hold the events that do not fit in the recorder queue.
+
+    Events are added from the event loop and taken out
+    by the recorder thread once the queue has caught up.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """Initialize the backlog."""
+        self.max_size = max_size
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._replay_pending = False
+
+    @property
+    def replay_pending(self) -> bool:
+        """Return if events are waiting in the backlog to be replayed."""
+        return self._replay_pending
+
+    @callback
+    def async_add(self, event: Event) -> bool:
+        """Add an event to the backlog.
+
+        Returns True when the recorder needs to be told
+        to replay the backlog.
+        """
+        with self._lock:
+            self._add(event)
+            if self._replay_pending:
+                return False
+            self._replay_pending = True
+            return True
+
+    def load(self) -> None:
+        """Load the events a previous run left behind, from the recorder thread."""
+
+    def pop_all(self) -> Iterable[Event]:
+        """Remove and return the events in the backlog, oldest first."""
+        with self._lock:
+            self._replay_pending = False
+            return self._pop_all()
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Return the number of events in the backlog."""
+
+    @abstractmethod
+    def _add(self, event: Event) -> None:
+        """Add an event to the backlog while holding the lock."""
+
+    @abstractmethod
+    def _pop_all(self) -> Iterable[Event]:
+        """Remove and return the events while holding the lock."""
+
+
+class CoalesceBacklog(RecorderBacklog):
+    """Backlog keeping only the latest pending state change of an entity."""
+
+    def __init__(self, max_size: int) -> None:
+        """Initialize the backlog."""
+        super().__init__(max_size)
+        self._events: OrderedDict[str | int, Event] = OrderedDict()
+        self._counter = 0
+
+    def __len__(self) -> int:
+        """Return the number of events in the backlog."""
+        return len(self._events)
+
+    def _add(self, event: Event) -> None:
+        """Add an event replacing a pending state change of the same entity."""
+        if event.event_type == EVENT_STATE_CHANGED:
+            key: str | int = event.data["entity_id"]
+            if self._events.pop(key, None) is not None:
+                self.dropped += 1
+        else:
+            self._counter += 1
+            key = self._counter
+        self._events[key] = event
+        if len(self._events) > self.max_size:
+            self._events.popitem(last=False)
+            self.dropped += 1
+
+    def _pop_all(self) -> list[Event]:
+        """Remove and return the events."""
+        events = list(self._events.values())
+        self._events.clear()
+        return events
+
+
+class DropBacklog(RecorderBacklog):
+    """Backlog dropping the oldest low priority events first when full.
+
+    State changes are the only high priority events.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """Initialize the backlog."""
+        super().__init__(max_size)
+        self._events: OrderedDict[int, Event] = OrderedDict()
+        self._low_priority: OrderedDict[int, None] = OrderedDict()
+        self._counter = 0
+
+    def __len__(self) -> int:
+        """Return the number of events in the backlog."""
+        return len(self._events)
+
+    def _add(self, event: Event) -> None:
+        """Add an event making room by dropping the oldest low priority one."""
+        self._counter += 1
+        self._events[self._counter] = event
+        if event.event_type != EVENT_STATE_CHANGED:
+            self._low_priority[self._counter] = None
+        if len(self._events) <= self.max_size:
+            return
+        self.dropped += 1
+        if self._low_priority:
+            del self._events[self._low_priority.popitem(last=False)[0]]
+            return
+        self._events.popitem(last=False)
+
+    def _pop_all(self) -> list[Event]:
+        """Remove and return the events."""
+        events = list(self._events.values())
+        self._events.clear()
+        self._low_priority.clear()
+        return events
+
+
+class SpillBacklog(RecorderBacklog):
+    """Backlog appending the events to a journal on disk.
+
+    The journal is written from the executor and left behind
+    if Safegate Pro stops before it is replayed, so it is
+    replayed on the next start. It is read back one event at
+    a time, and events are dropped once it holds max_size events.
+    """
+
+    def __init__(self, hass: HomeAssistant, max_size: int, path: str) -> None:
+        """Initialize the backlog."""
+        super().__init__(max_size)
+        self.hass = hass
+        self.path = path
+        self._buffer: list[str] = []
+        self._buffered_events = 0
+        self._journal_events = 0
+        self._replaying_events = 0
+        self._flush_scheduled = False
+        self._file_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of events in the backlog."""
+        return self._buffered_events + self._journal_events + self._replaying_events
+
+    def load(self) -> None:
+        """Count the events in a journal left behind by a previous run."""
+        with self._file_lock:
+            if not os.path.exists(self.path):
+                return
+            with open(self.path, encoding="utf8") as journal:
+                self._journal_events = sum(1 for _ in journal)
+
+    @callback
+    def async_add(self, event: Event) -> bool:
+        """Add an event to the backlog and schedule writing it to the journal."""
+        replay = super().async_add(event)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.hass.async_add_executor_job(self.flush)
+        return replay
+
+    def _add(self, event: Event) -> None:
+        """Add an event to the lines waiting to be written."""
+        if len(self) >= self.max_size:
+            self.dropped += 1
+            return
+        try:
+            self._buffer.append(json.dumps(event.as_dict(), cls=JSONEncoder))
+        except (TypeError, ValueError):
+            _LOGGER.warning("Event is not JSON serializable: %s", event)
+            self.dropped += 1
+            return
+        self._buffered_events += 1
+
+    def flush(self) -> None:
+        """Append the buffered events to the journal."""
+        with self._file_lock:
+            with self._lock:
+                lines = self._buffer
+                self._buffer = []
+                self._buffered_events = 0
+                self._flush_scheduled = False
+            if not lines:
+                return
+            with open(self.path, "a", encoding="utf8") as journal:
+                journal.write("\n".join(lines) + "\n")
+            self._journal_events += len(lines)
+
+    def pop_all(self) -> Iterator[Event]:
+        """Remove the journal and the buffer and return their events."""
+        with self._file_lock:
+            return super().pop_all()
+
+    def _pop_all(self) -> Iterator[Event]:
+        """Detach the journal and the buffer, the file lock is held.
+
+        New events go to a new journal while the events are read.
+        """
+        journal = None
+        if os.path.exists(self.path):
+            # Closed once the events are read
+            # pylint: disable=consider-using-with
+            journal = open(self.path, encoding="utf8")
+            os.unlink(self.path)
+        lines = self._buffer
+        self._buffer = []
+        self._replaying_events = self._journal_events + self._buffered_events
+        self._buffered_events = 0
+        self._journal_events = 0
+        return self._read_events(journal, lines)
+
+    def _read_events(self, journal: TextIO | None, lines: list[str]) -> Iterator[Event]:
+        """Read the events of a detached journal and buffer, oldest first."""
+        try:
+            for line in chain(journal or (), lines):
+                self._replaying_events = max(self._replaying_events - 1, 0)
+                try:
+                    event = _event_from_dict(json.loads(line))
+                except (KeyError, TypeError, ValueError):
+                    _LOGGER.warning(
+                        "Skipping invalid recorder journal entry: %s", line.rstrip()
+                    )
+                    continue
+                yield event
+        finally:
+            self._replaying_events = 0
+            if journal is not None:
+                journal.close()
+
+
+def _event_from_dict(event_dict: dict) -> Event:
+    """Recreate an event from its dict representation."""
+    data = event_dict["data"]
+    if event_dict["event_type"] == EVENT_STATE_CHANGED:
+        data = {
+            **data,
+            "old_state": State.from_dict(data.get("old_state")),
+            "new_state": State.from_dict(data.get("new_state")),
+        }
+    return Event(
+        event_dict["event_type"],
+        data,
+        EventOrigin(event_dict["origin"]),
+        dt_util.parse_datetime(event_dict["time_fired"]),
+        Context(**event_dict["context"]),
+    )
+
+
+def create_backlog(
+    hass: HomeAssistant, policy: str, max_size: int
+) -> RecorderBacklog | None:
+    """Create the backlog for a policy, None if the recorder stops instead."""
+    if policy == BACKLOG_POLICY_COALESCE:
+        return CoalesceBacklog(max_size)
+    if policy == BACKLOG_POLICY_DROP:
+        return DropBacklog(max_size)
+    if policy == BACKLOG_POLICY_SPILL:
+        return SpillBacklog(hass, max_size, hass.config.path(BACKLOG_JOURNAL))
+    return None
@@ -6,10 +6,29 @@ DOMAIN = "recorder"
 
 CONF_DB_INTEGRITY_CHECK = "db_integrity_check"
 
-# The maximum number of rows (events) we purge in one delete statement
-
 # sqlite3 has a limit of 999 until version 3.32.0
 # in https://github.com/sqlite/sqlite/commit/efdba1a8b3c6c967e7fae9c1989c40d420ce64cc
 # We can increase this back to 1000 once most
 # have upgraded their sqlite version
-MAX_ROWS_TO_PURGE = 998
+SQLITE_MAX_BIND_VARS = 998
+
+# The maximum number of rows (events) we purge in one delete statement
+MAX_ROWS_TO_PURGE = SQLITE_MAX_BIND_VARS
+
+# The progress of an unfinished purge is stored to resume it after a restart
+PURGE_PROGRESS_STORAGE_KEY = "recorder.purge"
+PURGE_PROGRESS_STORAGE_VERSION = 1
+
+BACKLOG_POLICY_STOP = "stop"
+BACKLOG_POLICY_COALESCE = "coalesce"
+BACKLOG_POLICY_DROP = "drop"
+BACKLOG_POLICY_SPILL = "spill"
+BACKLOG_POLICIES = [
+    BACKLOG_POLICY_STOP,
+    BACKLOG_POLICY_COALESCE,
+    BACKLOG_POLICY_DROP,
+    BACKLOG_POLICY_SPILL,
+]
+
+# The journal events are spilled to when the queue overflows
+BACKLOG_JOURNAL = "recorder_backlog.jsonl"
@@ -1,16 +1,17 @@
 """Provide pre-made queries on top of the recorder component."""
 from __future__ import annotations
 
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 from itertools import groupby
 import logging
 import time
 
-from sqlalchemy import and_, bindparam, func
+from sqlalchemy import Float, Integer, and_, bindparam, case, cast, extract, func, null
 from sqlalchemy.ext import baked
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder.models import (
+    StateAttributes,
     States,
     process_timestamp_to_utc_isoformat,
 )
@@ -48,18 +49,56 @@ QUERY_STATES = [
     States.entity_id,
     States.state,
     States.attributes,
+    StateAttributes.shared_attrs,
     States.last_changed,
     States.last_updated,
 ]
 
 HISTORY_BAKERY = "recorder_history_bakery"
 
+# The number of rows fetched from the cursor at a time when streaming states
+STREAM_BATCH_SIZE = 1000
+
+AGGREGATE_LAST = "last"
+AGGREGATE_MEAN = "mean"
+AGGREGATE_MIN = "min"
+AGGREGATE_MAX = "max"
+AGGREGATES = (AGGREGATE_LAST, AGGREGATE_MEAN, AGGREGATE_MIN, AGGREGATE_MAX)
+
+AGGREGATE_FUNCTIONS = {
+    AGGREGATE_MEAN: func.avg,
+    AGGREGATE_MIN: func.min,
+    AGGREGATE_MAX: func.max,
+}
+
+NUMERIC_STATE_REGEX = r"^[-+]?[0-9]*\.?[0-9]+([eE][-+]?[0-9]+)?$"
+
+DownsampledRow = namedtuple(
+    "DownsampledRow",
+    [
+        "domain",
+        "entity_id",
+        "state",
+        "attributes",
+        "shared_attrs",
+        "last_changed",
+        "last_updated",
+    ],
+)
+
 
 def async_setup(hass):
     """Set up the history hooks."""
     hass.data[HISTORY_BAKERY] = baked.bakery()
 
 
+def _query_states_with_attributes(session):
+    """Query the states columns with the shared attributes joined in."""
+    return session.query(*QUERY_STATES).outerjoin(
+        StateAttributes, States.attributes_id == StateAttributes.attributes_id
+    )
+
+
 def get_significant_states(hass, *args, **kwargs):
     """Wrap _get_significant_states with a sql session."""
     with session_scope(hass=hass) as session:
@@ -76,6 +115,9 @@ def _get_significant_states(
     include_start_time_state=True,
     significant_changes_only=True,
     minimal_response=False,
+    bucket_size=None,
+    max_points=None,
+    aggregate=AGGREGATE_LAST,
 ):
     """
     Return states changes during UTC period start_time - end_time.
@@ -83,11 +125,153 @@ def _get_significant_states(
     Significant states are all states where there is a state change,
     as well as all states from certain domains (for instance
     thermostat so that we get current temperature in our graphs).
+
+    With a bucket_size, or max_points per entity to derive it from,
+    the states are downsampled to one state per entity and bucket.
     """
     timer_start = time.perf_counter()
 
+    states = _get_significant_state_rows(
+        hass,
+        session,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        significant_changes_only,
+        bucket_size,
+        max_points,
+        aggregate,
+    )
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_significant_states took %fs", elapsed)
+
+    return _sorted_states_to_dict(
+        hass,
+        session,
+        states,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        minimal_response,
+    )
+
+
+def iter_significant_states(
+    hass,
+    session,
+    start_time,
+    end_time=None,
+    entity_ids=None,
+    filters=None,
+    include_start_time_state=True,
+    significant_changes_only=True,
+    minimal_response=False,
+    bucket_size=None,
+    max_points=None,
+    aggregate=AGGREGATE_LAST,
+):
+    """Yield the significant states of the entities as (entity_id, states).
+
+    Takes the arguments of _get_significant_states, but the rows are
+    fetched from the cursor in batches of STREAM_BATCH_SIZE and only
+    the states of one entity are held in memory at a time. The entities
+    with states during the period come first, in entity_id order.
+    """
+    start_time_states = {}
+    if include_start_time_state:
+        run = recorder.run_information_from_instance(hass, start_time)
+        for state in _get_states_with_session(
+            hass, session, start_time, entity_ids, run=run, filters=filters
+        ):
+            state.last_changed = start_time
+            state.last_updated = start_time
+            start_time_states[state.entity_id] = state
+
+    states = _get_significant_state_rows(
+        hass,
+        session,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        significant_changes_only,
+        bucket_size,
+        max_points,
+        aggregate,
+        STREAM_BATCH_SIZE,
+    )
+    for ent_id, group in groupby(states, lambda state: state.entity_id):
+        ent_results = []
+        if (start_time_state := start_time_states.pop(ent_id, None)) is not None:
+            ent_results.append(start_time_state)
+        _append_entity_states(ent_results, ent_id, group, minimal_response)
+        yield ent_id, ent_results
+
+    yield from ((ent_id, [state]) for ent_id, state in start_time_states.items())
+
+
+def _get_significant_state_rows(
+    hass,
+    session,
+    start_time,
+    end_time,
+    entity_ids,
+    filters,
+    significant_changes_only,
+    bucket_size,
+    max_points,
+    aggregate,
+    yield_per=None,
+):
+    """Return the significant state rows sorted by entity_id and last_updated.
+
+    With yield_per the rows are fetched from the cursor in batches.
+    """
+    if max_points and not bucket_size:
+        bucket_size = ((end_time or dt_util.utcnow()) - start_time) / max_points
+
+    if bucket_size:
+        # There is at most one row per entity and bucket
+        return _get_downsampled_states(
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            significant_changes_only,
+            bucket_size,
+            aggregate,
+        )
+
+    return _get_all_significant_states(
+        hass,
+        session,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        significant_changes_only,
+        yield_per,
+    )
+
+
+def _get_all_significant_states(
+    hass,
+    session,
+    start_time,
+    end_time,
+    entity_ids,
+    filters,
+    significant_changes_only,
+    yield_per=None,
+):
+    """Return all the significant state rows sorted by entity_id and last_updated."""
     baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
+        lambda session: _query_states_with_attributes(session)
     )
 
     if significant_changes_only:
@@ -115,33 +299,124 @@ def _get_significant_states(
 
     baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
 
-    states = execute(
-        baked_query(session).params(
-            start_time=start_time, end_time=end_time, entity_ids=entity_ids
-        )
+    result = baked_query(session).params(
+        start_time=start_time, end_time=end_time, entity_ids=entity_ids
     )
+    if yield_per:
+        return result.with_post_criteria(lambda q: q.yield_per(yield_per))
+    return execute(result)
 
-    if _LOGGER.isEnabledFor(logging.DEBUG):
-        elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("get_significant_states took %fs", elapsed)
 
-    return _sorted_states_to_dict(
-        hass,
-        session,
-        states,
-        start_time,
-        entity_ids,
-        filters,
-        include_start_time_state,
-        minimal_response,
-    )
+def _get_downsampled_states(
+    session,
+    start_time,
+    end_time,
+    entity_ids,
+    filters,
+    significant_changes_only,
+    bucket_size,
+    aggregate,
+):
+    """Return one state row per entity and bucket of bucket_size.
+
+    The buckets are aggregated in the database. The row of the last
+    state in a bucket is returned, with the mean, min or max of the
+    numeric states in the bucket replacing its state.
+    """
+    dialect_name = session.bind.dialect.name
+    bucket_seconds = max(int(bucket_size.total_seconds()), 1)
+    columns = [States.entity_id, func.max(States.last_updated).label("last_updated")]
+    if aggregate != AGGREGATE_LAST:
+        numeric_state = case(
+            [(_numeric_state_clause(dialect_name), cast(States.state, Float))],
+            else_=null(),
+        )
+        columns.append(AGGREGATE_FUNCTIONS[aggregate](numeric_state).label("value"))
+
+    buckets = session.query(*columns).filter(States.last_updated > start_time)
+    if significant_changes_only:
+        buckets = buckets.filter(
+            States.domain.in_(SIGNIFICANT_DOMAINS)
+            | (States.last_changed == States.last_updated)
+        )
+    if entity_ids is not None:
+        buckets = buckets.filter(States.entity_id.in_(entity_ids))
+    else:
+        buckets = buckets.filter(~States.domain.in_(IGNORE_DOMAINS))
+        if filters:
+            buckets = filters.apply(buckets)
+    if end_time is not None:
+        buckets = buckets.filter(States.last_updated < end_time)
+    buckets = buckets.group_by(
+        States.entity_id, _bucket_clause(dialect_name, bucket_seconds)
+    ).subquery()
+
+    query = _query_states_with_attributes(session)
+    if aggregate != AGGREGATE_LAST:
+        query = query.add_columns(buckets.c.value)
+    query = query.join(
+        buckets,
+        and_(
+            States.entity_id == buckets.c.entity_id,
+            States.last_updated == buckets.c.last_updated,
+        ),
+    ).order_by(States.entity_id, States.last_updated)
+
+    rows = execute(query)
+    if aggregate == AGGREGATE_LAST:
+        return rows
+
+    return [
+        DownsampledRow(
+            row.domain,
+            row.entity_id,
+            row.state if row.value is None else _format_aggregate(row.value),
+            row.attributes,
+            row.shared_attrs,
+            row.last_changed,
+            row.last_updated,
+        )
+        for row in rows
+    ]
+
+
+def _bucket_clause(dialect_name, bucket_seconds):
+    """Return the clause numbering the buckets of the last_updated column."""
+    if dialect_name == "sqlite":
+        # Integer division truncates, sqlite may not have floor
+        return cast(func.strftime("%s", States.last_updated), Integer) / bucket_seconds
+    if dialect_name == "mysql":
+        epoch = func.unix_timestamp(States.last_updated)
+    else:
+        epoch = extract("epoch", States.last_updated)
+    return func.floor(epoch / bucket_seconds)
+
+
+def _numeric_state_clause(dialect_name):
+    """Return the clause matching the states which can be cast to a number."""
+    if dialect_name == "sqlite":
+        # sqlite casts anything to a number, so reject any other character
+        return States.state.op("GLOB")("*[0-9]*") & ~States.state.op("GLOB")(
+            "*[^-+.0-9eE]*"
+        )
+    if dialect_name == "postgresql":
+        return States.state.op("~")(NUMERIC_STATE_REGEX)
+    return States.state.op("REGEXP")(NUMERIC_STATE_REGEX)
+
+
+def _format_aggregate(value):
+    """Format an aggregated state like the states of the entity."""
+    value = round(float(value), 6)
+    if value.is_integer():
+        return str(int(value))
+    return str(value)
 
 
 def state_changes_during_period(hass, start_time, end_time=None, entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
     with session_scope(hass=hass) as session:
         baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
+            lambda session: _query_states_with_attributes(session)
         )
 
         baked_query += lambda q: q.filter(
@@ -155,7 +430,9 @@ def state_changes_during_period(hass, start_time, end_time=None, entity_id=None)
             )
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
@@ -177,12 +454,14 @@ def get_last_state_changes(hass, number_of_states, entity_id):
 
     with session_scope(hass=hass) as session:
         baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
+            lambda session: _query_states_with_attributes(session)
         )
         baked_query += lambda q: q.filter(States.last_changed == States.last_updated)
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(
@@ -243,7 +522,7 @@ def _get_states_with_session(
     # We have more than one entity to look at (most commonly we want
     # all entities,) so we need to do a search on all states since the
     # last recorder run started.
-    query = session.query(*QUERY_STATES)
+    query = _query_states_with_attributes(session)
 
     most_recent_states_by_date = session.query(
         States.entity_id.label("max_entity_id"),
@@ -292,7 +571,7 @@ def _get_single_entity_states_with_session(hass, session, utc_point_in_time, ent
     # Use an entirely different (and extremely fast) query if we only
     # have a single entity id
     baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
+        lambda session: _query_states_with_attributes(session)
     )
     baked_query += lambda q: q.filter(
         States.last_updated < bindparam("utc_point_in_time"),
@@ -350,53 +629,57 @@ def _sorted_states_to_dict(
         elapsed = time.perf_counter() - timer_start
         _LOGGER.debug("getting %d first datapoints took %fs", len(result), elapsed)
 
-    # Called in a tight loop so cache the function
-    # here
-    _process_timestamp_to_utc_isoformat = process_timestamp_to_utc_isoformat
-
     # Append all changes to it
     for ent_id, group in groupby(states, lambda state: state.entity_id):
-        domain = split_entity_id(ent_id)[0]
-        ent_results = result[ent_id]
-        if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
-            ent_results.extend(LazyState(db_state) for db_state in group)
-
-        # With minimal response we only provide a native
-        # State for the first and last response. All the states
-        # in-between only provide the "state" and the
-        # "last_changed".
-        if not ent_results:
-            ent_results.append(LazyState(next(group)))
-
-        prev_state = ent_results[-1]
-        initial_state_count = len(ent_results)
-
-        for db_state in group:
-            # With minimal response we do not care about attribute
-            # changes so we can filter out duplicate states
-            if db_state.state == prev_state.state:
-                continue
-
-            ent_results.append(
-                {
-                    STATE_KEY: db_state.state,
-                    LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
-                        db_state.last_changed
-                    ),
-                }
-            )
-            prev_state = db_state
-
-        if prev_state and len(ent_results) != initial_state_count:
-            # There was at least one state change
-            # replace the last minimal state with
-            # a full state
-            ent_results[-1] = LazyState(prev_state)
+        _append_entity_states(result[ent_id], ent_id, group, minimal_response)
 
     # Filter out the empty lists if some states had 0 results.
     return {key: val for key, val in result.items() if val}
 
 
+def _append_entity_states(ent_results, ent_id, group, minimal_response):
+    """Append the state rows of an entity to its results."""
+    domain = split_entity_id(ent_id)[0]
+    if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
+        ent_results.extend(LazyState(db_state) for db_state in group)
+
+    # With minimal response we only provide a native
+    # State for the first and last response. All the states
+    # in-between only provide the "state" and the
+    # "last_changed".
+    if not ent_results:
+        ent_results.append(LazyState(next(group)))
+
+    prev_state = ent_results[-1]
+    initial_state_count = len(ent_results)
+
+    # Called in a tight loop so cache the function
+    # here
+    _process_timestamp_to_utc_isoformat = process_timestamp_to_utc_isoformat
+
+    for db_state in group:
+        # With minimal response we do not care about attribute
+        # changes so we can filter out duplicate states
+        if db_state.state == prev_state.state:
+            continue
+
+        ent_results.append(
+            {
+                STATE_KEY: db_state.state,
+                LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
+                    db_state.last_changed
+                ),
+            }
+        )
+        prev_state = db_state
+
+    if prev_state and len(ent_results) != initial_state_count:
+        # There was at least one state change
+        # replace the last minimal state with
+        # a full state
+        ent_results[-1] = LazyState(prev_state)
+
+
 def get_state(hass, utc_point_in_time, entity_id, run=None):
     """Return a state at a specific point in time."""
     states = get_states(hass, utc_point_in_time, (entity_id,), run)
@@ -11,13 +11,18 @@ from sqlalchemy.exc import (
 )
 from sqlalchemy.schema import AddConstraint, DropConstraint
 
+from . import statistics
 from .models import (
     SCHEMA_VERSION,
     TABLE_STATES,
     Base,
     SchemaChanges,
+    StateAttributes,
     Statistics,
+    StatisticsDaily,
     StatisticsMeta,
+    StatisticsMonthly,
+    StatisticsShortTerm,
 )
 from .util import session_scope
 
@@ -347,7 +352,7 @@ def _drop_foreign_key_constraints(connection, engine, table, columns):
             )
 
 
-def _apply_update(engine, session, new_version, old_version):
+def _apply_update(engine, session, new_version, old_version):  # noqa: C901
     """Perform operations to bring schema up to date."""
     connection = session.connection()
     if new_version == 1:
@@ -475,6 +480,21 @@ def _apply_update(engine, session, new_version, old_version):
 
         StatisticsMeta.__table__.create(engine)
         Statistics.__table__.create(engine)
+    elif new_version == 19:
+        # Attributes are now stored once in the state_attributes
+        # table and shared by all the states which have them.
+        StateAttributes.__table__.create(engine, checkfirst=True)
+        _add_columns(connection, TABLE_STATES, ["attributes_id INTEGER"])
+        _create_index(connection, TABLE_STATES, "ix_states_attributes_id")
+    elif new_version == 20:
+        # Statistics are compiled every 5 minutes, the hourly
+        # statistics are aggregated from the short term statistics
+        StatisticsShortTerm.__table__.create(engine, checkfirst=True)
+    elif new_version == 21:
+        # Daily and monthly rollups of the hourly statistics
+        StatisticsDaily.__table__.create(engine, checkfirst=True)
+        StatisticsMonthly.__table__.create(engine, checkfirst=True)
+        statistics.rebuild_rollups(session)
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
@@ -1,8 +1,10 @@
 """Models for SQLAlchemy."""
-import json
+from datetime import timedelta
 import logging
+import zlib
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     DateTime,
@@ -16,7 +18,7 @@ from sqlalchemy import (
     distinct,
 )
 from sqlalchemy.dialects import mysql
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.declarative import declarative_base, declared_attr
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm.session import Session
 
@@ -29,33 +31,43 @@ from homeassistant.const import (
     MAX_LENGTH_STATE_STATE,
 )
 from homeassistant.core import Context, Event, EventOrigin, State, split_entity_id
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import json_dumps, json_loads
 import homeassistant.util.dt as dt_util
 
 # SQLAlchemy Schema
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 18
+SCHEMA_VERSION = 21
 
 _LOGGER = logging.getLogger(__name__)
 
 DB_TIMEZONE = "+00:00"
 
+EMPTY_JSON_OBJECT = "{}"
+
 TABLE_EVENTS = "events"
 TABLE_STATES = "states"
+TABLE_STATE_ATTRIBUTES = "state_attributes"
 TABLE_RECORDER_RUNS = "recorder_runs"
 TABLE_SCHEMA_CHANGES = "schema_changes"
 TABLE_STATISTICS = "statistics"
 TABLE_STATISTICS_META = "statistics_meta"
+TABLE_STATISTICS_SHORT_TERM = "statistics_short_term"
+TABLE_STATISTICS_DAILY = "statistics_daily"
+TABLE_STATISTICS_MONTHLY = "statistics_monthly"
 
 ALL_TABLES = [
     TABLE_STATES,
+    TABLE_STATE_ATTRIBUTES,
     TABLE_EVENTS,
     TABLE_RECORDER_RUNS,
     TABLE_SCHEMA_CHANGES,
     TABLE_STATISTICS,
     TABLE_STATISTICS_META,
+    TABLE_STATISTICS_SHORT_TERM,
+    TABLE_STATISTICS_DAILY,
+    TABLE_STATISTICS_MONTHLY,
 ]
 
 DATETIME_TYPE = DateTime(timezone=True).with_variant(
@@ -95,15 +107,20 @@ class Events(Base):  # type: ignore
     @staticmethod
     def from_event(event, event_data=None):
         """Create an event database object from a native event."""
-        return Events(
-            event_type=event.event_type,
-            event_data=event_data or json.dumps(event.data, cls=JSONEncoder),
-            origin=str(event.origin.value),
-            time_fired=event.time_fired,
-            context_id=event.context.id,
-            context_user_id=event.context.user_id,
-            context_parent_id=event.context.parent_id,
-        )
+        return Events(**Events.row_from_event(event, event_data))
+
+    @staticmethod
+    def row_from_event(event, event_data=None):
+        """Create the column values of an events row from a native event."""
+        return {
+            "event_type": event.event_type,
+            "event_data": event_data or json_dumps(event.data),
+            "origin": str(event.origin.value),
+            "time_fired": event.time_fired,
+            "context_id": event.context.id,
+            "context_user_id": event.context.user_id,
+            "context_parent_id": event.context.parent_id,
+        }
 
     def to_native(self, validate_entity_id=True):
         """Convert to a natve HA Event."""
@@ -115,13 +132,13 @@ class Events(Base):  # type: ignore
         try:
             return Event(
                 self.event_type,
-                json.loads(self.event_data),
+                json_loads(self.event_data),
                 EventOrigin(self.origin),
                 process_timestamp(self.time_fired),
                 context=context,
             )
         except ValueError:
-            # When json.loads fails
+            # When json_loads fails
             _LOGGER.exception("Error converting to event: %s", self)
             return None
 
@@ -148,8 +165,12 @@ class States(Base):  # type: ignore
     last_updated = Column(DATETIME_TYPE, default=dt_util.utcnow, index=True)
     created = Column(DATETIME_TYPE, default=dt_util.utcnow)
     old_state_id = Column(Integer, ForeignKey("states.state_id"), index=True)
+    attributes_id = Column(
+        Integer, ForeignKey(f"{TABLE_STATE_ATTRIBUTES}.attributes_id"), index=True
+    )
     event = relationship("Events", uselist=False)
     old_state = relationship("States", remote_side=[state_id])
+    state_attributes = relationship("StateAttributes")
 
     def __repr__(self) -> str:
         """Return string representation of instance for debugging."""
@@ -158,41 +179,55 @@ class States(Base):  # type: ignore
             f"id={self.state_id}, domain='{self.domain}', entity_id='{self.entity_id}', "
             f"state='{self.state}', event_id='{self.event_id}', "
             f"last_updated='{self.last_updated.isoformat(sep=' ', timespec='seconds')}', "
-            f"old_state_id={self.old_state_id}"
+            f"old_state_id={self.old_state_id}, attributes_id={self.attributes_id}"
             f")>"
         )
 
     @staticmethod
     def from_event(event):
-        """Create object from a state_changed event."""
+        """Create object from a state_changed event.
+
+        The attributes are not stored on the row, they are stored
+        in the state_attributes table, see StateAttributes.from_event.
+        """
+        return States(**States.row_from_event(event))
+
+    @staticmethod
+    def row_from_event(event):
+        """Create the column values of a states row from a state_changed event."""
         entity_id = event.data["entity_id"]
         state = event.data.get("new_state")
 
-        dbstate = States(entity_id=entity_id)
-
         # State got deleted
         if state is None:
-            dbstate.state = ""
-            dbstate.domain = split_entity_id(entity_id)[0]
-            dbstate.attributes = "{}"
-            dbstate.last_changed = event.time_fired
-            dbstate.last_updated = event.time_fired
-        else:
-            dbstate.domain = state.domain
-            dbstate.state = state.state
-            dbstate.attributes = json.dumps(dict(state.attributes), cls=JSONEncoder)
-            dbstate.last_changed = state.last_changed
-            dbstate.last_updated = state.last_updated
+            return {
+                "entity_id": entity_id,
+                "attributes": None,
+                "state": "",
+                "domain": split_entity_id(entity_id)[0],
+                "last_changed": event.time_fired,
+                "last_updated": event.time_fired,
+            }
 
-        return dbstate
+        return {
+            "entity_id": entity_id,
+            "attributes": None,
+            "state": state.state,
+            "domain": state.domain,
+            "last_changed": state.last_changed,
+            "last_updated": state.last_updated,
+        }
 
     def to_native(self, validate_entity_id=True):
         """Convert to an HA state object."""
+        attributes = self.attributes
+        if attributes is None and self.state_attributes is not None:
+            attributes = self.state_attributes.shared_attrs
         try:
             return State(
                 self.entity_id,
                 self.state,
-                json.loads(self.attributes),
+                json_loads(attributes or EMPTY_JSON_OBJECT),
                 process_timestamp(self.last_changed),
                 process_timestamp(self.last_updated),
                 # Join the events table on event_id to get the context instead
@@ -201,26 +236,87 @@ class States(Base):  # type: ignore
                 validate_entity_id=validate_entity_id,
             )
         except ValueError:
-            # When json.loads fails
+            # When json_loads fails
             _LOGGER.exception("Error converting row to state: %s", self)
             return None
 
 
-class Statistics(Base):  # type: ignore
-    """Statistics."""
+class StateAttributes(Base):  # type: ignore
+    """State attribute change history.
+
+    Attributes are shared between all the states rows that have
+    the exact same attributes, they are looked up by their hash.
+    """
 
     __table_args__ = (
-        # Used for fetching statistics for a certain entity at a specific time
-        Index("ix_statistics_statistic_id_start", "metadata_id", "start"),
+        {"mysql_default_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
     )
-    __tablename__ = TABLE_STATISTICS
+    __tablename__ = TABLE_STATE_ATTRIBUTES
+    attributes_id = Column(Integer, Identity(), primary_key=True)
+    hash = Column(BigInteger, index=True)
+    # Note that this is not named attributes to avoid confusion with the states table
+    shared_attrs = Column(Text().with_variant(mysql.LONGTEXT, "mysql"))
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        return (
+            f"<recorder.StateAttributes("
+            f"id={self.attributes_id}, hash='{self.hash}', attributes='{self.shared_attrs}'"
+            f")>"
+        )
+
+    @staticmethod
+    def from_event(event):
+        """Create object from a state_changed event."""
+        shared_attrs = StateAttributes.shared_attrs_from_event(event)
+        return StateAttributes(
+            shared_attrs=shared_attrs,
+            hash=StateAttributes.hash_shared_attrs(shared_attrs),
+        )
+
+    @staticmethod
+    def shared_attrs_from_event(event):
+        """Create the json encoded shared attributes from a state_changed event.
+
+        Uses the cached JSON of the state, which is shared with the
+        websocket and the api.
+        """
+        state = event.data.get("new_state")
+        # State got deleted
+        if state is None:
+            return EMPTY_JSON_OBJECT
+        return state.attributes_json()
+
+    @staticmethod
+    def hash_shared_attrs(shared_attrs):
+        """Return the hash of the json encoded shared attributes."""
+        return zlib.crc32(shared_attrs.encode("utf-8"))
+
+    def to_native(self):
+        """Convert to an HA state attributes dict."""
+        try:
+            return json_loads(self.shared_attrs)
+        except ValueError:
+            # When json_loads fails
+            _LOGGER.exception("Error converting row to state attributes: %s", self)
+            return {}
+
+
+class StatisticsBase:
+    """Statistics base class."""
+
     id = Column(Integer, primary_key=True)
     created = Column(DATETIME_TYPE, default=dt_util.utcnow)
-    metadata_id = Column(
-        Integer,
-        ForeignKey(f"{TABLE_STATISTICS_META}.id", ondelete="CASCADE"),
-        index=True,
-    )
+
+    @declared_attr
+    def metadata_id(self):
+        """Define the metadata_id column for sub classes."""
+        return Column(
+            Integer,
+            ForeignKey(f"{TABLE_STATISTICS_META}.id", ondelete="CASCADE"),
+            index=True,
+        )
+
     start = Column(DATETIME_TYPE, index=True)
     mean = Column(Float())
     min = Column(Float())
@@ -229,16 +325,66 @@ class Statistics(Base):  # type: ignore
     state = Column(Float())
     sum = Column(Float())
 
-    @staticmethod
-    def from_stats(metadata_id, start, stats):
+    @classmethod
+    def from_stats(cls, metadata_id, start, stats):
         """Create object from a statistics."""
-        return Statistics(
+        return cls(  # type: ignore
             metadata_id=metadata_id,
             start=start,
             **stats,
         )
 
 
+class Statistics(Base, StatisticsBase):  # type: ignore
+    """Hourly statistics."""
+
+    duration = timedelta(hours=1)
+
+    __table_args__ = (
+        # Used for fetching statistics for a certain entity at a specific time
+        Index("ix_statistics_statistic_id_start", "metadata_id", "start"),
+    )
+    __tablename__ = TABLE_STATISTICS
+
+
+class StatisticsShortTerm(Base, StatisticsBase):  # type: ignore
+    """Short term statistics, compiled every 5 minutes."""
+
+    duration = timedelta(minutes=5)
+
+    __table_args__ = (
+        # Used for fetching statistics for a certain entity at a specific time
+        Index("ix_statistics_short_term_statistic_id_start", "metadata_id", "start"),
+    )
+    __tablename__ = TABLE_STATISTICS_SHORT_TERM
+
+
+class StatisticsDaily(Base, StatisticsBase):  # type: ignore
+    """Daily statistics, rolled up from the hourly statistics.
+
+    The days start at midnight in the configured time zone.
+    """
+
+    __table_args__ = (
+        # Used for fetching statistics for a certain entity at a specific time
+        Index("ix_statistics_daily_statistic_id_start", "metadata_id", "start"),
+    )
+    __tablename__ = TABLE_STATISTICS_DAILY
+
+
+class StatisticsMonthly(Base, StatisticsBase):  # type: ignore
+    """Monthly statistics, rolled up from the daily statistics.
+
+    The months start at midnight in the configured time zone.
+    """
+
+    __table_args__ = (
+        # Used for fetching statistics for a certain entity at a specific time
+        Index("ix_statistics_monthly_statistic_id_start", "metadata_id", "start"),
+    )
+    __tablename__ = TABLE_STATISTICS_MONTHLY
+
+
 class StatisticsMeta(Base):  # type: ignore
     """Statistics meta data."""
 
@@ -354,10 +500,9 @@ def process_timestamp_to_utc_isoformat(ts):
 class LazyState(State):
     """A lazy version of core State."""
 
+    # entity_id and state use the slots of State
     __slots__ = [
         "_row",
-        "entity_id",
-        "state",
         "_attributes",
         "_last_changed",
         "_last_updated",
@@ -373,15 +518,19 @@ class LazyState(State):
         self._last_changed = None
         self._last_updated = None
         self._context = None
+        self._as_json = None
+        self._attributes_json = None
 
     @property  # type: ignore
     def attributes(self):
         """State attributes."""
         if not self._attributes:
             try:
-                self._attributes = json.loads(self._row.attributes)
+                self._attributes = json_loads(
+                    self._row.shared_attrs or self._row.attributes
+                )
             except ValueError:
-                # When json.loads fails
+                # When json_loads fails
                 _LOGGER.exception("Error converting row to state: %s", self._row)
                 self._attributes = {}
         return self._attributes
@@ -1,15 +1,18 @@
 """Purge old data helper."""
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime
 import logging
-from typing import TYPE_CHECKING, Callable
+from typing import TYPE_CHECKING, Any, Callable
 
 from sqlalchemy.orm.session import Session
 from sqlalchemy.sql.expression import distinct
 
+import homeassistant.util.dt as dt_util
+
 from .const import MAX_ROWS_TO_PURGE
-from .models import Events, RecorderRuns, States
+from .models import Events, RecorderRuns, StateAttributes, States, StatisticsShortTerm
 from .repack import repack_database
 from .util import retryable_database_job, session_scope
 
@@ -19,13 +22,62 @@ if TYPE_CHECKING:
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass
+class PurgeProgress:
+    """Progress of an incremental purge, stored to resume it after a restart."""
+
+    purge_before: datetime
+    repack: bool
+    apply_filter: bool
+    purged_rows: int = 0
+    elapsed: float = 0
+    remaining_events: int | None = None
+
+    @property
+    def rows_per_second(self) -> float:
+        """Return the number of rows purged per second spent purging."""
+        if not self.elapsed:
+            return 0
+        return self.purged_rows / self.elapsed
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict that can be stored."""
+        return {
+            "purge_before": self.purge_before.isoformat(),
+            "repack": self.repack,
+            "apply_filter": self.apply_filter,
+            "purged_rows": self.purged_rows,
+            "elapsed": self.elapsed,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> PurgeProgress:
+        """Create the progress from a stored dict."""
+        purge_before = dt_util.parse_datetime(data["purge_before"])
+        if purge_before is None:
+            raise ValueError(f"Invalid purge_before: {data['purge_before']}")
+        return cls(
+            purge_before,
+            bool(data["repack"]),
+            bool(data["apply_filter"]),
+            int(data.get("purged_rows", 0)),
+            float(data.get("elapsed", 0)),
+        )
+
+
 @retryable_database_job("purge")
 def purge_old_data(
-    instance: Recorder, purge_before: datetime, repack: bool, apply_filter: bool = False
+    instance: Recorder,
+    purge_before: datetime,
+    repack: bool,
+    apply_filter: bool = False,
+    progress: PurgeProgress | None = None,
 ) -> bool:
-    """Purge events and states older than purge_before.
+    """Purge events, states and short term statistics older than purge_before.
 
-    Cleans up an timeframe of an hour, based on the oldest record.
+    Cleans up a chunk of MAX_ROWS_TO_PURGE events and short term statistics,
+    based on the oldest record.
+    The number of deleted rows is added to progress.
     """
     _LOGGER.debug(
         "Purging states and events before target %s",
@@ -35,13 +87,28 @@ def purge_old_data(
     with session_scope(session=instance.get_session()) as session:  # type: ignore
         # Purge a max of MAX_ROWS_TO_PURGE, based on the oldest states or events record
         event_ids = _select_event_ids_to_purge(session, purge_before)
-        state_ids = _select_state_ids_to_purge(session, purge_before, event_ids)
+        state_ids, attributes_ids = _select_state_and_attributes_ids_to_purge(
+            session, purge_before, event_ids
+        )
         if state_ids:
-            _purge_state_ids(session, state_ids)
+            purged_rows = _purge_state_ids(session, state_ids)
+            _purge_unused_attributes_ids(instance, session, attributes_ids)
+            if progress is not None:
+                progress.purged_rows += purged_rows
         if event_ids:
-            _purge_event_ids(session, event_ids)
-            # If states or events purging isn't processing the purge_before yet,
-            # return false, as we are not done yet.
+            purged_rows = _purge_event_ids(session, event_ids)
+            if progress is not None:
+                progress.purged_rows += purged_rows
+        short_term_statistics = _select_short_term_statistics_to_purge(
+            session, purge_before
+        )
+        if short_term_statistics:
+            purged_rows = _purge_short_term_statistics(session, short_term_statistics)
+            if progress is not None:
+                progress.purged_rows += purged_rows
+        if event_ids or short_term_statistics:
+            # If states, events or statistics purging isn't processing the
+            # purge_before yet, return false, as we are not done yet.
             _LOGGER.debug("Purging hasn't fully completed yet")
             return False
         if apply_filter and _purge_filtered_data(instance, session) is False:
@@ -53,11 +120,29 @@ def purge_old_data(
     return True
 
 
+def estimate_events_to_purge(instance: Recorder, purge_before: datetime) -> int:
+    """Estimate the number of events older than purge_before.
+
+    Uses the range of their ids as both ends are index lookups
+    while counting the rows takes long on a large table.
+    """
+    with session_scope(session=instance.get_session()) as session:  # type: ignore
+        query = session.query(Events.event_id).filter(Events.time_fired < purge_before)
+        first_event_id = query.order_by(Events.time_fired).limit(1).scalar()
+        last_event_id = query.order_by(Events.time_fired.desc()).limit(1).scalar()
+    if first_event_id is None or last_event_id is None:
+        return 0
+    return max(int(last_event_id) - int(first_event_id) + 1, 0)
+
+
 def _select_event_ids_to_purge(session: Session, purge_before: datetime) -> list[int]:
-    """Return a list of event ids to purge."""
+    """Return a list of the oldest event ids to purge."""
+    # Walk the time_fired index from the oldest event so
+    # every chunk picks up where the previous one ended
     events = (
         session.query(Events.event_id)
         .filter(Events.time_fired < purge_before)
+        .order_by(Events.time_fired)
         .limit(MAX_ROWS_TO_PURGE)
         .all()
     )
@@ -65,24 +150,67 @@ def _select_event_ids_to_purge(session: Session, purge_before: datetime) -> list
     return [event.event_id for event in events]
 
 
-def _select_state_ids_to_purge(
-    session: Session, purge_before: datetime, event_ids: list[int]
+def _select_short_term_statistics_to_purge(
+    session: Session, purge_before: datetime
 ) -> list[int]:
-    """Return a list of state ids to purge."""
+    """Return a list of the oldest short term statistics ids to purge."""
+    statistics = (
+        session.query(StatisticsShortTerm.id)
+        .filter(StatisticsShortTerm.start < purge_before)
+        .order_by(StatisticsShortTerm.start)
+        .limit(MAX_ROWS_TO_PURGE)
+        .all()
+    )
+    _LOGGER.debug("Selected %s short term statistics to remove", len(statistics))
+    return [statistic.id for statistic in statistics]
+
+
+def _select_state_and_attributes_ids_to_purge(
+    session: Session, purge_before: datetime, event_ids: list[int]
+) -> tuple[list[int], set[int]]:
+    """Return a list of state ids and a set of attributes ids to purge."""
     if not event_ids:
-        return []
+        return [], set()
     states = (
-        session.query(States.state_id)
+        session.query(States.state_id, States.attributes_id)
         .filter(States.last_updated < purge_before)
         .filter(States.event_id.in_(event_ids))
         .all()
     )
     _LOGGER.debug("Selected %s state ids to remove", len(states))
-    return [state.state_id for state in states]
+    return [state.state_id for state in states], {
+        state.attributes_id for state in states if state.attributes_id is not None
+    }
+
+
+def _select_unused_attributes_ids(
+    session: Session, attributes_ids: set[int]
+) -> set[int]:
+    """Return the attributes ids that are no longer used by any state."""
+    if not attributes_ids:
+        return set()
+    seen_ids = {
+        state.attributes_id
+        for state in session.query(States.attributes_id)
+        .filter(States.attributes_id.in_(attributes_ids))
+        .distinct()
+        .all()
+    }
+    to_remove = attributes_ids - seen_ids
+    _LOGGER.debug("Selected %s shared attributes to remove", len(to_remove))
+    return to_remove
+
+
+def _purge_unused_attributes_ids(
+    instance: Recorder, session: Session, attributes_ids: set[int]
+) -> None:
+    """Delete the attributes that are no longer used by any state."""
+    if unused_attributes_ids := _select_unused_attributes_ids(session, attributes_ids):
+        _purge_attributes_ids(instance, session, unused_attributes_ids)
 
 
-def _purge_state_ids(session: Session, state_ids: list[int]) -> None:
-    """Disconnect states and delete by state id."""
+def _purge_state_ids(session: Session, state_ids: list[int]) -> int:
+    """Disconnect states and delete by state id, return the number of deleted rows."""
 
     # Update old_state_id to NULL before deleting to ensure
     # the delete does not fail due to a foreign key constraint
@@ -101,16 +229,49 @@ def _purge_state_ids(session: Session, state_ids: list[int]) -> None:
         .delete(synchronize_session=False)
     )
     _LOGGER.debug("Deleted %s states", deleted_rows)
+    return int(deleted_rows)
+
+
+def _purge_attributes_ids(
+    instance: Recorder, session: Session, attributes_ids: set[int]
+) -> None:
+    """Delete old attributes ids."""
+    deleted_rows = (
+        session.query(StateAttributes)
+        .filter(StateAttributes.attributes_id.in_(attributes_ids))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s attribute states", deleted_rows)
+
+    # Evict any entries in the attributes id cache since
+    # the ids are now gone from the database
+    instance._evict_purged_attributes_from_cache(  # pylint: disable=protected-access
+        attributes_ids
+    )
 
 
-def _purge_event_ids(session: Session, event_ids: list[int]) -> None:
-    """Delete by event id."""
+def _purge_event_ids(session: Session, event_ids: list[int]) -> int:
+    """Delete by event id, return the number of deleted rows."""
     deleted_rows = (
         session.query(Events)
         .filter(Events.event_id.in_(event_ids))
         .delete(synchronize_session=False)
     )
     _LOGGER.debug("Deleted %s events", deleted_rows)
+    return int(deleted_rows)
+
+
+def _purge_short_term_statistics(
+    session: Session, short_term_statistics: list[int]
+) -> int:
+    """Delete by id, return the number of deleted rows."""
+    deleted_rows = (
+        session.query(StatisticsShortTerm)
+        .filter(StatisticsShortTerm.id.in_(short_term_statistics))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s short term statistics", deleted_rows)
+    return int(deleted_rows)
 
 
 def _purge_old_recorder_runs(
@@ -138,7 +299,7 @@ def _purge_filtered_data(instance: Recorder, session: Session) -> bool:
         if not instance.entity_filter(entity_id)
     ]
     if len(excluded_entity_ids) > 0:
-        _purge_filtered_states(session, excluded_entity_ids)
+        _purge_filtered_states(instance, session, excluded_entity_ids)
         return False
 
     # Check if excluded event_types are in database
@@ -148,19 +309,22 @@ def _purge_filtered_data(instance: Recorder, session: Session) -> bool:
         if event_type in instance.exclude_t
     ]
     if len(excluded_event_types) > 0:
-        _purge_filtered_events(session, excluded_event_types)
+        _purge_filtered_events(instance, session, excluded_event_types)
         return False
 
     return True
 
 
-def _purge_filtered_states(session: Session, excluded_entity_ids: list[str]) -> None:
+def _purge_filtered_states(
+    instance: Recorder, session: Session, excluded_entity_ids: list[str]
+) -> None:
     """Remove filtered states and linked events."""
     state_ids: list[int]
     event_ids: list[int | None]
-    state_ids, event_ids = zip(
+    attributes_ids: list[int | None]
+    state_ids, event_ids, attributes_ids = zip(
         *(
-            session.query(States.state_id, States.event_id)
+            session.query(States.state_id, States.event_id, States.attributes_id)
             .filter(States.entity_id.in_(excluded_entity_ids))
             .limit(MAX_ROWS_TO_PURGE)
             .all()
@@ -172,9 +336,14 @@ def _purge_filtered_states(session: Session, excluded_entity_ids: list[str]) ->
     )
     _purge_state_ids(session, state_ids)
     _purge_event_ids(session, event_ids)  # type: ignore  # type of event_ids already narrowed to 'list[int]'
+    _purge_unused_attributes_ids(
+        instance, session, {id_ for id_ in attributes_ids if id_ is not None}
+    )
 
 
-def _purge_filtered_events(session: Session, excluded_event_types: list[str]) -> None:
+def _purge_filtered_events(
+    instance: Recorder, session: Session, excluded_event_types: list[str]
+) -> None:
     """Remove filtered events and linked states."""
     events: list[Events] = (
         session.query(Events.event_id)
@@ -187,11 +356,17 @@ def _purge_filtered_events(session: Session, excluded_event_types: list[str]) ->
         "Selected %s event_ids to remove that should be filtered", len(event_ids)
     )
     states: list[States] = (
-        session.query(States.state_id).filter(States.event_id.in_(event_ids)).all()
+        session.query(States.state_id, States.attributes_id)
+        .filter(States.event_id.in_(event_ids))
+        .all()
     )
     state_ids: list[int] = [state.state_id for state in states]
+    attributes_ids: set[int] = {
+        state.attributes_id for state in states if state.attributes_id is not None
+    }
     _purge_state_ids(session, state_ids)
     _purge_event_ids(session, event_ids)
+    _purge_unused_attributes_ids(instance, session, attributes_ids)
 
 
 @retryable_database_job("purge")
@@ -206,7 +381,7 @@ def purge_entity_data(instance: Recorder, entity_filter: Callable[[str], bool])
         _LOGGER.debug("Purging entity data for %s", selected_entity_ids)
         if len(selected_entity_ids) > 0:
             # Purge a max of MAX_ROWS_TO_PURGE, based on the oldest states or events record
-            _purge_filtered_states(session, selected_entity_ids)
+            _purge_filtered_states(instance, session, selected_entity_ids)
             _LOGGER.debug("Purging entity data hasn't fully completed yet")
             return False
 
@@ -0,0 +1,89 @@
+"""Entities to track the recorder queue and purge."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.sensor import SensorEntity
+from homeassistant.const import TIME_SECONDS
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import ConfigType
+
+from .const import DATA_INSTANCE
+
+ATTR_ROWS_PER_SECOND = "rows_per_second"
+
+
+async def async_setup_platform(
+    hass: HomeAssistant,
+    config: ConfigType,
+    async_add_entities: AddEntitiesCallback,
+    discovery_info: dict[str, Any] | None = None,
+) -> None:
+    """Set up the recorder queue platform."""
+    instance = hass.data[DATA_INSTANCE]
+
+    async_add_entities(
+        [
+            RecorderQueueDepth(instance),
+            RecorderLag(instance),
+            RecorderPurgeBacklog(instance),
+        ]
+    )
+
+
+class RecorderQueueDepth(SensorEntity):
+    """Entity to represent how many events are waiting to be recorded."""
+
+    _attr_name = "Recorder queue depth"
+    _attr_unit_of_measurement = "events"
+
+    def __init__(self, instance) -> None:
+        """Initialize the queue depth."""
+        self.instance = instance
+
+    @property
+    def state(self) -> int:
+        """Return the number of events in the queue and the backlog."""
+        return self.instance.queue_depth
+
+
+class RecorderLag(SensorEntity):
+    """Entity to represent how far the recorder is behind."""
+
+    _attr_name = "Recorder lag"
+    _attr_unit_of_measurement = TIME_SECONDS
+
+    def __init__(self, instance) -> None:
+        """Initialize the lag."""
+        self.instance = instance
+
+    @property
+    def state(self) -> float:
+        """Return the seconds since the last recorded event was fired."""
+        return round(self.instance.lag, 1)
+
+
+class RecorderPurgeBacklog(SensorEntity):
+    """Entity to represent how many events are left to purge."""
+
+    _attr_name = "Recorder purge backlog"
+    _attr_unit_of_measurement = "events"
+
+    def __init__(self, instance) -> None:
+        """Initialize the purge backlog."""
+        self.instance = instance
+
+    @property
+    def state(self) -> int:
+        """Return the estimated number of events left to purge."""
+        if (progress := self.instance.purge_progress) is None:
+            return 0
+        return progress.remaining_events or 0
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the purge rate."""
+        if (progress := self.instance.purge_progress) is None:
+            return {ATTR_ROWS_PER_SECOND: 0}
+        return {ATTR_ROWS_PER_SECOND: round(progress.rows_per_second)}
@@ -5,9 +5,10 @@ from collections import defaultdict
 from datetime import datetime, timedelta
 from itertools import groupby
 import logging
-from typing import TYPE_CHECKING
+from statistics import mean
+from typing import TYPE_CHECKING, NamedTuple
 
-from sqlalchemy import bindparam
+from sqlalchemy import and_, bindparam, func
 from sqlalchemy.ext import baked
 
 from homeassistant.const import PRESSURE_PA, TEMP_CELSIUS
@@ -16,7 +17,15 @@ import homeassistant.util.pressure as pressure_util
 import homeassistant.util.temperature as temperature_util
 
 from .const import DOMAIN
-from .models import Statistics, StatisticsMeta, process_timestamp_to_utc_isoformat
+from .models import (
+    Statistics,
+    StatisticsDaily,
+    StatisticsMeta,
+    StatisticsMonthly,
+    StatisticsShortTerm,
+    process_timestamp,
+    process_timestamp_to_utc_isoformat,
+)
 from .util import execute, retryable_database_job, session_scope
 
 if TYPE_CHECKING:
@@ -33,6 +42,39 @@ QUERY_STATISTICS = [
     Statistics.sum,
 ]
 
+QUERY_STATISTICS_SHORT_TERM = [
+    StatisticsShortTerm.metadata_id,
+    StatisticsShortTerm.start,
+    StatisticsShortTerm.mean,
+    StatisticsShortTerm.min,
+    StatisticsShortTerm.max,
+    StatisticsShortTerm.last_reset,
+    StatisticsShortTerm.state,
+    StatisticsShortTerm.sum,
+]
+
+QUERY_STATISTICS_DAILY = [
+    StatisticsDaily.metadata_id,
+    StatisticsDaily.start,
+    StatisticsDaily.mean,
+    StatisticsDaily.min,
+    StatisticsDaily.max,
+    StatisticsDaily.last_reset,
+    StatisticsDaily.state,
+    StatisticsDaily.sum,
+]
+
+QUERY_STATISTICS_MONTHLY = [
+    StatisticsMonthly.metadata_id,
+    StatisticsMonthly.start,
+    StatisticsMonthly.mean,
+    StatisticsMonthly.min,
+    StatisticsMonthly.max,
+    StatisticsMonthly.last_reset,
+    StatisticsMonthly.state,
+    StatisticsMonthly.sum,
+]
+
 QUERY_STATISTIC_META = [
     StatisticsMeta.id,
     StatisticsMeta.statistic_id,
@@ -41,6 +83,16 @@ QUERY_STATISTIC_META = [
 
 STATISTICS_BAKERY = "recorder_statistics_bakery"
 STATISTICS_META_BAKERY = "recorder_statistics_bakery"
+STATISTICS_SHORT_TERM_BAKERY = "recorder_statistics_short_term_bakery"
+STATISTICS_DAILY_BAKERY = "recorder_statistics_daily_bakery"
+STATISTICS_MONTHLY_BAKERY = "recorder_statistics_monthly_bakery"
+
+PERIOD_5MINUTE = "5minute"
+PERIOD_HOUR = "hour"
+PERIOD_DAY = "day"
+PERIOD_WEEK = "week"
+PERIOD_MONTH = "month"
+PERIODS = [PERIOD_5MINUTE, PERIOD_HOUR, PERIOD_DAY, PERIOD_WEEK, PERIOD_MONTH]
 
 # Convert pressure and temperature statistics from the native unit used for statistics
 # to the units configured by the user
@@ -64,6 +116,9 @@ def async_setup(hass):
     """Set up the history hooks."""
     hass.data[STATISTICS_BAKERY] = baked.bakery()
     hass.data[STATISTICS_META_BAKERY] = baked.bakery()
+    hass.data[STATISTICS_SHORT_TERM_BAKERY] = baked.bakery()
+    hass.data[STATISTICS_DAILY_BAKERY] = baked.bakery()
+    hass.data[STATISTICS_MONTHLY_BAKERY] = baked.bakery()
 
 
 def get_start_time() -> datetime.datetime:
@@ -73,6 +128,59 @@ def get_start_time() -> datetime.datetime:
     return start
 
 
+def get_short_term_start_time(
+    now: datetime.datetime | None = None,
+) -> datetime.datetime:
+    """Return the start time of the 5 minute period before now."""
+    last_period = dt_util.as_utc(now or dt_util.utcnow()) - StatisticsShortTerm.duration
+    return last_period.replace(
+        minute=last_period.minute - last_period.minute % 5, second=0, microsecond=0
+    )
+
+
+def get_period_bounds(
+    start: datetime.datetime, period: str
+) -> tuple[datetime.datetime, datetime.datetime]:
+    """Return the UTC bounds of the day, week or month containing start.
+
+    The periods start at midnight in the configured time zone,
+    the weeks start on Monday.
+    """
+    local = dt_util.as_local(process_timestamp(start))
+    period_start = local.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == PERIOD_MONTH:
+        period_start = period_start.replace(day=1)
+        period_end = (period_start + timedelta(days=32)).replace(day=1)
+    elif period == PERIOD_WEEK:
+        period_start -= timedelta(days=period_start.weekday())
+        period_end = period_start + timedelta(weeks=1)
+    else:
+        period_end = period_start + timedelta(days=1)
+    return dt_util.as_utc(period_start), dt_util.as_utc(period_end)
+
+
+def _table_and_bakery(hass, period):
+    """Return the statistics table and its bakery for a period."""
+    if period == PERIOD_5MINUTE:
+        return StatisticsShortTerm, hass.data[STATISTICS_SHORT_TERM_BAKERY]
+    if period in (PERIOD_DAY, PERIOD_WEEK):
+        return StatisticsDaily, hass.data[STATISTICS_DAILY_BAKERY]
+    if period == PERIOD_MONTH:
+        return StatisticsMonthly, hass.data[STATISTICS_MONTHLY_BAKERY]
+    return Statistics, hass.data[STATISTICS_BAKERY]
+
+
+def _query_columns(table):
+    """Return the columns to query from a statistics table."""
+    if table is StatisticsShortTerm:
+        return QUERY_STATISTICS_SHORT_TERM
+    if table is StatisticsDaily:
+        return QUERY_STATISTICS_DAILY
+    if table is StatisticsMonthly:
+        return QUERY_STATISTICS_MONTHLY
+    return QUERY_STATISTICS
+
+
 def _get_metadata_ids(hass, session, statistic_ids):
     """Resolve metadata_id for a list of statistic_ids."""
     baked_query = hass.data[STATISTICS_META_BAKERY](
@@ -102,9 +210,9 @@ def _get_or_add_metadata_id(hass, session, statistic_id, metadata):
 
 @retryable_database_job("statistics")
 def compile_statistics(instance: Recorder, start: datetime.datetime) -> bool:
-    """Compile statistics."""
+    """Compile short term statistics for the 5 minute period starting at start."""
     start = dt_util.as_utc(start)
-    end = start + timedelta(hours=1)
+    end = start + StatisticsShortTerm.duration
     _LOGGER.debug("Compiling statistics for %s-%s", start, end)
     platform_stats = []
     for domain, platform in instance.hass.data[DOMAIN].items():
@@ -121,11 +229,113 @@ def compile_statistics(instance: Recorder, start: datetime.datetime) -> bool:
                 metadata_id = _get_or_add_metadata_id(
                     instance.hass, session, entity_id, stat["meta"]
                 )
-                session.add(Statistics.from_stats(metadata_id, start, stat["stat"]))
+                session.add(
+                    StatisticsShortTerm.from_stats(metadata_id, start, stat["stat"])
+                )
+
+    return True
+
+
+def _compile_summary(session, table, start, end) -> dict[int, dict]:
+    """Summarize the statistics of a table starting in start-end per metadata_id.
+
+    The mean is the mean of the means and the min and max the extremes.
+    The sum, state and last_reset are the ones of the last statistics.
+    """
+    summary: dict[int, dict] = {}
+    in_period = and_(table.start >= start, table.start < end)
+    for metadata_id, _mean, _min, _max in (
+        session.query(
+            table.metadata_id,
+            func.avg(table.mean),
+            func.min(table.min),
+            func.max(table.max),
+        )
+        .filter(in_period)
+        .group_by(table.metadata_id)
+    ):
+        summary[metadata_id] = {"mean": _mean, "min": _min, "max": _max}
+
+    last_starts = (
+        session.query(table.metadata_id, func.max(table.start).label("start"))
+        .filter(in_period)
+        .group_by(table.metadata_id)
+        .subquery()
+    )
+    for metadata_id, last_reset, state, _sum in session.query(
+        table.metadata_id, table.last_reset, table.state, table.sum
+    ).join(
+        last_starts,
+        and_(
+            table.metadata_id == last_starts.c.metadata_id,
+            table.start == last_starts.c.start,
+        ),
+    ):
+        summary.setdefault(metadata_id, {}).update(
+            {"last_reset": last_reset, "state": state, "sum": _sum}
+        )
+
+    return summary
+
+
+def _update_rollup(session, table, source_table, start, end) -> None:
+    """Replace the statistics of a rollup table starting at start."""
+    summary = _compile_summary(session, source_table, start, end)
+    session.query(table).filter(table.start == start).delete(synchronize_session=False)
+    for metadata_id, stat in summary.items():
+        session.add(table.from_stats(metadata_id, start, stat))
+    session.flush()
+
+
+def _update_rollups(session, start: datetime.datetime) -> None:
+    """Update the daily and monthly statistics containing the hour at start.
+
+    They are updated every hour so the current day and month
+    include the hours compiled so far.
+    """
+    day_start, day_end = get_period_bounds(start, PERIOD_DAY)
+    _update_rollup(session, StatisticsDaily, Statistics, day_start, day_end)
+    month_start, month_end = get_period_bounds(start, PERIOD_MONTH)
+    _update_rollup(session, StatisticsMonthly, StatisticsDaily, month_start, month_end)
+
+
+@retryable_database_job("statistics")
+def compile_hourly_statistics(instance: Recorder, start: datetime.datetime) -> bool:
+    """Compile hourly statistics from the short term statistics of the hour.
+
+    The daily and monthly statistics containing the hour are updated with it.
+    """
+    start = dt_util.as_utc(start)
+    end = start + Statistics.duration
+    _LOGGER.debug("Compiling hourly statistics for %s-%s", start, end)
+
+    with session_scope(session=instance.get_session()) as session:  # type: ignore
+        summary = _compile_summary(session, StatisticsShortTerm, start, end)
+        for metadata_id, stat in summary.items():
+            session.add(Statistics.from_stats(metadata_id, start, stat))
+        session.flush()
+        _update_rollups(session, start)
 
     return True
 
 
+def rebuild_rollups(session) -> None:
+    """Compile the daily and monthly statistics of all hourly statistics."""
+    first_start = session.query(func.min(Statistics.start)).scalar()
+    last_start = session.query(func.max(Statistics.start)).scalar()
+    if first_start is None or last_start is None:
+        return
+    last_start = process_timestamp(last_start)
+    for period, table, source_table in (
+        (PERIOD_DAY, StatisticsDaily, Statistics),
+        (PERIOD_MONTH, StatisticsMonthly, StatisticsDaily),
+    ):
+        start, end = get_period_bounds(first_start, period)
+        while start <= last_start:
+            _update_rollup(session, table, source_table, start, end)
+            start, end = get_period_bounds(end, period)
+
+
 def _get_metadata(hass, session, statistic_ids, statistic_type):
     """Fetch meta data."""
 
@@ -175,58 +385,72 @@ def list_statistic_ids(hass, statistic_type=None):
         return list(metadata.values())
 
 
-def statistics_during_period(hass, start_time, end_time=None, statistic_ids=None):
-    """Return states changes during UTC period start_time - end_time."""
+def statistics_during_period(
+    hass, start_time, end_time=None, statistic_ids=None, period=PERIOD_HOUR
+):
+    """Return states changes during UTC period start_time - end_time.
+
+    The period is one of PERIODS, the weekly statistics
+    are reduced from the daily ones.
+    """
     metadata = None
+    table, bakery = _table_and_bakery(hass, period)
     with session_scope(hass=hass) as session:
         metadata = _get_metadata(hass, session, statistic_ids, None)
         if not metadata:
             return {}
 
-        baked_query = hass.data[STATISTICS_BAKERY](
-            lambda session: session.query(*QUERY_STATISTICS)
-        )
+        baked_query = bakery(lambda session: session.query(*_query_columns(table)))
 
-        baked_query += lambda q: q.filter(Statistics.start >= bindparam("start_time"))
+        baked_query += lambda q: q.filter(table.start >= bindparam("start_time"))
 
         if end_time is not None:
-            baked_query += lambda q: q.filter(Statistics.start < bindparam("end_time"))
+            baked_query += lambda q: q.filter(table.start < bindparam("end_time"))
 
         metadata_ids = None
         if statistic_ids is not None:
             baked_query += lambda q: q.filter(
-                Statistics.metadata_id.in_(bindparam("metadata_ids"))
+                table.metadata_id.in_(bindparam("metadata_ids"))
             )
             metadata_ids = list(metadata.keys())
 
-        baked_query += lambda q: q.order_by(Statistics.metadata_id, Statistics.start)
+        baked_query += lambda q: q.order_by(table.metadata_id, table.start)
 
         stats = execute(
             baked_query(session).params(
                 start_time=start_time, end_time=end_time, metadata_ids=metadata_ids
             )
         )
+        if period == PERIOD_WEEK:
+            stats = _reduce_statistics_to_weeks(stats)
         return _sorted_statistics_to_dict(hass, stats, statistic_ids, metadata)
 
 
 def get_last_statistics(hass, number_of_stats, statistic_id):
     """Return the last number_of_stats statistics for a statistic_id."""
+    return _get_last_statistics(hass, number_of_stats, statistic_id, PERIOD_HOUR)
+
+
+def get_last_short_term_statistics(hass, number_of_stats, statistic_id):
+    """Return the last number_of_stats short term statistics for a statistic_id."""
+    return _get_last_statistics(hass, number_of_stats, statistic_id, PERIOD_5MINUTE)
+
+
+def _get_last_statistics(hass, number_of_stats, statistic_id, period):
+    """Return the last number_of_stats statistics of a period for a statistic_id."""
     statistic_ids = [statistic_id]
+    table, bakery = _table_and_bakery(hass, period)
     with session_scope(hass=hass) as session:
         metadata = _get_metadata(hass, session, statistic_ids, None)
         if not metadata:
             return {}
 
-        baked_query = hass.data[STATISTICS_BAKERY](
-            lambda session: session.query(*QUERY_STATISTICS)
-        )
+        baked_query = bakery(lambda session: session.query(*_query_columns(table)))
 
         baked_query += lambda q: q.filter_by(metadata_id=bindparam("metadata_id"))
         metadata_id = next(iter(metadata.keys()))
 
-        baked_query += lambda q: q.order_by(
-            Statistics.metadata_id, Statistics.start.desc()
-        )
+        baked_query += lambda q: q.order_by(table.metadata_id, table.start.desc())
 
         baked_query += lambda q: q.limit(bindparam("number_of_stats"))
 
@@ -239,6 +463,49 @@ def get_last_statistics(hass, number_of_stats, statistic_id):
         return _sorted_statistics_to_dict(hass, stats, statistic_ids, metadata)
 
 
+class ReducedStatistics(NamedTuple):
+    """Statistics reduced from the statistics of a shorter period."""
+
+    metadata_id: int
+    start: datetime.datetime
+    mean: float | None
+    min: float | None
+    max: float | None
+    last_reset: datetime.datetime | None
+    state: float | None
+    sum: float | None
+
+
+def _reduce_statistics_to_weeks(stats) -> list[ReducedStatistics]:
+    """Reduce daily statistics sorted by metadata_id and start to weeks."""
+    reduced = []
+    for (metadata_id, week_start), group in groupby(
+        stats,
+        lambda stat: (
+            stat.metadata_id,
+            get_period_bounds(stat.start, PERIOD_WEEK)[0],
+        ),
+    ):
+        days = list(group)
+        means = [day.mean for day in days if day.mean is not None]
+        mins = [day.min for day in days if day.min is not None]
+        maxes = [day.max for day in days if day.max is not None]
+        last_day = days[-1]
+        reduced.append(
+            ReducedStatistics(
+                metadata_id,
+                week_start,
+                mean(means) if means else None,
+                min(mins) if mins else None,
+                max(maxes) if maxes else None,
+                last_day.last_reset,
+                last_day.state,
+                last_day.sum,
+            )
+        )
+    return reduced
+
+
 def _sorted_statistics_to_dict(
     hass,
     stats,
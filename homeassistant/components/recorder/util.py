@@ -21,8 +21,12 @@ from .models import (
     ALL_TABLES,
     TABLE_RECORDER_RUNS,
     TABLE_SCHEMA_CHANGES,
+    TABLE_STATE_ATTRIBUTES,
     TABLE_STATISTICS,
+    TABLE_STATISTICS_DAILY,
     TABLE_STATISTICS_META,
+    TABLE_STATISTICS_MONTHLY,
+    TABLE_STATISTICS_SHORT_TERM,
     RecorderRuns,
     process_timestamp,
 )
@@ -180,7 +184,15 @@ def basic_sanity_check(cursor):
     """Check tables to make sure select does not fail."""
 
     for table in ALL_TABLES:
-        if table in [TABLE_STATISTICS, TABLE_STATISTICS_META]:
+        # Tables added by a schema migration may not exist yet
+        if table in [
+            TABLE_STATE_ATTRIBUTES,
+            TABLE_STATISTICS,
+            TABLE_STATISTICS_META,
+            TABLE_STATISTICS_SHORT_TERM,
+            TABLE_STATISTICS_DAILY,
+            TABLE_STATISTICS_MONTHLY,
+        ]:
             continue
         if table in (TABLE_RECORDER_RUNS, TABLE_SCHEMA_CHANGES):
             cursor.execute(f"SELECT * FROM {table};")  # nosec # not injection
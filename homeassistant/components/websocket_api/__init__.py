@@ -6,6 +6,7 @@ from typing import Final, cast
 import voluptuous as vol
 
 from homeassistant.core import HomeAssistant, callback
+import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.loader import bind_hass
 
@@ -39,6 +40,26 @@ DOMAIN: Final = const.DOMAIN
 
 DEPENDENCIES: Final[tuple[str]] = ("http",)
 
+COMPRESSION_SCHEMA: Final = vol.Schema(
+    {
+        vol.Optional(
+            const.CONF_MIN_SIZE, default=const.DEFAULT_COMPRESSION_MIN_SIZE
+        ): cv.positive_int,
+        vol.Optional(
+            const.CONF_LEVEL, default=const.DEFAULT_COMPRESSION_LEVEL
+        ): vol.All(vol.Coerce(int), vol.Range(min=0, max=9)),
+    }
+)
+
+CONFIG_SCHEMA: Final = vol.Schema(
+    {
+        vol.Optional(DOMAIN, default={}): vol.Schema(
+            {vol.Optional(const.CONF_COMPRESSION, default={}): COMPRESSION_SCHEMA}
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
 
 @bind_hass
 @callback
@@ -64,6 +85,10 @@ def async_register_command(
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Initialize the websocket API."""
+    conf = config.get(DOMAIN, {})
+    hass.data[const.DATA_COMPRESSION] = COMPRESSION_SCHEMA(
+        conf.get(const.CONF_COMPRESSION, {})
+    )
     hass.http.register_view(http.WebsocketAPIView())
     commands.async_register_commands(hass, async_register_command)
     return True
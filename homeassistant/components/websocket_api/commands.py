@@ -12,15 +12,29 @@ from homeassistant.auth.permissions.const import CAT_ENTITIES, POLICY_READ
 from homeassistant.bootstrap import SIGNAL_BOOTSTRAP_INTEGRATONS
 from homeassistant.components.websocket_api.const import ERR_NOT_FOUND
 from homeassistant.const import EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL
-from homeassistant.core import Context, Event, HomeAssistant, callback
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Context,
+    Event,
+    HomeAssistant,
+    callback,
+    split_entity_id,
+)
 from homeassistant.exceptions import (
     HomeAssistantError,
     ServiceNotFound,
     TemplateError,
     Unauthorized,
 )
-from homeassistant.helpers import config_validation as cv, entity, template
+from homeassistant.helpers import (
+    config_validation as cv,
+    entity,
+    polling,
+    profiling,
+    template,
+)
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entityfilter import generate_filter
 from homeassistant.helpers.event import (
     TrackTemplate,
     TrackTemplateResult,
@@ -43,6 +57,7 @@ def async_register_commands(
     """Register commands."""
     async_reg(hass, handle_call_service)
     async_reg(hass, handle_entity_source)
+    async_reg(hass, handle_event_stats)
     async_reg(hass, handle_execute_script)
     async_reg(hass, handle_get_config)
     async_reg(hass, handle_get_services)
@@ -51,10 +66,15 @@ def async_register_commands(
     async_reg(hass, handle_integration_setup_info)
     async_reg(hass, handle_manifest_list)
     async_reg(hass, handle_ping)
+    async_reg(hass, handle_polling_stats)
+    async_reg(hass, handle_profiling_timings)
     async_reg(hass, handle_render_template)
     async_reg(hass, handle_subscribe_bootstrap_integrations)
+    async_reg(hass, handle_subscribe_entities)
     async_reg(hass, handle_subscribe_events)
     async_reg(hass, handle_subscribe_trigger)
+    async_reg(hass, handle_supported_features)
+    async_reg(hass, handle_template_cache_stats)
     async_reg(hass, handle_test_condition)
     async_reg(hass, handle_unsubscribe_events)
 
@@ -69,6 +89,11 @@ def pong_message(iden: int) -> dict[str, Any]:
     {
         vol.Required("type"): "subscribe_events",
         vol.Optional("event_type", default=MATCH_ALL): str,
+        vol.Optional("entity_ids"): cv.entity_ids,
+        vol.Optional("domains"): vol.All(
+            cv.ensure_list, [vol.All(cv.string, vol.Strip, vol.Lower, cv.slug)]
+        ),
+        vol.Optional("entity_globs"): vol.All(cv.ensure_list, [cv.string]),
     }
 )
 def handle_subscribe_events(
@@ -84,6 +109,10 @@ def handle_subscribe_events(
     if event_type not in SUBSCRIBE_ALLOWLIST and not connection.user.is_admin:
         raise Unauthorized
 
+    entity_ids = set(msg.get("entity_ids", ()))
+    domains = set(msg.get("domains", ()))
+    entity_globs = msg.get("entity_globs", [])
+
     if event_type == EVENT_STATE_CHANGED:
 
         @callback
@@ -96,6 +125,31 @@ def handle_subscribe_events(
 
             connection.send_message(messages.cached_event_message(msg["id"], event))
 
+        if entity_ids or domains or entity_globs:
+            unsubs = _async_listen_state_changed_filtered(
+                hass, entity_ids, domains, entity_globs, forward_events
+            )
+
+            @callback
+            def unsub_all() -> None:
+                """Remove the listeners of the subscription."""
+                for unsub in unsubs:
+                    unsub()
+
+            connection.subscriptions[msg["id"]] = unsub_all
+        else:
+            connection.subscriptions[msg["id"]] = hass.bus.async_listen(
+                event_type, forward_events
+            )
+
+    elif entity_ids or domains or entity_globs:
+        connection.send_error(
+            msg["id"],
+            const.ERR_INVALID_FORMAT,
+            f"Entity filters are only supported for {EVENT_STATE_CHANGED} events",
+        )
+        return
+
     else:
 
         @callback
@@ -106,11 +160,125 @@ def handle_subscribe_events(
 
             connection.send_message(messages.cached_event_message(msg["id"], event))
 
-    connection.subscriptions[msg["id"]] = hass.bus.async_listen(
-        event_type, forward_events
-    )
+        connection.subscriptions[msg["id"]] = hass.bus.async_listen(
+            event_type, forward_events
+        )
+
+    connection.send_message(messages.result_message(msg["id"]))
+
+
+def _event_data_domain(event_data: dict[str, Any]) -> str:
+    """Return the domain of the entity of the event data to route keyed listeners."""
+    return split_entity_id(event_data["entity_id"])[0]
+
+
+@callback
+def _async_listen_state_changed_filtered(
+    hass: HomeAssistant,
+    entity_ids: set[str],
+    domains: set[str],
+    entity_globs: list[str],
+    listener: Callable[[Event], None],
+) -> list[CALLBACK_TYPE]:
+    """Listen for the state changes of entities matching filters.
+
+    Entity ids and domains are looked up in the keyed listener index,
+    globs are only matched for entities that are not.
+    """
+    unsubs = []
+    if entity_ids:
+        unsubs.append(
+            hass.bus.async_listen_keyed(EVENT_STATE_CHANGED, entity_ids, listener)
+        )
+
+    if domains:
+
+        @callback
+        def domain_listener(event: Event) -> None:
+            """Forward the state changes of a domain not matched by entity id."""
+            if event.data["entity_id"] not in entity_ids:
+                listener(event)
+
+        unsubs.append(
+            hass.bus.async_listen_keyed(
+                EVENT_STATE_CHANGED,
+                domains,
+                domain_listener,
+                key_getter=_event_data_domain,
+            )
+        )
+
+    if entity_globs:
+        glob_filter = generate_filter([], [], [], [], entity_globs)
+
+        @callback
+        def glob_event_filter(event: Event) -> bool:
+            """Match the state changes not matched by entity id or domain."""
+            entity_id: str = event.data["entity_id"]
+            return (
+                entity_id not in entity_ids
+                and split_entity_id(entity_id)[0] not in domains
+                and glob_filter(entity_id)
+            )
+
+        unsubs.append(
+            hass.bus.async_listen(
+                EVENT_STATE_CHANGED, listener, event_filter=glob_event_filter
+            )
+        )
+
+    return unsubs
+
+
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "subscribe_entities",
+        vol.Optional("entity_ids"): cv.entity_ids,
+    }
+)
+def handle_subscribe_entities(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle subscribe entities command.
+
+    Sends the compact states of the entities and then only what changes.
+    """
+    entity_ids = msg.get("entity_ids")
+
+    @callback
+    def forward_entity_changes(event: Event) -> None:
+        """Forward entity state changes to websocket."""
+        if not connection.user.permissions.check_entity(
+            event.data["entity_id"], POLICY_READ
+        ):
+            return
+
+        connection.send_message(messages.cached_entity_diff_message(msg["id"], event))
+
+    if entity_ids is None:
+        connection.subscriptions[msg["id"]] = hass.bus.async_listen(
+            EVENT_STATE_CHANGED, forward_entity_changes
+        )
+        states = hass.states.async_all()
+    else:
+        connection.subscriptions[msg["id"]] = hass.bus.async_listen_keyed(
+            EVENT_STATE_CHANGED, entity_ids, forward_entity_changes
+        )
+        states = [
+            state
+            for entity_id in entity_ids
+            if (state := hass.states.get(entity_id)) is not None
+        ]
+
+    if not connection.user.permissions.access_all_entities(POLICY_READ):
+        entity_perm = connection.user.permissions.check_entity
+        states = [
+            state for state in states if entity_perm(state.entity_id, POLICY_READ)
+        ]
 
     connection.send_message(messages.result_message(msg["id"]))
+    connection.send_message(messages.entities_message(msg["id"], states))
 
 
 @callback
@@ -238,7 +406,7 @@ def handle_get_states(
             if entity_perm(state.entity_id, "read")
         ]
 
-    connection.send_message(messages.result_message(msg["id"], states))
+    connection.send_message(messages.states_result_message(msg["id"], states))
 
 
 @decorators.websocket_command({vol.Required("type"): "get_services"})
@@ -260,6 +428,16 @@ def handle_get_config(
     connection.send_message(messages.result_message(msg["id"], hass.config.as_dict()))
 
 
+@callback
+@decorators.websocket_command({vol.Required("type"): "event/stats"})
+@decorators.require_admin
+def handle_event_stats(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle event stats command."""
+    connection.send_result(msg["id"], hass.bus.async_event_stats())
+
+
 @decorators.websocket_command({vol.Required("type"): "manifest/list"})
 @decorators.async_response
 async def handle_manifest_list(
@@ -305,6 +483,21 @@ async def handle_integration_setup_info(
     )
 
 
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "supported_features",
+        vol.Required("features"): {str: int},
+    }
+)
+def handle_supported_features(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle setting supported features."""
+    connection.supported_features = msg["features"]
+    connection.send_result(msg["id"])
+
+
 @callback
 @decorators.websocket_command({vol.Required("type"): "ping"})
 def handle_ping(
@@ -314,6 +507,16 @@ def handle_ping(
     connection.send_message(pong_message(msg["id"]))
 
 
+@callback
+@decorators.websocket_command({vol.Required("type"): "polling/stats"})
+@decorators.require_admin
+def handle_polling_stats(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle polling stats command."""
+    connection.send_result(msg["id"], polling.async_get(hass).async_stats())
+
+
 @decorators.websocket_command(
     {
         vol.Required("type"): "render_template",
@@ -331,6 +534,8 @@ async def handle_render_template(
     """Handle render_template command."""
     template_str = msg["template"]
     template_obj = template.Template(template_str, hass)  # type: ignore[no-untyped-call]
+    # Dashboards often subscribe to the same template from many clients
+    template_obj.cache_renders = True
     variables = msg.get("variables")
     timeout = msg.get("timeout")
     info = None
@@ -386,6 +591,32 @@ async def handle_render_template(
     hass.loop.call_soon_threadsafe(info.async_refresh)
 
 
+@callback
+@decorators.websocket_command({vol.Required("type"): "template/cache_stats"})
+@decorators.require_admin
+def handle_template_cache_stats(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle template cache stats command."""
+    connection.send_result(
+        msg["id"], template.async_get_render_cache(hass).async_stats()
+    )
+
+
+@callback
+@decorators.websocket_command(
+    {vol.Required("type"): "profiling/timings", vol.Optional("limit"): cv.positive_int}
+)
+@decorators.require_admin
+def handle_profiling_timings(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle profiling timings command."""
+    connection.send_result(
+        msg["id"], profiling.async_get(hass).as_dict(msg.get("limit"))
+    )
+
+
 @callback
 @decorators.websocket_command(
     {vol.Required("type"): "entity/source", vol.Optional("entity_id"): [cv.entity_id]}
@@ -3,12 +3,10 @@ from __future__ import annotations
 
 import asyncio
 from concurrent import futures
-from functools import partial
-import json
 from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Final
 
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import json_dumps
 
 if TYPE_CHECKING:
     from .connection import ActiveConnection
@@ -26,6 +24,8 @@ URL: Final = "/api/websocket"
 PENDING_MSG_PEAK: Final = 512
 PENDING_MSG_PEAK_TIME: Final = 5
 MAX_PENDING_MSG: Final = 2048
+# Queued messages are only sent in one frame up to this size in bytes
+MAX_COALESCED_BYTES: Final = 65536
 
 ERR_ID_REUSE: Final = "id_reuse"
 ERR_INVALID_FORMAT: Final = "invalid_format"
@@ -40,6 +40,9 @@ ERR_TEMPLATE_ERROR: Final = "template_error"
 
 TYPE_RESULT: Final = "result"
 
+# Features a client can enable with the supported_features command
+FEATURE_COALESCE_MESSAGES: Final = "coalesce_messages"
+
 # Define the possible errors that occur when connections are cancelled.
 # Originally, this was just asyncio.CancelledError, but issue #9546 showed
 # that futures.CancelledErrors can also occur in some situations.
@@ -51,5 +54,18 @@ SIGNAL_WEBSOCKET_DISCONNECTED: Final = "websocket_disconnected"
 
 # Data used to store the current connection list
 DATA_CONNECTIONS: Final = f"{DOMAIN}.connections"
+# Data used to store the compression settings and the bytes sent
+DATA_COMPRESSION: Final = f"{DOMAIN}.compression"
+DATA_BYTES_SENT: Final = f"{DOMAIN}.bytes_sent"
+DATA_CONNECTION_BYTES_SENT: Final = f"{DOMAIN}.connection_bytes_sent"
+
+CONF_COMPRESSION: Final = "compression"
+CONF_LEVEL: Final = "level"
+CONF_MIN_SIZE: Final = "min_size"
+
+# Messages smaller than this are not worth compressing
+DEFAULT_COMPRESSION_MIN_SIZE: Final = 128
+# zlib.Z_BEST_SPEED, the level aiohttp compresses at
+DEFAULT_COMPRESSION_LEVEL: Final = 1
 
-JSON_DUMP: Final = partial(json.dumps, cls=JSONEncoder, allow_nan=False)
+JSON_DUMP: Final = json_dumps
@@ -4,9 +4,11 @@ from __future__ import annotations
 import asyncio
 from collections.abc import Callable
 from contextlib import suppress
+from dataclasses import dataclass
 import datetime as dt
 import logging
 from typing import Any, Final
+import zlib
 
 from aiohttp import WSMsgType, web
 import async_timeout
@@ -17,9 +19,19 @@ from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers.event import async_call_later
 
 from .auth import AuthPhase, auth_required_message
+from .connection import ActiveConnection
 from .const import (
     CANCELLATION_ERRORS,
+    CONF_LEVEL,
+    CONF_MIN_SIZE,
+    DATA_BYTES_SENT,
+    DATA_COMPRESSION,
+    DATA_CONNECTION_BYTES_SENT,
     DATA_CONNECTIONS,
+    DEFAULT_COMPRESSION_LEVEL,
+    DEFAULT_COMPRESSION_MIN_SIZE,
+    FEATURE_COALESCE_MESSAGES,
+    MAX_COALESCED_BYTES,
     MAX_PENDING_MSG,
     PENDING_MSG_PEAK,
     PENDING_MSG_PEAK_TIME,
@@ -53,6 +65,38 @@ class WebSocketAdapter(logging.LoggerAdapter):
         return f'[{self.extra["connid"]}] {msg}', kwargs
 
 
+@dataclass
+class BytesSent:
+    """Bytes of the messages sent and bytes written to the wire for them."""
+
+    raw: int = 0
+    wire: int = 0
+
+
+def _byte_size(message: str) -> int:
+    """Return the size of a message encoded as UTF-8."""
+    return len(message) if message.isascii() else len(message.encode())
+
+
+class _CountingTransport:
+    """Transport that counts the bytes written to it."""
+
+    def __init__(self, transport: asyncio.Transport, *counters: BytesSent) -> None:
+        """Initialize the counting transport."""
+        self._transport = transport
+        self._counters = counters
+
+    def write(self, data: bytes) -> None:
+        """Write data to the transport."""
+        for counter in self._counters:
+            counter.wire += len(data)
+        self._transport.write(data)
+
+    def __getattr__(self, name: str) -> Any:
+        """Return an attribute of the transport."""
+        return getattr(self._transport, name)
+
+
 class WebSocketHandler:
     """Handle an active websocket client connection."""
 
@@ -64,6 +108,12 @@ class WebSocketHandler:
         self._to_write: asyncio.Queue = asyncio.Queue(maxsize=MAX_PENDING_MSG)
         self._handle_task: asyncio.Task | None = None
         self._writer_task: asyncio.Task | None = None
+        self._connection: ActiveConnection | None = None
+        self.bytes_sent = BytesSent()
+        self._total_bytes_sent = BytesSent()
+        # Window bits of the negotiated permessage-deflate, 0 if not negotiated
+        self._compress = 0
+        self._compression_min_size = DEFAULT_COMPRESSION_MIN_SIZE
         self._logger = WebSocketAdapter(_WS_LOGGER, {"connid": id(self)})
         self._peak_checker_unsub: Callable[[], None] | None = None
 
@@ -71,20 +121,100 @@ class WebSocketHandler:
         """Write outgoing messages."""
         # Exceptions if Socket disconnected or cancelled by connection handler
         assert self.wsock is not None
+        # Message that did not fit in the last frame
+        next_message: str | None = None
         with suppress(RuntimeError, ConnectionResetError, *CANCELLATION_ERRORS):
             while not self.wsock.closed:
-                message = await self._to_write.get()
-                if message is None:
+                if next_message is not None:
+                    message, next_message = next_message, None
+                elif (message := await self._to_write.get()) is None:
                     break
 
-                self._logger.debug("Sending %s", message)
-                await self.wsock.send_str(message)
+                if self._to_write.empty() or not self._coalesce_messages:
+                    self._logger.debug("Sending %s", message)
+                    await self._async_send(message)
+                    continue
+
+                # Send the queued messages in one frame
+                messages = [message]
+                size = _byte_size(message) + 2
+                closing = False
+                while not self._to_write.empty():
+                    if (message := self._to_write.get_nowait()) is None:
+                        closing = True
+                        break
+                    size += _byte_size(message) + 1
+                    if size > MAX_COALESCED_BYTES:
+                        next_message = message
+                        break
+                    messages.append(message)
+
+                if len(messages) == 1:
+                    coalesced = messages[0]
+                else:
+                    coalesced = f"[{','.join(messages)}]"
+                self._logger.debug("Sending %s", coalesced)
+                await self._async_send(coalesced)
+                if closing:
+                    break
 
         # Clean up the peaker checker when we shut down the writer
         if self._peak_checker_unsub is not None:
             self._peak_checker_unsub()
             self._peak_checker_unsub = None
 
+    async def _async_send(self, message: str) -> None:
+        """Send a message, compressed if it is large enough."""
+        assert self.wsock is not None
+        raw = _byte_size(message)
+        self.bytes_sent.raw += raw
+        self._total_bytes_sent.raw += raw
+        if self._compress:
+            # Private attribute of the WebSocketWriter of aiohttp==3.7.4.post0,
+            # see _setup_compression
+            # pylint: disable=protected-access
+            self.wsock._writer.compress = (  # type: ignore[union-attr]
+                self._compress if raw >= self._compression_min_size else 0
+            )
+        await self.wsock.send_str(message)
+
+    def _setup_compression(self) -> None:
+        """Compress at the configured level and count the bytes written.
+
+        aiohttp negotiates permessage-deflate but compresses every message
+        at the fastest level and has no way to count the bytes written,
+        so its writer is adjusted once the connection is prepared.
+
+        The compress, _compressobj and transport attributes of the writer
+        are private to aiohttp and used as they are in the pinned
+        aiohttp==3.7.4.post0. Check them when upgrading aiohttp.
+        """
+        assert self.wsock is not None
+        # pylint: disable=protected-access
+        if (writer := self.wsock._writer) is None:
+            return
+        config = self.hass.data.get(DATA_COMPRESSION, {})
+        self._compression_min_size = config.get(
+            CONF_MIN_SIZE, DEFAULT_COMPRESSION_MIN_SIZE
+        )
+        self._compress = writer.compress
+        if self._compress:
+            writer._compressobj = zlib.compressobj(
+                level=config.get(CONF_LEVEL, DEFAULT_COMPRESSION_LEVEL),
+                wbits=-self._compress,
+            )
+        self._total_bytes_sent = self.hass.data.setdefault(DATA_BYTES_SENT, BytesSent())
+        writer.transport = _CountingTransport(
+            writer.transport, self.bytes_sent, self._total_bytes_sent
+        )
+
+    @property
+    def _coalesce_messages(self) -> bool:
+        """Return if the client accepts several messages in a frame."""
+        return self._connection is not None and bool(
+            self._connection.supported_features.get(FEATURE_COALESCE_MESSAGES)
+        )
+
     @callback
     def _send_message(self, message: str | dict[str, Any]) -> None:
         """Send a message to the client.
@@ -144,6 +274,7 @@ class WebSocketHandler:
         request = self.request
         wsock = self.wsock = web.WebSocketResponse(heartbeat=55)
         await wsock.prepare(request)
+        self._setup_compression()
         self._logger.debug("Connected from %s", request.remote)
         self._handle_task = asyncio.current_task()
 
@@ -189,10 +320,14 @@ class WebSocketHandler:
                 raise Disconnect from err
 
             self._logger.debug("Received %s", msg_data)
-            connection = await auth.async_handle(msg_data)
+            connection = self._connection = await auth.async_handle(msg_data)
             self.hass.data[DATA_CONNECTIONS] = (
                 self.hass.data.get(DATA_CONNECTIONS, 0) + 1
             )
+            bytes_sent_by_connection = self.hass.data.setdefault(
+                DATA_CONNECTION_BYTES_SENT, {}
+            )
+            bytes_sent_by_connection[connection] = self.bytes_sent
             self.hass.helpers.dispatcher.async_dispatcher_send(
                 SIGNAL_WEBSOCKET_CONNECTED
             )
@@ -241,6 +376,11 @@ class WebSocketHandler:
                 self._writer_task.cancel()
 
             finally:
+                self._logger.debug(
+                    "Sent %s bytes, %s bytes on the wire",
+                    self.bytes_sent.raw,
+                    self.bytes_sent.wire,
+                )
                 if disconnect_warn is None:
                     self._logger.debug("Disconnected")
                 else:
@@ -248,6 +388,7 @@ class WebSocketHandler:
 
                 if connection is not None:
                     self.hass.data[DATA_CONNECTIONS] -= 1
+                    self.hass.data[DATA_CONNECTION_BYTES_SENT].pop(connection, None)
                 self.hass.helpers.dispatcher.async_dispatcher_send(
                     SIGNAL_WEBSOCKET_DISCONNECTED
                 )
@@ -1,13 +1,15 @@
 """Message templates for websocket commands."""
 from __future__ import annotations
 
+from collections.abc import Iterable
 from functools import lru_cache
 import logging
 from typing import Any, Final
 
 import voluptuous as vol
 
-from homeassistant.core import Event
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Context, Event, State
 from homeassistant.helpers import config_validation as cv
 from homeassistant.util.json import (
     find_paths_unserializable_data,
@@ -31,12 +33,50 @@ BASE_COMMAND_MESSAGE_SCHEMA: Final = vol.Schema({vol.Required("id"): cv.positive
 IDEN_TEMPLATE: Final = "__IDEN__"
 IDEN_JSON_TEMPLATE: Final = '"__IDEN__"'
 
+# Placeholders for states that are inserted with their cached JSON.
+# Entity ids are lower case, so they can not contain them.
+STATES_TEMPLATE: Final = "__STATES__"
+STATES_JSON_TEMPLATE: Final = '"__STATES__"'
+STATE_CHANGED_TEMPLATES: Final = {
+    "old_state": ("__OLD_STATE__", '"__OLD_STATE__"'),
+    "new_state": ("__NEW_STATE__", '"__NEW_STATE__"'),
+}
+
+# Keys of the compact states of entity subscriptions
+COMPRESSED_STATE_STATE: Final = "s"
+COMPRESSED_STATE_ATTRIBUTES: Final = "a"
+COMPRESSED_STATE_CONTEXT: Final = "c"
+COMPRESSED_STATE_LAST_CHANGED: Final = "lc"
+COMPRESSED_STATE_LAST_UPDATED: Final = "lu"
+
+# Keys of the events of entity subscriptions
+ENTITY_EVENT_ADD: Final = "a"
+ENTITY_EVENT_CHANGE: Final = "c"
+ENTITY_EVENT_REMOVE: Final = "r"
+ENTITY_DIFF_ADDITIONS: Final = "+"
+ENTITY_DIFF_REMOVALS: Final = "-"
+
 
 def result_message(iden: int, result: Any = None) -> dict[str, Any]:
     """Return a success result message."""
     return {"id": iden, "type": const.TYPE_RESULT, "success": True, "result": result}
 
 
+def states_result_message(iden: int, states: Iterable[State]) -> str:
+    """Return a success result message with a list of states.
+
+    The states are inserted with their cached JSON.
+    """
+    try:
+        states_json = ",".join(state.as_json() for state in states)
+    except (ValueError, TypeError):
+        # Serialize the states again to log the bad data
+        return message_to_json(result_message(iden, list(states)))
+    return message_to_json(result_message(iden, STATES_TEMPLATE)).replace(
+        STATES_JSON_TEMPLATE, f"[{states_json}]", 1
+    )
+
+
 def error_message(iden: int | None, code: str, message: str) -> dict[str, Any]:
     """Return an error result message."""
     return {
@@ -71,9 +111,132 @@ def _cached_event_message(event: Event) -> str:
     The IDEN_TEMPLATE is used which will be replaced
     with the actual iden in cached_event_message
     """
+    if event.event_type == EVENT_STATE_CHANGED:
+        try:
+            return _state_changed_event_message(event)
+        except (ValueError, TypeError):
+            # Serialize the event again to log the bad data
+            pass
     return message_to_json(event_message(IDEN_TEMPLATE, event))
 
 
+def _state_changed_event_message(event: Event) -> str:
+    """Serialize a state changed event with the cached JSON of its states.
+
+    The states are serialized once for all connections and the recorder.
+    """
+    data = dict(event.data)
+    states: list[tuple[str, State]] = []
+    for key, (template, json_template) in STATE_CHANGED_TEMPLATES.items():
+        if isinstance(state := data.get(key), State):
+            data[key] = template
+            states.append((json_template, state))
+
+    message = const.JSON_DUMP(
+        event_message(IDEN_TEMPLATE, {**event.as_dict(), "data": data})
+    )
+    for json_template, state in states:
+        message = message.replace(json_template, state.as_json(), 1)
+    return message
+
+
+def compressed_state_dict(state: State) -> dict[str, Any]:
+    """Return a compact dict of a state for entity subscriptions.
+
+    The entity_id is left out as states are keyed by it, timestamps are
+    epoch seconds and last_updated is only included if it differs from
+    last_changed.
+    """
+    compressed: dict[str, Any] = {
+        COMPRESSED_STATE_STATE: state.state,
+        COMPRESSED_STATE_ATTRIBUTES: dict(state.attributes),
+        COMPRESSED_STATE_CONTEXT: _compressed_context(state.context),
+        COMPRESSED_STATE_LAST_CHANGED: state.last_changed.timestamp(),
+    }
+    if state.last_changed != state.last_updated:
+        compressed[COMPRESSED_STATE_LAST_UPDATED] = state.last_updated.timestamp()
+    return compressed
+
+
+def _compressed_context(context: Context) -> str | dict[str, str | None]:
+    """Return the id of a context, or all of it if it has a user or parent."""
+    if context.user_id is None and context.parent_id is None:
+        return context.id
+    return context.as_dict()
+
+
+def entities_message(iden: int, states: Iterable[State]) -> str:
+    """Return an event message with the compact states of entities."""
+    return message_to_json(
+        event_message(
+            iden,
+            {
+                ENTITY_EVENT_ADD: {
+                    state.entity_id: compressed_state_dict(state) for state in states
+                }
+            },
+        )
+    )
+
+
+def cached_entity_diff_message(iden: int, event: Event) -> str:
+    """Return an event message with the changes of a state changed event.
+
+    Serialize to json once for all connections.
+    """
+    return _cached_entity_diff_message(event).replace(IDEN_JSON_TEMPLATE, str(iden), 1)
+
+
+@lru_cache(maxsize=128)
+def _cached_entity_diff_message(event: Event) -> str:
+    """Cache and serialize the changes of a state changed event to json."""
+    return message_to_json(event_message(IDEN_TEMPLATE, _entity_diff(event)))
+
+
+def _entity_diff(event: Event) -> dict[str, Any]:
+    """Return what changed for an entity in a state changed event."""
+    entity_id: str = event.data["entity_id"]
+    old_state: State | None = event.data["old_state"]
+    new_state: State | None = event.data["new_state"]
+
+    if new_state is None:
+        return {ENTITY_EVENT_REMOVE: [entity_id]}
+    if old_state is None:
+        return {ENTITY_EVENT_ADD: {entity_id: compressed_state_dict(new_state)}}
+
+    additions: dict[str, Any] = {}
+    if old_state.state != new_state.state:
+        additions[COMPRESSED_STATE_STATE] = new_state.state
+    if old_state.context != new_state.context:
+        additions[COMPRESSED_STATE_CONTEXT] = _compressed_context(new_state.context)
+    if old_state.last_changed != new_state.last_changed:
+        additions[COMPRESSED_STATE_LAST_CHANGED] = new_state.last_changed.timestamp()
+    elif old_state.last_updated != new_state.last_updated:
+        additions[COMPRESSED_STATE_LAST_UPDATED] = new_state.last_updated.timestamp()
+
+    diff: dict[str, Any] = {}
+    old_attributes = old_state.attributes
+    new_attributes = new_state.attributes
+    if old_attributes is not new_attributes:
+        changed_attributes = {
+            key: value
+            for key, value in new_attributes.items()
+            if key not in old_attributes or old_attributes[key] != value
+        }
+        if changed_attributes:
+            additions[COMPRESSED_STATE_ATTRIBUTES] = changed_attributes
+        if removed_attributes := [
+            key for key in old_attributes if key not in new_attributes
+        ]:
+            diff[ENTITY_DIFF_REMOVALS] = {
+                COMPRESSED_STATE_ATTRIBUTES: removed_attributes
+            }
+    if additions:
+        diff[ENTITY_DIFF_ADDITIONS] = additions
+
+    return {ENTITY_EVENT_CHANGE: {entity_id: diff}}
+
+
 def message_to_json(message: dict[str, Any]) -> str:
     """Serialize a websocket message to json."""
     try:
@@ -1,6 +1,7 @@
 """Entity to track connections to websocket API."""
 from __future__ import annotations
 
+from datetime import timedelta
 from typing import Any
 
 from homeassistant.components.sensor import SensorEntity
@@ -9,11 +10,16 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import ConfigType
 
 from .const import (
+    DATA_BYTES_SENT,
+    DATA_CONNECTION_BYTES_SENT,
     DATA_CONNECTIONS,
     SIGNAL_WEBSOCKET_CONNECTED,
     SIGNAL_WEBSOCKET_DISCONNECTED,
 )
 
+# Interval to update the bytes sent at
+SCAN_INTERVAL = timedelta(seconds=30)
+
 
 async def async_setup_platform(
     hass: HomeAssistant,
@@ -47,6 +53,11 @@ class APICount(SensorEntity):
             )
         )
 
+    @property
+    def should_poll(self) -> bool:
+        """Poll to update the bytes sent, which change with every message."""
+        return True
+
     @property
     def name(self) -> str:
         """Return name of entity."""
@@ -57,6 +68,29 @@ class APICount(SensorEntity):
         """Return current API count."""
         return self.count
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the bytes sent to clients, before and after compression.
+
+        The bytes sent to each connected client are listed by user.
+        """
+        if (bytes_sent := self.hass.data.get(DATA_BYTES_SENT)) is None:
+            return None
+        return {
+            "bytes_sent": bytes_sent.raw,
+            "bytes_sent_on_wire": bytes_sent.wire,
+            "connections": [
+                {
+                    "user": connection.user.name,
+                    "bytes_sent": connection_bytes_sent.raw,
+                    "bytes_sent_on_wire": connection_bytes_sent.wire,
+                }
+                for connection, connection_bytes_sent in self.hass.data.get(
+                    DATA_CONNECTION_BYTES_SENT, {}
+                ).items()
+            ],
+        }
+
     @property
     def unit_of_measurement(self) -> str:
         """Return the unit of measurement."""
@@ -604,6 +604,8 @@ class ConfigEntriesFlowManager(data_entry_flow.FlowManager):
         super().__init__(hass)
         self.config_entries = config_entries
         self._hass_config = hass_config
+        # Discoveries come in bursts and the event carries no data
+        hass.bus.async_coalesce_events(EVENT_FLOW_DISCOVERED)
 
     async def async_finish_flow(
         self, flow: data_entry_flow.FlowHandler, result: data_entry_flow.FlowResult
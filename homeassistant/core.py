@@ -15,6 +15,7 @@ import logging
 import os
 import pathlib
 import re
+import sys
 import threading
 from time import monotonic
 from types import MappingProxyType
@@ -27,6 +28,7 @@ import yarl
 from homeassistant import block_async_io, loader, util
 from homeassistant.const import (
     ATTR_DOMAIN,
+    ATTR_ENTITY_ID,
     ATTR_FRIENDLY_NAME,
     ATTR_NOW,
     ATTR_SECONDS,
@@ -59,6 +61,7 @@ from homeassistant.exceptions import (
     ServiceNotFound,
     Unauthorized,
 )
+from homeassistant.helpers.json import json_dumps
 from homeassistant.util import location
 from homeassistant.util.async_ import (
     fire_coroutine_threadsafe,
@@ -655,12 +658,38 @@ class Event:
         )
 
 
+def event_data_entity_id(event_data: dict[str, Any]) -> Any:
+    """Return the entity_id of the event data to route keyed listeners."""
+    return event_data.get(ATTR_ENTITY_ID)
+
+
+@attr.s(slots=True)
+class EventStats:
+    """Counters of the events of a type fired on the bus."""
+
+    fired: int = attr.ib(default=0)
+    dispatched: int = attr.ib(default=0)
+    skipped: int = attr.ib(default=0)
+    coalesced: int = attr.ib(default=0)
+
+    def as_dict(self) -> dict[str, int]:
+        """Return a dictionary representation of the counters."""
+        return attr.asdict(self)
+
+
 class EventBus:
     """Allow the firing of and listening for events."""
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners: dict[str, list[tuple[HassJob, Callable | None]]] = {}
+        # Maps event type to the key getters and the jobs listening per key
+        self._keyed_listeners: dict[
+            str, dict[Callable[[dict[str, Any]], Any], dict[Any, list[HassJob]]]
+        ] = {}
+        # Maps coalesced event types to the arguments of the pending event
+        self._coalesced_events: dict[str, tuple | None] = {}
+        self._event_stats: dict[str, EventStats] = {}
         self._hass = hass
 
     @callback
@@ -669,7 +698,40 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        return {key: len(self._listeners[key]) for key in self._listeners}
+        listeners = {key: len(self._listeners[key]) for key in self._listeners}
+        for event_type, keyed_listeners in self._keyed_listeners.items():
+            jobs = {
+                id(job)
+                for jobs_by_key in keyed_listeners.values()
+                for key_jobs in jobs_by_key.values()
+                for job in key_jobs
+            }
+            listeners[event_type] = listeners.get(event_type, 0) + len(jobs)
+        return listeners
+
+    @callback
+    def async_keyed_listeners(
+        self,
+        event_type: str,
+        key_getter: Callable[[dict[str, Any]], Any] = event_data_entity_id,
+    ) -> dict[Any, int]:
+        """Return dictionary with keys and the number of keyed listeners.
+
+        This method must be run in the event loop.
+        """
+        jobs_by_key = self._keyed_listeners.get(event_type, {}).get(key_getter, {})
+        return {key: len(jobs) for key, jobs in jobs_by_key.items()}
+
+    @callback
+    def async_event_stats(self) -> dict[str, dict[str, int]]:
+        """Return dictionary with event types and their counters.
+
+        This method must be run in the event loop.
+        """
+        return {
+            event_type: stats.as_dict()
+            for event_type, stats in self._event_stats.items()
+        }
 
     @property
     def listeners(self) -> dict[str, int]:
@@ -706,21 +768,68 @@ class EventBus:
                 event_type, "event_type", MAX_LENGTH_EVENT_EVENT_TYPE
             )
 
+        stats = self._event_stats.get(event_type)
+        if stats is None:
+            stats = self._event_stats[event_type] = EventStats()
+        stats.fired += 1
+
+        if event_type in self._coalesced_events:
+            pending = self._coalesced_events[event_type]
+            self._coalesced_events[event_type] = (
+                event_data,
+                origin,
+                context,
+                time_fired or dt_util.utcnow(),
+            )
+            if pending is not None:
+                stats.coalesced += 1
+            else:
+                # A task so async_block_till_done waits for the pending event
+                self._hass.async_create_task(self._async_fire_coalesced(event_type))
+            return
+
+        self._async_dispatch(event_type, stats, event_data, origin, context, time_fired)
+
+    async def _async_fire_coalesced(self, event_type: str) -> None:
+        """Fire the pending event of a coalesced event type."""
+        fire_args = self._coalesced_events.get(event_type)
+        if fire_args is None:
+            return
+        self._coalesced_events[event_type] = None
+        self._async_dispatch(event_type, self._event_stats[event_type], *fire_args)
+
+    @callback
+    def _async_dispatch(
+        self,
+        event_type: str,
+        stats: EventStats,
+        event_data: dict[str, Any] | None,
+        origin: EventOrigin,
+        context: Context | None,
+        time_fired: datetime.datetime | None,
+    ) -> None:
+        """Create an event and hand it to its listeners.
+
+        The event and its context are not created when nobody listens.
+        """
         listeners = self._listeners.get(event_type, [])
+        keyed_listeners = self._keyed_listeners.get(event_type)
 
         # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
         match_all_listeners = self._listeners.get(MATCH_ALL)
         if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
             listeners = match_all_listeners + listeners
 
+        if not listeners and keyed_listeners is None:
+            stats.skipped += 1
+            return
+
+        stats.dispatched += 1
         event = Event(event_type, event_data, origin, time_fired, context)
 
         if event_type != EVENT_TIME_CHANGED:
             _LOGGER.debug("Bus:Handling %s", event)
 
-        if not listeners:
-            return
-
         for job, event_filter in listeners:
             if event_filter is not None:
                 try:
@@ -731,6 +840,68 @@ class EventBus:
                     continue
             self._hass.async_add_hass_job(job, event)
 
+        if keyed_listeners is None:
+            return
+
+        for key_getter, jobs_by_key in keyed_listeners.items():
+            try:
+                key = key_getter(event.data)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error getting the key of %s", event)
+                continue
+            if key is not None and (key in jobs_by_key or MATCH_ALL in jobs_by_key):
+                self._hass.loop.call_soon(
+                    self._async_dispatch_keyed, event, key_getter, key
+                )
+
+    @callback
+    def async_coalesce_events(self, event_type: str) -> CALLBACK_TYPE:
+        """Fire events of a specific type at most once per loop iteration.
+
+        An event fired while an earlier event of the same type waits to
+        be dispatched replaces it, so listeners only get the latest one.
+        Meant for high-frequency events that carry no data or only the
+        latest value.
+
+        Returns function to stop coalescing, which fires the pending event.
+
+        This method must be run in the event loop.
+        """
+        self._coalesced_events.setdefault(event_type, None)
+
+        @callback
+        def stop_coalescing() -> None:
+            """Stop coalescing the events."""
+            fire_args = self._coalesced_events.pop(event_type, None)
+            if fire_args is not None:
+                self._async_dispatch(
+                    event_type, self._event_stats[event_type], *fire_args
+                )
+
+        return stop_coalescing
+
+    @callback
+    def _async_dispatch_keyed(
+        self, event: Event, key_getter: Callable[[dict[str, Any]], Any], key: Any
+    ) -> None:
+        """Run the keyed listeners of an event.
+
+        The listeners are looked up when the event is dispatched so
+        listeners added by an earlier event of the same key run as well.
+        """
+        jobs_by_key = self._keyed_listeners.get(event.event_type, {}).get(key_getter)
+        if jobs_by_key is None:
+            return
+
+        for key_jobs in (jobs_by_key.get(key), jobs_by_key.get(MATCH_ALL)):
+            if key_jobs is None:
+                continue
+            for job in key_jobs[:]:
+                try:
+                    self._hass.async_run_hass_job(job, event)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Error while processing %s for %s", event, key)
+
     def listen(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
 
@@ -783,6 +954,70 @@ class EventBus:
 
         return remove_listener
 
+    @callback
+    def async_listen_keyed(
+        self,
+        event_type: str,
+        keys: Iterable[Any],
+        listener: Callable,
+        key_getter: Callable[[dict[str, Any]], Any] = event_data_entity_id,
+    ) -> CALLBACK_TYPE:
+        """Listen for events of a specific type with one of the given keys.
+
+        Instead of running a filter for every event, the listener is
+        looked up by the key that key_getter returns for the event data,
+        the entity_id by default. Events for which key_getter returns None
+        are not dispatched. Listening to the ``MATCH_ALL`` key gets the
+        events of every other key.
+
+        key_getter must be the same function for all listeners that
+        share an index.
+
+        This method must be run in the event loop.
+        """
+        keys = list(keys)
+        job = HassJob(listener)
+        jobs_by_key = self._keyed_listeners.setdefault(event_type, {}).setdefault(
+            key_getter, {}
+        )
+        for key in keys:
+            jobs_by_key.setdefault(key, []).append(job)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the keyed listener."""
+            self._async_remove_keyed_listener(event_type, key_getter, keys, job)
+
+        return remove_listener
+
+    @callback
+    def _async_remove_keyed_listener(
+        self,
+        event_type: str,
+        key_getter: Callable[[dict[str, Any]], Any],
+        keys: list[Any],
+        job: HassJob,
+    ) -> None:
+        """Remove a keyed listener of a specific event_type.
+
+        This method must be run in the event loop.
+        """
+        try:
+            keyed_listeners = self._keyed_listeners[event_type]
+            jobs_by_key = keyed_listeners[key_getter]
+            for key in keys:
+                jobs_by_key[key].remove(job)
+                if not jobs_by_key[key]:
+                    del jobs_by_key[key]
+        except (KeyError, ValueError):
+            _LOGGER.exception("Unable to remove unknown keyed listener %s", job)
+            return
+
+        if not jobs_by_key:
+            del keyed_listeners[key_getter]
+            if not keyed_listeners:
+                del self._keyed_listeners[event_type]
+
     def listen_once(
         self, event_type: str, listener: Callable[[Event], None]
     ) -> CALLBACK_TYPE:
@@ -858,6 +1093,20 @@ class EventBus:
             )
 
 
+_EMPTY_ATTRIBUTES: MappingProxyType[str, Any] = MappingProxyType({})
+
+
+def _read_only_attributes(
+    attributes: Mapping[str, Any] | None
+) -> MappingProxyType[str, Any]:
+    """Return a read only view of state attributes."""
+    if isinstance(attributes, MappingProxyType):
+        return attributes
+    if not attributes:
+        return _EMPTY_ATTRIBUTES
+    return MappingProxyType(attributes)
+
+
 class State:
     """Object to represent a state within the state machine.
 
@@ -881,6 +1130,8 @@ class State:
         "domain",
         "object_id",
         "_as_dict",
+        "_as_json",
+        "_attributes_json",
     ]
 
     def __init__(
@@ -910,12 +1161,57 @@ class State:
 
         self.entity_id = entity_id.lower()
         self.state = state
-        self.attributes = MappingProxyType(attributes or {})
+        self.attributes = _read_only_attributes(attributes)
         self.last_updated = last_updated or dt_util.utcnow()
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
-        self.domain, self.object_id = split_entity_id(self.entity_id)
+        domain, self.object_id = split_entity_id(self.entity_id)
+        # All states of a domain share the string
+        self.domain = sys.intern(domain)
         self._as_dict: dict[str, Collection[Any]] | None = None
+        self._as_json: str | None = None
+        self._attributes_json: str | None = None
+
+    @classmethod
+    def from_trusted(
+        cls,
+        entity_id: str,
+        state: str,
+        attributes: Mapping[str, Any] | None,
+        last_changed: datetime.datetime,
+        last_updated: datetime.datetime,
+        context: Context,
+        previous: State | None = None,
+    ) -> State:
+        """Initialize a state from values that are known to be valid.
+
+        Skips the validation and normalization of the constructor. The
+        entity id must be valid and lower case and the state a valid
+        string. Attributes that are already read only are shared, as are
+        the entity id strings of the previous state of the entity and the
+        JSON of its attributes when they did not change.
+        """
+        self = cls.__new__(cls)
+        self.state = state
+        self.attributes = _read_only_attributes(attributes)
+        self.last_updated = last_updated
+        self.last_changed = last_changed
+        self.context = context
+        if previous is not None and previous.entity_id == entity_id:
+            self.entity_id = previous.entity_id
+            self.domain = previous.domain
+            self.object_id = previous.object_id
+        else:
+            self.entity_id = entity_id
+            domain, self.object_id = split_entity_id(entity_id)
+            self.domain = sys.intern(domain)
+        self._as_dict = None
+        self._as_json = None
+        if previous is not None and self.attributes is previous.attributes:
+            self._attributes_json = previous._attributes_json
+        else:
+            self._attributes_json = None
+        return self
 
     @property
     def name(self) -> str:
@@ -948,6 +1244,28 @@ class State:
             }
         return self._as_dict
 
+    def as_json(self) -> str:
+        """Return the JSON representation of the State.
+
+        Async friendly.
+
+        The state is serialized once and the JSON is shared by everything
+        that sends or stores the state. Raises TypeError or ValueError when
+        the attributes can not be serialized.
+        """
+        if self._as_json is None:
+            self._as_json = json_dumps(self.as_dict())
+        return self._as_json
+
+    def attributes_json(self) -> str:
+        """Return the JSON representation of the attributes of the State.
+
+        Async friendly.
+        """
+        if self._attributes_json is None:
+            self._attributes_json = json_dumps(self.as_dict()["attributes"])
+        return self._attributes_json
+
     @classmethod
     def from_dict(cls, json_dict: dict) -> Any:
         """Initialize a state from a dict.
@@ -1008,6 +1326,8 @@ class StateMachine:
     def __init__(self, bus: EventBus, loop: asyncio.events.AbstractEventLoop) -> None:
         """Initialize state machine."""
         self._states: dict[str, State] = {}
+        # Maps domain to the states of its entities
+        self._domain_index: dict[str, dict[str, State]] = {}
         self._reservations: set[str] = set()
         self._bus = bus
         self._loop = loop
@@ -1031,13 +1351,12 @@ class StateMachine:
             return list(self._states)
 
         if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
+            return list(self._domain_index.get(domain_filter.lower(), ()))
 
-        return [
-            state.entity_id
-            for state in self._states.values()
-            if state.domain in domain_filter
-        ]
+        entity_ids: list[str] = []
+        for domain in domain_filter:
+            entity_ids.extend(self._domain_index.get(domain, ()))
+        return entity_ids
 
     @callback
     def async_entity_ids_count(
@@ -1051,11 +1370,9 @@ class StateMachine:
             return len(self._states)
 
         if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
+            return len(self._domain_index.get(domain_filter.lower(), ()))
 
-        return len(
-            [None for state in self._states.values() if state.domain in domain_filter]
-        )
+        return sum(len(self._domain_index.get(domain, ())) for domain in domain_filter)
 
     def all(self, domain_filter: str | Iterable | None = None) -> list[State]:
         """Create a list of all states."""
@@ -1073,11 +1390,14 @@ class StateMachine:
             return list(self._states.values())
 
         if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
+            domain_index = self._domain_index.get(domain_filter.lower())
+            return [] if domain_index is None else list(domain_index.values())
 
-        return [
-            state for state in self._states.values() if state.domain in domain_filter
-        ]
+        states: list[State] = []
+        for domain in domain_filter:
+            if (domain_index := self._domain_index.get(domain)) is not None:
+                states.extend(domain_index.values())
+        return states
 
     def get(self, entity_id: str) -> State | None:
         """Retrieve state of entity_id or None if not found.
@@ -1120,6 +1440,11 @@ class StateMachine:
         if old_state is None:
             return False
 
+        domain_index = self._domain_index[old_state.domain]
+        del domain_index[entity_id]
+        if not domain_index:
+            del self._domain_index[old_state.domain]
+
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": None},
@@ -1196,7 +1521,7 @@ class StateMachine:
         """
         entity_id = entity_id.lower()
         new_state = str(new_state)
-        attributes = attributes or {}
+        attributes = attributes or _EMPTY_ATTRIBUTES
         old_state = self._states.get(entity_id)
         if old_state is None:
             same_state = False
@@ -1204,7 +1529,9 @@ class StateMachine:
             last_changed = None
         else:
             same_state = old_state.state == new_state and not force_update
-            same_attr = old_state.attributes == MappingProxyType(attributes)
+            same_attr = (
+                attributes is old_state.attributes or old_state.attributes == attributes
+            )
             last_changed = old_state.last_changed if same_state else None
 
         if same_state and same_attr:
@@ -1215,16 +1542,32 @@ class StateMachine:
 
         now = dt_util.utcnow()
 
-        state = State(
-            entity_id,
-            new_state,
-            attributes,
-            last_changed,
-            now,
-            context,
-            old_state is None,
-        )
+        if old_state is not None and valid_state(new_state):
+            # The entity id was validated when the entity was added,
+            # unchanged attributes keep sharing the mapping of the old state
+            state = State.from_trusted(
+                entity_id,
+                new_state,
+                old_state.attributes if same_attr else attributes,
+                last_changed or now,
+                now,
+                context,
+                old_state,
+            )
+        else:
+            state = State(
+                entity_id,
+                new_state,
+                attributes,
+                last_changed,
+                now,
+                context,
+                old_state is None,
+            )
         self._states[entity_id] = state
+        if (domain_index := self._domain_index.get(state.domain)) is None:
+            domain_index = self._domain_index[state.domain] = {}
+        domain_index[entity_id] = state
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": state},
@@ -10,6 +10,7 @@ import functools as ft
 import logging
 import re
 import sys
+from time import perf_counter
 from typing import Any, Callable, cast
 
 from homeassistant.components import zone as zone_cmp
@@ -24,6 +25,7 @@ from homeassistant.const import (
     ATTR_LONGITUDE,
     CONF_ABOVE,
     CONF_AFTER,
+    CONF_ALIAS,
     CONF_ATTRIBUTE,
     CONF_BEFORE,
     CONF_BELOW,
@@ -51,6 +53,7 @@ from homeassistant.exceptions import (
     HomeAssistantError,
     TemplateError,
 )
+from homeassistant.helpers import profiling
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.sun import get_astral_event_date
 from homeassistant.helpers.template import Template
@@ -179,10 +182,43 @@ async def async_from_config(
         check_factory = check_factory.func
 
     if asyncio.iscoroutinefunction(check_factory):
-        return cast(
-            ConditionCheckerType, await factory(hass, config, config_validation)
-        )
-    return cast(ConditionCheckerType, factory(config, config_validation))
+        checker = await factory(hass, config, config_validation)
+    else:
+        checker = factory(config, config_validation)
+
+    return _profile_condition(checker, _profile_key(config))
+
+
+def _profile_key(config: ConfigType) -> str:
+    """Return the key of a condition in the profiling timings.
+
+    Conditions without an alias are told apart by their template or entities.
+    """
+    if CONF_ALIAS in config:
+        return cast(str, config[CONF_ALIAS])
+    condition = config[CONF_CONDITION]
+    if (value_template := config.get(CONF_VALUE_TEMPLATE)) is not None:
+        return f"{condition}: {getattr(value_template, 'template', value_template)}"
+    if entity_ids := config.get(CONF_ENTITY_ID):
+        return f"{condition}: {', '.join(cv.ensure_list(entity_ids))}"
+    return cast(str, condition)
+
+
+def _profile_condition(checker: ConditionCheckerType, key: str) -> ConditionCheckerType:
+    """Wrap a condition checker to record how long it takes."""
+
+    @ft.wraps(checker)
+    def wrapper(hass: HomeAssistant, variables: TemplateVarsType = None) -> bool:
+        """Record the time of a condition check."""
+        start = perf_counter()
+        try:
+            return checker(hass, variables)
+        finally:
+            profiling.async_get(hass).record(
+                profiling.CATEGORY_CONDITION, key, perf_counter() - start
+            )
+
+    return wrapper
 
 
 async def async_and_from_config(
@@ -4,7 +4,7 @@ from __future__ import annotations
 import asyncio
 from collections.abc import Coroutine, Iterable
 from contextvars import ContextVar
-from datetime import datetime, timedelta
+from datetime import timedelta
 import logging
 from logging import Logger
 from types import ModuleType
@@ -40,11 +40,12 @@ from . import (
     config_validation as cv,
     device_registry as dev_reg,
     entity_registry as ent_reg,
+    polling,
     service,
 )
 from .device_registry import DeviceRegistry
 from .entity_registry import DISABLED_INTEGRATION, EntityRegistry
-from .event import async_call_later, async_track_time_interval
+from .event import async_call_later
 from .typing import ConfigType, DiscoveryInfoType
 
 if TYPE_CHECKING:
@@ -99,11 +100,10 @@ class EntityPlatform:
         self._tasks: list[asyncio.Future] = []
         # Stop tracking tasks after setup is completed
         self._setup_complete = False
-        # Method to cancel the state change listener
+        # Method to stop polling the entities
         self._async_unsub_polling: CALLBACK_TYPE | None = None
         # Method to cancel the retry of setup
         self._async_cancel_retry_setup: CALLBACK_TYPE | None = None
-        self._process_updates: asyncio.Lock | None = None
 
         self.parallel_updates: asyncio.Semaphore | None = None
 
@@ -396,18 +396,14 @@ class EntityPlatform:
             )
             raise
 
-        if (
-            (self.config_entry and self.config_entry.pref_disable_polling)
-            or self._async_unsub_polling is not None
-            or not any(entity.should_poll for entity in self.entities.values())
+        if (self.config_entry and self.config_entry.pref_disable_polling) or not any(
+            entity.should_poll for entity in self.entities.values()
         ):
             return
 
-        self._async_unsub_polling = async_track_time_interval(
-            self.hass,
-            self._update_entity_states,
-            self.scan_interval,
-        )
+        scheduler = polling.async_get(self.hass)
+        # Also picks up entities added to a platform that is already polled
+        self._async_unsub_polling = scheduler.async_track_platform(self)
 
     async def _async_add_entity(  # noqa: C901
         self,
@@ -679,35 +675,6 @@ class EntityPlatform:
             self.platform_name, name, handle_service, schema
         )
 
-    async def _update_entity_states(self, now: datetime) -> None:
-        """Update the states of all the polling entities.
-
-        To protect from flooding the executor, we will update async entities
-        in parallel and other entities sequential.
-
-        This method must be run in the event loop.
-        """
-        if self._process_updates is None:
-            self._process_updates = asyncio.Lock()
-        if self._process_updates.locked():
-            self.logger.warning(
-                "Updating %s %s took longer than the scheduled update interval %s",
-                self.platform_name,
-                self.domain,
-                self.scan_interval,
-            )
-            return
-
-        async with self._process_updates:
-            tasks = []
-            for entity in self.entities.values():
-                if not entity.should_poll:
-                    continue
-                tasks.append(entity.async_update_ha_state(True))
-
-            if tasks:
-                await asyncio.gather(*tasks)
-
 
 current_platform: ContextVar[EntityPlatform | None] = ContextVar(
     "current_platform", default=None
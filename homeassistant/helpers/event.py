@@ -42,18 +42,6 @@ from homeassistant.loader import bind_hass
 from homeassistant.util import dt as dt_util
 from homeassistant.util.async_ import run_callback_threadsafe
 
-TRACK_STATE_CHANGE_CALLBACKS = "track_state_change_callbacks"
-TRACK_STATE_CHANGE_LISTENER = "track_state_change_listener"
-
-TRACK_STATE_ADDED_DOMAIN_CALLBACKS = "track_state_added_domain_callbacks"
-TRACK_STATE_ADDED_DOMAIN_LISTENER = "track_state_added_domain_listener"
-
-TRACK_STATE_REMOVED_DOMAIN_CALLBACKS = "track_state_removed_domain_callbacks"
-TRACK_STATE_REMOVED_DOMAIN_LISTENER = "track_state_removed_domain_listener"
-
-TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS = "track_entity_registry_updated_callbacks"
-TRACK_ENTITY_REGISTRY_UPDATED_LISTENER = "track_entity_registry_updated_listener"
-
 _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
 _ENTITIES_LISTENER = "entities"
@@ -82,11 +70,29 @@ class TrackTemplate:
     The template is template to calculate.
     The variables are variables to pass to the template.
     The rate_limit is a rate limit on how often the template is re-rendered.
+    The min_interval is the minimum time between re-renders, also for
+    changes of entities referenced by the template.
     """
 
     template: Template
     variables: TemplateVarsType
     rate_limit: timedelta | None = None
+    min_interval: timedelta | None = None
+
+
+@dataclass
+class TrackTemplateRenderStats:
+    """Class for the render statistics of a tracked template.
+
+    renders is the number of times the template rendered.
+    coalesced is the number of changes that did not cause a render of
+    their own as the template already rendered in the same loop iteration.
+    render_time is the total time spent rendering, in seconds.
+    """
+
+    renders: int = 0
+    coalesced: int = 0
+    render_time: float = 0.0
 
 
 @dataclass
@@ -242,62 +248,15 @@ def async_track_state_change_event(
 
     In order to avoid having to iterate a long list
     of EVENT_STATE_CHANGED and fire and create a job
-    for each one, we keep a dict of entity ids that
-    care about the state change events so we can
+    for each one, the event bus keeps a dict of entity ids
+    that care about the state change events so it can
     do a fast dict lookup to route events.
     """
     entity_ids = _async_string_to_lower_list(entity_ids)
     if not entity_ids:
         return _remove_empty_listener
 
-    entity_callbacks = hass.data.setdefault(TRACK_STATE_CHANGE_CALLBACKS, {})
-
-    if TRACK_STATE_CHANGE_LISTENER not in hass.data:
-
-        @callback
-        def _async_state_change_filter(event: Event) -> bool:
-            """Filter state changes by entity_id."""
-            return event.data.get("entity_id") in entity_callbacks
-
-        @callback
-        def _async_state_change_dispatcher(event: Event) -> None:
-            """Dispatch state changes by entity_id."""
-            entity_id = event.data.get("entity_id")
-
-            if entity_id not in entity_callbacks:
-                return
-
-            for job in entity_callbacks[entity_id][:]:
-                try:
-                    hass.async_run_hass_job(job, event)
-                except Exception:  # pylint: disable=broad-except
-                    _LOGGER.exception(
-                        "Error while processing state change for %s", entity_id
-                    )
-
-        hass.data[TRACK_STATE_CHANGE_LISTENER] = hass.bus.async_listen(
-            EVENT_STATE_CHANGED,
-            _async_state_change_dispatcher,
-            event_filter=_async_state_change_filter,
-        )
-
-    job = HassJob(action)
-
-    for entity_id in entity_ids:
-        entity_callbacks.setdefault(entity_id, []).append(job)
-
-    @callback
-    def remove_listener() -> None:
-        """Remove state change listener."""
-        _async_remove_indexed_listeners(
-            hass,
-            TRACK_STATE_CHANGE_CALLBACKS,
-            TRACK_STATE_CHANGE_LISTENER,
-            entity_ids,
-            job,
-        )
-
-    return remove_listener
+    return hass.bus.async_listen_keyed(EVENT_STATE_CHANGED, entity_ids, action)
 
 
 @callback
@@ -305,25 +264,9 @@ def _remove_empty_listener() -> None:
     """Remove a listener that does nothing."""
 
 
-@callback
-def _async_remove_indexed_listeners(
-    hass: HomeAssistant,
-    data_key: str,
-    listener_key: str,
-    storage_keys: Iterable[str],
-    job: HassJob,
-) -> None:
-    """Remove a listener."""
-    callbacks = hass.data[data_key]
-
-    for storage_key in storage_keys:
-        callbacks[storage_key].remove(job)
-        if len(callbacks[storage_key]) == 0:
-            del callbacks[storage_key]
-
-    if not callbacks:
-        hass.data[listener_key]()
-        del hass.data[listener_key]
+def _entity_registry_updated_entity_id(event_data: dict[str, Any]) -> Any:
+    """Return the entity_id an entity registry update was tracked by."""
+    return event_data.get("old_entity_id", event_data.get("entity_id"))
 
 
 @bind_hass
@@ -340,76 +283,26 @@ def async_track_entity_registry_updated_event(
     if not entity_ids:
         return _remove_empty_listener
 
-    entity_callbacks = hass.data.setdefault(TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS, {})
-
-    if TRACK_ENTITY_REGISTRY_UPDATED_LISTENER not in hass.data:
-
-        @callback
-        def _async_entity_registry_updated_filter(event: Event) -> bool:
-            """Filter entity registry updates by entity_id."""
-            entity_id = event.data.get("old_entity_id", event.data["entity_id"])
-            return entity_id in entity_callbacks
-
-        @callback
-        def _async_entity_registry_updated_dispatcher(event: Event) -> None:
-            """Dispatch entity registry updates by entity_id."""
-            entity_id = event.data.get("old_entity_id", event.data["entity_id"])
-
-            if entity_id not in entity_callbacks:
-                return
-
-            for job in entity_callbacks[entity_id][:]:
-                try:
-                    hass.async_run_hass_job(job, event)
-                except Exception:  # pylint: disable=broad-except
-                    _LOGGER.exception(
-                        "Error while processing entity registry update for %s",
-                        entity_id,
-                    )
-
-        hass.data[TRACK_ENTITY_REGISTRY_UPDATED_LISTENER] = hass.bus.async_listen(
-            EVENT_ENTITY_REGISTRY_UPDATED,
-            _async_entity_registry_updated_dispatcher,
-            event_filter=_async_entity_registry_updated_filter,
-        )
-
-    job = HassJob(action)
-
-    for entity_id in entity_ids:
-        entity_callbacks.setdefault(entity_id, []).append(job)
-
-    @callback
-    def remove_listener() -> None:
-        """Remove state change listener."""
-        _async_remove_indexed_listeners(
-            hass,
-            TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS,
-            TRACK_ENTITY_REGISTRY_UPDATED_LISTENER,
-            entity_ids,
-            job,
-        )
-
-    return remove_listener
-
+    return hass.bus.async_listen_keyed(
+        EVENT_ENTITY_REGISTRY_UPDATED,
+        entity_ids,
+        action,
+        _entity_registry_updated_entity_id,
+    )
 
-@callback
-def _async_dispatch_domain_event(
-    hass: HomeAssistant, event: Event, callbacks: dict[str, list]
-) -> None:
-    domain = split_entity_id(event.data["entity_id"])[0]
 
-    if domain not in callbacks and MATCH_ALL not in callbacks:
-        return
+def _state_added_domain(event_data: dict[str, Any]) -> Any:
+    """Return the domain of the entity if the state change added it."""
+    if event_data.get("old_state") is not None:
+        return None
+    return split_entity_id(event_data["entity_id"])[0]
 
-    listeners = callbacks.get(domain, []) + callbacks.get(MATCH_ALL, [])
 
-    for job in listeners:
-        try:
-            hass.async_run_hass_job(job, event)
-        except Exception:  # pylint: disable=broad-except
-            _LOGGER.exception(
-                "Error while processing event %s for domain %s", event, domain
-            )
+def _state_removed_domain(event_data: dict[str, Any]) -> Any:
+    """Return the domain of the entity if the state change removed it."""
+    if event_data.get("new_state") is not None:
+        return None
+    return split_entity_id(event_data["entity_id"])[0]
 
 
 @bind_hass
@@ -423,46 +316,9 @@ def async_track_state_added_domain(
     if not domains:
         return _remove_empty_listener
 
-    domain_callbacks = hass.data.setdefault(TRACK_STATE_ADDED_DOMAIN_CALLBACKS, {})
-
-    if TRACK_STATE_ADDED_DOMAIN_LISTENER not in hass.data:
-
-        @callback
-        def _async_state_change_filter(event: Event) -> bool:
-            """Filter state changes by entity_id."""
-            return event.data.get("old_state") is None
-
-        @callback
-        def _async_state_change_dispatcher(event: Event) -> None:
-            """Dispatch state changes by entity_id."""
-            if event.data.get("old_state") is not None:
-                return
-
-            _async_dispatch_domain_event(hass, event, domain_callbacks)
-
-        hass.data[TRACK_STATE_ADDED_DOMAIN_LISTENER] = hass.bus.async_listen(
-            EVENT_STATE_CHANGED,
-            _async_state_change_dispatcher,
-            event_filter=_async_state_change_filter,
-        )
-
-    job = HassJob(action)
-
-    for domain in domains:
-        domain_callbacks.setdefault(domain, []).append(job)
-
-    @callback
-    def remove_listener() -> None:
-        """Remove state change listener."""
-        _async_remove_indexed_listeners(
-            hass,
-            TRACK_STATE_ADDED_DOMAIN_CALLBACKS,
-            TRACK_STATE_ADDED_DOMAIN_LISTENER,
-            domains,
-            job,
-        )
-
-    return remove_listener
+    return hass.bus.async_listen_keyed(
+        EVENT_STATE_CHANGED, domains, action, _state_added_domain
+    )
 
 
 @bind_hass
@@ -476,46 +332,9 @@ def async_track_state_removed_domain(
     if not domains:
         return _remove_empty_listener
 
-    domain_callbacks = hass.data.setdefault(TRACK_STATE_REMOVED_DOMAIN_CALLBACKS, {})
-
-    if TRACK_STATE_REMOVED_DOMAIN_LISTENER not in hass.data:
-
-        @callback
-        def _async_state_change_filter(event: Event) -> bool:
-            """Filter state changes by entity_id."""
-            return event.data.get("new_state") is None
-
-        @callback
-        def _async_state_change_dispatcher(event: Event) -> None:
-            """Dispatch state changes by entity_id."""
-            if event.data.get("new_state") is not None:
-                return
-
-            _async_dispatch_domain_event(hass, event, domain_callbacks)
-
-        hass.data[TRACK_STATE_REMOVED_DOMAIN_LISTENER] = hass.bus.async_listen(
-            EVENT_STATE_CHANGED,
-            _async_state_change_dispatcher,
-            event_filter=_async_state_change_filter,
-        )
-
-    job = HassJob(action)
-
-    for domain in domains:
-        domain_callbacks.setdefault(domain, []).append(job)
-
-    @callback
-    def remove_listener() -> None:
-        """Remove state change listener."""
-        _async_remove_indexed_listeners(
-            hass,
-            TRACK_STATE_REMOVED_DOMAIN_CALLBACKS,
-            TRACK_STATE_REMOVED_DOMAIN_LISTENER,
-            domains,
-            job,
-        )
-
-    return remove_listener
+    return hass.bus.async_listen_keyed(
+        EVENT_STATE_CHANGED, domains, action, _state_removed_domain
+    )
 
 
 @callback
@@ -791,6 +610,18 @@ class _TrackTemplateResultInfo:
         self._track_state_changes: _TrackStateChangeFiltered | None = None
         self._time_listeners: dict[Template, Callable] = {}
 
+        # Templates re-rendered in this loop iteration. Further changes in
+        # the same iteration are coalesced into one re-render in the next.
+        self._rendered_this_tick: set[Template] = set()
+        # Keyed by the id of the TrackTemplate as equal templates can be
+        # tracked more than once
+        self._pending: dict[int, tuple[TrackTemplate, Event]] = {}
+        self._end_tick_handle: asyncio.Handle | None = None
+        self._stats: dict[Template, TrackTemplateRenderStats] = {
+            track_template_.template: TrackTemplateRenderStats()
+            for track_template_ in track_templates
+        }
+
     def async_setup(self, raise_on_template_error: bool, strict: bool = False) -> None:
         """Activation of template tracking."""
         for track_template_ in self._track_templates:
@@ -828,6 +659,11 @@ class _TrackTemplateResultInfo:
             "time": bool(self._time_listeners),
         }
 
+    @property
+    def render_stats(self) -> dict[str, TrackTemplateRenderStats]:
+        """Render counts and time of the tracked templates."""
+        return {template.template: stats for template, stats in self._stats.items()}
+
     @callback
     def _setup_time_listener(self, template: Template, has_time: bool) -> None:
         if not has_time:
@@ -866,6 +702,10 @@ class _TrackTemplateResultInfo:
         self._rate_limit.async_remove()
         for template in list(self._time_listeners):
             self._time_listeners.pop(template)()
+        if self._end_tick_handle is not None:
+            self._end_tick_handle.cancel()
+            self._end_tick_handle = None
+        self._pending.clear()
 
     @callback
     def async_refresh(self) -> None:
@@ -916,9 +756,14 @@ class _TrackTemplateResultInfo:
             )
 
         self._rate_limit.async_triggered(template, now)
+        self._async_rendered_this_tick(template)
+        stats = self._stats[template]
+        start = time.perf_counter()
         self._info[template] = info = template.async_render_to_info(
             track_template_.variables
         )
+        stats.renders += 1
+        stats.render_time += time.perf_counter() - start
 
         try:
             result: str | TemplateError = info.result()
@@ -954,13 +799,85 @@ class _TrackTemplateResultInfo:
 
         replayed is True if the event is being replayed because the
         rate limit was hit.
+
+        A template that already re-rendered in this loop iteration is not
+        re-rendered for an event, it is re-rendered once in the next
+        iteration for all events that changed it in this one.
         """
+        to_render: Iterable[TrackTemplate] = track_templates or self._track_templates
+        if event and not replayed:
+            to_render = self._async_coalesce(event, to_render)
+        self._async_render_templates(
+            [(track_template_, event) for track_template_ in to_render],
+            event,
+            replayed,
+        )
+
+    @callback
+    def _async_coalesce(
+        self, event: Event, track_templates: Iterable[TrackTemplate]
+    ) -> list[TrackTemplate]:
+        """Return the templates to re-render now and defer the others."""
+        render_now = []
+        for track_template_ in track_templates:
+            template = track_template_.template
+            if template not in self._rendered_this_tick:
+                render_now.append(track_template_)
+                continue
+            info = self._info[template]
+            if not _event_triggers_rerender(event, info):
+                continue
+            self._stats[template].coalesced += 1
+            # Keep an event that is not rate limited over one that is
+            if (
+                id(track_template_) not in self._pending
+                or _rate_limit_for_event(event, info, track_template_) is None
+            ):
+                self._pending[id(track_template_)] = (track_template_, event)
+        return render_now
+
+    @callback
+    def _async_rendered_this_tick(self, template: Template) -> None:
+        """Mark a template as re-rendered in this loop iteration."""
+        self._rendered_this_tick.add(template)
+        if self._end_tick_handle is None:
+            self._end_tick_handle = self.hass.loop.call_soon(self._async_end_tick)
+
+    @callback
+    def _async_end_tick(self) -> None:
+        """Re-render the templates that changed again after they re-rendered."""
+        self._end_tick_handle = None
+        self._rendered_this_tick.clear()
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        last_event = next(reversed(pending.values()))[1]
+        self._async_render_templates(pending.values(), last_event, False)
+        # Changes after the coalesced re-render are rendered right away
+        self._rendered_this_tick.clear()
+        if self._end_tick_handle is not None:
+            self._end_tick_handle.cancel()
+            self._end_tick_handle = None
+
+    @callback
+    def _async_render_templates(
+        self,
+        to_render: Iterable[tuple[TrackTemplate, Event | None]],
+        event: Event | None,
+        replayed: bool | None,
+    ) -> None:
+        """Re-render templates for the events that changed them."""
         updates = []
         info_changed = False
-        now = event.time_fired if not replayed and event else dt_util.utcnow()
+        utcnow = dt_util.utcnow()
 
-        for track_template_ in track_templates or self._track_templates:
-            update = self._render_template_if_ready(track_template_, now, event)
+        for track_template_, template_event in to_render:
+            now = (
+                template_event.time_fired if not replayed and template_event else utcnow
+            )
+            update = self._render_template_if_ready(
+                track_template_, now, template_event
+            )
             if not update:
                 continue
 
@@ -1520,15 +1437,19 @@ def _rate_limit_for_event(
     """Determine the rate limit for an event."""
     entity_id = event.data.get(ATTR_ENTITY_ID)
 
+    min_interval = track_template_.min_interval
+
     # Specifically referenced entities are excluded
     # from the rate limit
     if entity_id in info.entities:
-        return None
+        return min_interval
 
+    rate_limit: timedelta | None = info.rate_limit
     if track_template_.rate_limit is not None:
-        return track_template_.rate_limit
+        rate_limit = track_template_.rate_limit
 
-    rate_limit: timedelta | None = info.rate_limit
+    if rate_limit is None or (min_interval is not None and min_interval > rate_limit):
+        return min_interval
     return rate_limit
 
 
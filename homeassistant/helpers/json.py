@@ -1,7 +1,36 @@
 """Helpers to help with encoding Safegate Pro objects in JSON."""
+from __future__ import annotations
+
 from datetime import datetime, timedelta
 import json
-from typing import Any
+import math
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+JSON_BACKEND_ORJSON = "orjson"
+JSON_BACKEND_STDLIB = "json"
+
+# Separators used by both backends so the output does not depend on the
+# backend that is installed
+_STDLIB_SEPARATORS = (",", ":")
+
+
+def json_encoder_default(obj: Any) -> Any:
+    """Convert Safegate Pro objects the JSON backends do not support.
+
+    Raises TypeError for objects that can not be converted.
+    """
+    if isinstance(obj, set):
+        return list(obj)
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if hasattr(obj, "as_dict"):
+        return obj.as_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
 class JSONEncoder(json.JSONEncoder):
@@ -12,14 +41,10 @@ class JSONEncoder(json.JSONEncoder):
 
         Hand other objects to the original method.
         """
-        if isinstance(o, datetime):
-            return o.isoformat()
-        if isinstance(o, set):
-            return list(o)
-        if hasattr(o, "as_dict"):
-            return o.as_dict()
-
-        return json.JSONEncoder.default(self, o)
+        try:
+            return json_encoder_default(o)
+        except TypeError:
+            return json.JSONEncoder.default(self, o)
 
 
 class ExtendedJSONEncoder(JSONEncoder):
@@ -36,3 +61,79 @@ class ExtendedJSONEncoder(JSONEncoder):
             return super().default(o)
         except TypeError:
             return {"__type": str(type(o)), "repr": repr(o)}
+
+
+def _replace_non_finite(obj: Any) -> Any:
+    """Replace NaN and Infinity with None like orjson does."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _replace_non_finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple, set)):
+        return [_replace_non_finite(value) for value in obj]
+    if hasattr(obj, "as_dict"):
+        return _replace_non_finite(obj.as_dict())
+    return obj
+
+
+def _stdlib_dumps(data: Any, indent: bool = False) -> str:
+    """Serialize data to JSON with the json module."""
+    kwargs: dict[str, Any] = {
+        "default": json_encoder_default,
+        "ensure_ascii": False,
+        "allow_nan": False,
+        "indent": 2 if indent else None,
+        "separators": (",", ": ") if indent else _STDLIB_SEPARATORS,
+    }
+    try:
+        return json.dumps(data, **kwargs)
+    except ValueError as err:
+        # Only walk the data when it contains NaN or Infinity
+        if "Out of range float" not in str(err):
+            raise
+        return json.dumps(_replace_non_finite(data), **kwargs)
+
+
+def _orjson_dumps(data: Any, indent: bool = False) -> str:
+    """Serialize data to JSON with orjson.
+
+    Data that orjson refuses, like integers that do not fit in 64 bits,
+    is handed to the json module instead.
+    """
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    try:
+        return orjson.dumps(data, default=json_encoder_default, option=option).decode(
+            "utf-8"
+        )
+    except TypeError:
+        return _stdlib_dumps(data, indent)
+
+
+def _orjson_loads(data: str | bytes) -> Any:
+    """Deserialize JSON with orjson.
+
+    JSON that orjson refuses, like the NaN and Infinity literals the json
+    module writes by default, is handed to the json module instead.
+    Integers that do not fit in 64 bits are decoded as floats by orjson.
+    """
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return json.loads(data)
+
+
+# Both backends output compact JSON without ASCII escapes and
+# serialize NaN and Infinity as null
+json_dumps: Callable[..., str]
+json_loads: Callable[[str | bytes], Any]
+
+if orjson is None:  # pragma: no cover
+    JSON_BACKEND = JSON_BACKEND_STDLIB
+    json_dumps = _stdlib_dumps
+    json_loads = json.loads
+else:
+    JSON_BACKEND = JSON_BACKEND_ORJSON
+    json_dumps = _orjson_dumps
+    json_loads = _orjson_loads
@@ -0,0 +1,268 @@
+"""Schedule the polling of entities spread over their scan interval."""
+from __future__ import annotations
+
+import asyncio
+from bisect import insort
+from datetime import datetime, timedelta
+import functools
+import math
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+import attr
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+import homeassistant.util.dt as dt_util
+
+from . import singleton
+from .event import async_track_point_in_utc_time
+
+if TYPE_CHECKING:
+    from .entity_platform import EntityPlatform
+
+DATA_POLLING_SCHEDULER = "polling_scheduler"
+
+# Number of entities of an integration that are polled at the same time.
+# An integration can change it with POLL_BUDGET in its platform modules.
+DEFAULT_POLL_BUDGET = 10
+
+# Largest number of scan intervals between the polls of an entity
+# whose updates take longer than the scan interval
+MAX_POLL_BACKOFF = 8
+
+
+@attr.s(slots=True)
+class PollStats:
+    """Poll counters and durations of the entities of a platform."""
+
+    polls: int = attr.ib(default=0)
+    overruns: int = attr.ib(default=0)
+    total_duration: float = attr.ib(default=0.0)
+    max_duration: float = attr.ib(default=0.0)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dictionary representation of the stats."""
+        return {
+            "polls": self.polls,
+            "overruns": self.overruns,
+            "average_duration": round(self.total_duration / self.polls, 3)
+            if self.polls
+            else 0.0,
+            "max_duration": round(self.max_duration, 3),
+        }
+
+
+class _EntityPoller:
+    """Poll an entity at a fixed phase of its scan interval."""
+
+    __slots__ = ("entity_id", "phase", "backoff", "unsub")
+
+    def __init__(self, entity_id: str, phase: float) -> None:
+        """Initialize the poller."""
+        self.entity_id = entity_id
+        self.phase = phase
+        self.backoff = 1
+        self.unsub: CALLBACK_TYPE | None = None
+
+
+class PollingScheduler:
+    """Schedule the polling of the entities of all platforms.
+
+    Each polling entity gets its own phase in its scan interval. The
+    phases of the entities sharing a scan interval are spread evenly, so
+    platforms set up together do not poll all of their entities at once.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the polling scheduler."""
+        self.hass = hass
+        # Maps scan intervals in seconds to the sorted phases in use
+        self._phases: dict[float, list[float]] = {}
+        self._pollers: dict[EntityPlatform, dict[str, _EntityPoller]] = {}
+        self._budgets: dict[str, asyncio.Semaphore] = {}
+        self._stats: dict[str, PollStats] = {}
+
+    @callback
+    def async_track_platform(self, platform: EntityPlatform) -> CALLBACK_TYPE:
+        """Start polling the entities of a platform that are not polled yet.
+
+        Call it again after entities have been added to the platform.
+        Returns function to stop polling the platform.
+        """
+        pollers = self._pollers.setdefault(platform, {})
+        interval = platform.scan_interval.total_seconds()
+        now = dt_util.utcnow()
+
+        for entity_id, entity in platform.entities.items():
+            if entity_id in pollers or not entity.should_poll:
+                continue
+            poller = pollers[entity_id] = _EntityPoller(
+                entity_id, self._async_take_phase(interval, now.timestamp())
+            )
+            self._async_schedule(
+                platform, poller, _first_poll(now, interval, poller.phase)
+            )
+
+        @callback
+        def stop_polling() -> None:
+            """Stop polling the platform."""
+            self._async_untrack_platform(platform)
+
+        return stop_polling
+
+    @callback
+    def async_stats(self) -> dict[str, dict[str, Any]]:
+        """Return the poll stats by platform."""
+        return {key: stats.as_dict() for key, stats in self._stats.items()}
+
+    @callback
+    def _async_untrack_platform(self, platform: EntityPlatform) -> None:
+        """Stop polling the entities of a platform."""
+        interval = platform.scan_interval.total_seconds()
+        for poller in self._pollers.pop(platform, {}).values():
+            if poller.unsub is not None:
+                poller.unsub()
+            self._async_release_phase(interval, poller.phase)
+
+    @callback
+    def _async_take_phase(self, interval: float, now: float) -> float:
+        """Return the middle of the largest gap between the phases in use.
+
+        The first phase makes the first poll happen a scan interval from now.
+        """
+        phases = self._phases.setdefault(interval, [])
+        if not phases:
+            phase = now % interval
+        else:
+            gap_start, gap = phases[-1], phases[0] + interval - phases[-1]
+            for start, end in zip(phases, phases[1:]):
+                if end - start > gap:
+                    gap_start, gap = start, end - start
+            phase = (gap_start + gap / 2) % interval
+        insort(phases, phase)
+        return phase
+
+    @callback
+    def _async_release_phase(self, interval: float, phase: float) -> None:
+        """Release a phase that is no longer used."""
+        phases = self._phases[interval]
+        phases.remove(phase)
+        if not phases:
+            del self._phases[interval]
+
+    @callback
+    def _async_schedule(
+        self, platform: EntityPlatform, poller: _EntityPoller, point: datetime
+    ) -> None:
+        """Schedule the next poll of an entity."""
+        poller.unsub = async_track_point_in_utc_time(
+            self.hass, functools.partial(self._async_poll, platform, poller), point
+        )
+
+    @callback
+    def _async_get_budget(self, platform: EntityPlatform) -> asyncio.Semaphore:
+        """Return the semaphore limiting the polls of an integration."""
+        budget = self._budgets.get(platform.platform_name)
+        if budget is None:
+            budget = self._budgets[platform.platform_name] = asyncio.Semaphore(
+                getattr(platform.platform, "POLL_BUDGET", DEFAULT_POLL_BUDGET)
+            )
+        return budget
+
+    async def _async_poll(
+        self, platform: EntityPlatform, poller: _EntityPoller, point: datetime
+    ) -> None:
+        """Poll an entity and schedule its next poll."""
+        poller.unsub = None
+        if not self._async_is_tracked(platform, poller):
+            return
+
+        interval = platform.scan_interval.total_seconds()
+        entity = platform.entities.get(poller.entity_id)
+
+        if entity is None:
+            self._pollers[platform].pop(poller.entity_id)
+            self._async_release_phase(interval, poller.phase)
+            return
+
+        if entity.should_poll:
+            async with self._async_get_budget(platform):
+                start = monotonic()
+                try:
+                    await entity.async_update_ha_state(True)
+                except Exception:  # pylint: disable=broad-except
+                    # Keep polling, as the next update may succeed
+                    platform.logger.exception("Error polling %s", entity.entity_id)
+                duration = monotonic() - start
+            self._async_record_poll(platform, poller, duration)
+
+        # The platform may have stopped polling during the update
+        if not self._async_is_tracked(platform, poller):
+            return
+
+        self._async_schedule(
+            platform,
+            poller,
+            _next_poll(point, interval, poller.backoff, dt_util.utcnow()),
+        )
+
+    @callback
+    def _async_is_tracked(
+        self, platform: EntityPlatform, poller: _EntityPoller
+    ) -> bool:
+        """Return if a poller still polls the entity of a platform."""
+        return self._pollers.get(platform, {}).get(poller.entity_id) is poller
+
+    @callback
+    def _async_record_poll(
+        self, platform: EntityPlatform, poller: _EntityPoller, duration: float
+    ) -> None:
+        """Record the duration of a poll and back off when it overran."""
+        key = f"{platform.domain}.{platform.platform_name}"
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = PollStats()
+        stats.polls += 1
+        stats.total_duration += duration
+        stats.max_duration = max(stats.max_duration, duration)
+
+        if duration <= platform.scan_interval.total_seconds():
+            poller.backoff = 1
+            return
+
+        stats.overruns += 1
+        poller.backoff = min(poller.backoff * 2, MAX_POLL_BACKOFF)
+        platform.logger.warning(
+            "Updating %s took %.1f seconds, longer than the scan interval %s; "
+            "polling it every %s",
+            poller.entity_id,
+            duration,
+            platform.scan_interval,
+            platform.scan_interval * poller.backoff,
+        )
+
+
+def _first_poll(now: datetime, interval: float, phase: float) -> datetime:
+    """Return the first point in time after now at a phase of the interval."""
+    offset = (phase - now.timestamp()) % interval or interval
+    return now + timedelta(seconds=offset)
+
+
+def _next_poll(
+    point: datetime, interval: float, backoff: int, now: datetime
+) -> datetime:
+    """Return the point in time of the next poll after a poll.
+
+    Intervals that passed while the entity was updated are skipped.
+    """
+    next_point = point + timedelta(seconds=interval * backoff)
+    if next_point <= now:
+        skipped = math.ceil((now - next_point).total_seconds() / interval)
+        next_point += timedelta(seconds=interval * max(skipped, 1))
+    return next_point
+
+
+@singleton.singleton(DATA_POLLING_SCHEDULER)
+def async_get(hass: HomeAssistant) -> PollingScheduler:
+    """Return the polling scheduler."""
+    return PollingScheduler(hass)
@@ -0,0 +1,100 @@
+"""Record how long templates, script steps and conditions take to run."""
+from __future__ import annotations
+
+from collections import deque
+import math
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from . import singleton
+
+DATA_PROFILING = "profiling"
+
+CATEGORY_CONDITION = "condition"
+CATEGORY_SCRIPT_STEP = "script_step"
+CATEGORY_TEMPLATE = "template"
+
+CATEGORIES = (CATEGORY_CONDITION, CATEGORY_SCRIPT_STEP, CATEGORY_TEMPLATE)
+
+# Calls kept per key to calculate the 99th percentile from
+SAMPLE_SIZE = 100
+# Keys recorded per category, calls of further keys are not recorded
+MAX_KEYS = 1000
+
+
+class CallTimings:
+    """Timings of the calls of a template, script step or condition."""
+
+    __slots__ = ("count", "total", "_samples")
+
+    def __init__(self) -> None:
+        """Initialize the timings."""
+        self.count = 0
+        self.total = 0.0
+        self._samples: deque[float] = deque(maxlen=SAMPLE_SIZE)
+
+    def record(self, elapsed: float) -> None:
+        """Record a call that took elapsed seconds."""
+        self.count += 1
+        self.total += elapsed
+        self._samples.append(elapsed)
+
+    @property
+    def p99(self) -> float:
+        """Return the 99th percentile of the most recent calls."""
+        if not self._samples:
+            return 0.0
+        samples = sorted(self._samples)
+        return samples[math.ceil(len(samples) * 0.99) - 1]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the timings as a dict."""
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p99": self.p99,
+        }
+
+
+class Profiling:
+    """Timings of templates, script steps and conditions by category and key."""
+
+    def __init__(self) -> None:
+        """Initialize the profiling."""
+        self._timings: dict[str, dict[str, CallTimings]] = {
+            category: {} for category in CATEGORIES
+        }
+
+    def record(self, category: str, key: str, elapsed: float) -> None:
+        """Record a call of a key that took elapsed seconds."""
+        timings = self._timings[category]
+        if (call_timings := timings.get(key)) is None:
+            if len(timings) >= MAX_KEYS:
+                return
+            call_timings = timings[key] = CallTimings()
+        call_timings.record(elapsed)
+
+    def as_dict(self, limit: int | None = None) -> dict[str, dict[str, Any]]:
+        """Return the timings of each category, most total time first."""
+        return {
+            category: {
+                key: call_timings.as_dict()
+                for key, call_timings in sorted(
+                    timings.items(), key=lambda item: item[1].total, reverse=True
+                )[:limit]
+            }
+            for category, timings in self._timings.items()
+        }
+
+    def reset(self) -> None:
+        """Forget all timings."""
+        for timings in self._timings.values():
+            timings.clear()
+
+
+@singleton.singleton(DATA_PROFILING)
+def async_get(hass: HomeAssistant) -> Profiling:
+    """Return the profiling of an instance."""
+    return Profiling()
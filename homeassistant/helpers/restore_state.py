@@ -8,6 +8,7 @@ from typing import Any, cast
 
 from homeassistant.const import EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import (
+    Context,
     CoreState,
     HomeAssistant,
     State,
@@ -203,10 +204,17 @@ class RestoreStateData:
         # re-added while hass is still running.
         state = self.hass.states.get(entity_id)
         # To fully mimic all the attribute data types when loaded from storage,
-        # we're going to serialize it to JSON and then re-load it.
-        if state is not None:
-            state = State.from_dict(_encode_complex(state.as_dict()))
+        # we're going to encode the attributes like they are stored.
         if state is not None:
+            state = State.from_trusted(
+                state.entity_id,
+                state.state,
+                _encode_complex(dict(state.attributes)),
+                state.last_changed,
+                state.last_updated,
+                Context(id=state.context.id, user_id=state.context.user_id),
+                state,
+            )
             self.last_states[entity_id] = StoredState(state, dt_util.utcnow())
 
         self.entity_ids.remove(entity_id)
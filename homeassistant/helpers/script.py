@@ -3,13 +3,14 @@ from __future__ import annotations
 
 import asyncio
 from collections.abc import Sequence
-from contextlib import asynccontextmanager, suppress
+from contextlib import asynccontextmanager, contextmanager, suppress
 from datetime import datetime, timedelta
 from functools import partial
 import itertools
 import logging
+import time
 from types import MappingProxyType
-from typing import Any, Callable, Dict, TypedDict, Union, cast
+from typing import Any, Callable, Dict, Iterator, TypedDict, Union, cast
 
 import async_timeout
 import voluptuous as vol
@@ -56,7 +57,13 @@ from homeassistant.core import (
     HomeAssistant,
     callback,
 )
-from homeassistant.helpers import condition, config_validation as cv, service, template
+from homeassistant.helpers import (
+    condition,
+    config_validation as cv,
+    profiling,
+    service,
+    template,
+)
 from homeassistant.helpers.condition import (
     ConditionCheckerType,
     trace_condition_function,
@@ -319,6 +326,7 @@ class _ScriptRun:
         self._action: dict[str, Any] | None = None
         self._stop = asyncio.Event()
         self._stopped = asyncio.Event()
+        self._waited = 0.0
 
     def _changed(self) -> None:
         if not self._stop.is_set():
@@ -366,15 +374,37 @@ class _ScriptRun:
             async with trace_action(self._hass, self, self._stop, self._variables):
                 if self._stop.is_set():
                     return
+                action_type = cv.determine_script_action(self._action)
+                self._waited = 0.0
+                start = time.perf_counter()
                 try:
-                    handler = f"_async_{cv.determine_script_action(self._action)}_step"
-                    await getattr(self, handler)()
+                    await getattr(self, f"_async_{action_type}_step")()
                 except Exception as ex:
                     if not isinstance(ex, _StopScript) and (
                         self._log_exceptions or log_exceptions
                     ):
                         self._log_exception(ex)
                     raise
+                finally:
+                    profiling.async_get(self._hass).record(
+                        profiling.CATEGORY_SCRIPT_STEP,
+                        f"{self._script.name}: step {self._step + 1} "
+                        f"({self._action.get(CONF_ALIAS, action_type)})",
+                        time.perf_counter() - start - self._waited,
+                    )
+
+    @contextmanager
+    def _waiting(self) -> Iterator[None]:
+        """Leave the time spent waiting out of the recorded time of the step.
+
+        Delays, waits and nested scripts, whose steps are recorded
+        themselves, do not keep the event loop busy.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._waited += time.perf_counter() - start
 
     def _finish(self) -> None:
         self._script._runs.remove(self)  # pylint: disable=protected-access
@@ -447,8 +477,9 @@ class _ScriptRun:
         self._changed()
         trace_set_result(delay=delay, done=False)
         try:
-            async with async_timeout.timeout(delay):
-                await self._stop.wait()
+            with self._waiting():
+                async with async_timeout.timeout(delay):
+                    await self._stop.wait()
         except asyncio.TimeoutError:
             trace_set_result(delay=delay, done=True)
 
@@ -491,8 +522,9 @@ class _ScriptRun:
             self._hass.async_create_task(flag.wait()) for flag in (self._stop, done)
         ]
         try:
-            async with async_timeout.timeout(timeout) as to_context:
-                await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            with self._waiting():
+                async with async_timeout.timeout(timeout) as to_context:
+                    await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
         except asyncio.TimeoutError as ex:
             self._variables["wait"]["remaining"] = 0.0
             if not self._action.get(CONF_CONTINUE_ON_TIMEOUT, True):
@@ -516,9 +548,10 @@ class _ScriptRun:
         # Wait for long task while monitoring for a stop request.
         stop_task = self._hass.async_create_task(self._stop.wait())
         try:
-            await asyncio.wait(
-                {long_task, stop_task}, return_when=asyncio.FIRST_COMPLETED
-            )
+            with self._waiting():
+                await asyncio.wait(
+                    {long_task, stop_task}, return_when=asyncio.FIRST_COMPLETED
+                )
         # If our task is cancelled, then cancel long task, too. Note that if long task
         # is cancelled otherwise the CancelledError exception will not be raised to
         # here due to the call to asyncio.wait(). Rather we'll check for that below.
@@ -802,8 +835,9 @@ class _ScriptRun:
             self._hass.async_create_task(flag.wait()) for flag in (self._stop, done)
         ]
         try:
-            async with async_timeout.timeout(timeout) as to_context:
-                await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            with self._waiting():
+                async with async_timeout.timeout(timeout) as to_context:
+                    await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
         except asyncio.TimeoutError as ex:
             self._variables["wait"]["remaining"] = 0.0
             if not self._action.get(CONF_CONTINUE_ON_TIMEOUT, True):
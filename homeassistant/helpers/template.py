@@ -4,8 +4,9 @@ from __future__ import annotations
 from ast import literal_eval
 import asyncio
 import base64
+from collections import OrderedDict
 import collections.abc
-from collections.abc import Generator, Iterable
+from collections.abc import Generator, Hashable, Iterable, Mapping
 from contextlib import suppress
 from contextvars import ContextVar
 from datetime import datetime, timedelta
@@ -17,9 +18,10 @@ from operator import attrgetter
 import random
 import re
 import sys
+import threading
+import time
 from typing import Any, Callable, cast
 from urllib.parse import urlencode as urllib_urlencode
-import weakref
 
 import jinja2
 from jinja2 import contextfunction, pass_context
@@ -32,10 +34,12 @@ from homeassistant.const import (
     ATTR_LATITUDE,
     ATTR_LONGITUDE,
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_STATE_CHANGED,
     LENGTH_METERS,
     STATE_UNKNOWN,
 )
 from homeassistant.core import (
+    Event,
     HomeAssistant,
     State,
     callback,
@@ -43,7 +47,12 @@ from homeassistant.core import (
     valid_entity_id,
 )
 from homeassistant.exceptions import TemplateError
-from homeassistant.helpers import entity_registry, location as loc_helper
+from homeassistant.helpers import (
+    entity_registry,
+    location as loc_helper,
+    profiling,
+    singleton,
+)
 from homeassistant.helpers.typing import TemplateVarsType
 from homeassistant.loader import bind_hass
 from homeassistant.util import convert, dt as dt_util, location as loc_util
@@ -60,6 +69,7 @@ _RENDER_INFO = "template.render_info"
 _ENVIRONMENT = "template.environment"
 _ENVIRONMENT_LIMITED = "template.environment_limited"
 _ENVIRONMENT_STRICT = "template.environment_strict"
+_RENDER_CACHE = "template.render_cache"
 
 _RE_JINJA_DELIMITERS = re.compile(r"\{%|\{\{|\{#")
 # Match "simple" ints and floats. -1.0, 1, +5, 5.0
@@ -83,6 +93,12 @@ _COLLECTABLE_STATE_ATTRIBUTES = {
 ALL_STATES_RATE_LIMIT = timedelta(minutes=1)
 DOMAIN_STATES_RATE_LIMIT = timedelta(seconds=1)
 
+# Number of render results kept by the render cache
+RENDER_CACHE_SIZE = 1024
+
+# Number of compiled templates shared between Template instances
+COMPILED_CACHE_SIZE = 4096
+
 template_cv: ContextVar[str | None] = ContextVar("template_cv", default=None)
 
 
@@ -221,6 +237,8 @@ class RenderInfo:
         self.entities: collections.abc.Set[str] = set()
         self.rate_limit: timedelta | None = None
         self.has_time = False
+        # False when the render used something the render cache can not track
+        self.cacheable = True
 
     def __repr__(self) -> str:
         """Representation of RenderInfo."""
@@ -285,6 +303,139 @@ class RenderInfo:
             self.filter = _false
 
 
+def _merge_render_info(render_info: RenderInfo, other: RenderInfo) -> None:
+    """Add what another render read to a render info."""
+    render_info.all_states |= other.all_states
+    render_info.all_states_lifecycle |= other.all_states_lifecycle
+    render_info.domains.update(other.domains)
+    render_info.domains_lifecycle.update(other.domains_lifecycle)
+    render_info.entities.update(other.entities)
+    render_info.has_time |= other.has_time
+    render_info.cacheable &= other.cacheable
+
+
+class _CachedRender:
+    """A render result and the versions of the states it read."""
+
+    __slots__ = ("render_info", "versions", "render_result")
+
+    def __init__(
+        self, render_info: RenderInfo, versions: tuple[int, ...], render_result: str
+    ) -> None:
+        """Initialize the cached render."""
+        self.render_info = render_info
+        self.versions = versions
+        self.render_result = render_result
+
+
+class RenderCache:
+    """Cache the results of templates until the states they read change.
+
+    Each state change bumps the version of its entity, of its domain and
+    of all states. A render result is kept with the versions of the
+    states it read and is used while they are unchanged.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the render cache."""
+        self._entries: OrderedDict[Hashable, _CachedRender] = OrderedDict()
+        self._version = 0
+        self._domain_versions: dict[str, int] = {}
+        self._entity_versions: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.uncacheable = 0
+        # The filter runs while the event is fired, before any listener
+        # can render a template because of the change
+        hass.bus.async_listen(
+            EVENT_STATE_CHANGED, _false, event_filter=self._async_state_changed
+        )
+
+    @callback
+    def _async_state_changed(self, event: Event) -> bool:
+        """Bump the versions of a state change."""
+        entity_id = event.data["entity_id"]
+        domain = split_entity_id(entity_id)[0]
+        self._version += 1
+        self._domain_versions[domain] = self._domain_versions.get(domain, 0) + 1
+        self._entity_versions[entity_id] = self._entity_versions.get(entity_id, 0) + 1
+        return False
+
+    @callback
+    def _async_versions(self, render_info: RenderInfo) -> tuple[int, ...]:
+        """Return the versions of the states a render read."""
+        all_states = render_info.all_states or render_info.all_states_lifecycle
+        return (
+            self._version if all_states else 0,
+            *(self._domain_versions.get(domain, 0) for domain in render_info.domains),
+            *(
+                self._domain_versions.get(domain, 0)
+                for domain in render_info.domains_lifecycle
+            ),
+            *(
+                self._entity_versions.get(entity_id, 0)
+                for entity_id in render_info.entities
+            ),
+        )
+
+    @callback
+    def async_get(self, key: Hashable) -> _CachedRender | None:
+        """Return the cached render of a key if the states it read are unchanged."""
+        entry = self._entries.get(key)
+        if entry is None or entry.versions != self._async_versions(entry.render_info):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    @callback
+    def async_set(self, key: Hashable, render_info: RenderInfo, result: str) -> None:
+        """Cache the result of a render with the states it read."""
+        # pylint: disable=protected-access
+        render_info._freeze_sets()
+        self._entries[key] = _CachedRender(
+            render_info, self._async_versions(render_info), result
+        )
+        self._entries.move_to_end(key)
+        if len(self._entries) > RENDER_CACHE_SIZE:
+            self._entries.popitem(last=False)
+
+    @callback
+    def async_stats(self) -> dict[str, Any]:
+        """Return the hit rate of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "uncacheable": self.uncacheable,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "size": len(self._entries),
+        }
+
+
+@singleton.singleton(_RENDER_CACHE)
+def async_get_render_cache(hass: HomeAssistant) -> RenderCache:
+    """Return the render cache."""
+    return RenderCache(hass)
+
+
+def _render_cache_key(value: Any) -> Hashable:
+    """Return a hashable key for the variables of a render.
+
+    The type is part of the key as equal values of different types
+    render differently. Raises TypeError for unhashable values.
+    """
+    if isinstance(value, Mapping):
+        return frozenset((key, _render_cache_key(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_render_cache_key(item) for item in value))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_render_cache_key(item) for item in value)
+    hash(value)
+    return (type(value), value)
+
+
 class Template:
     """Class to hold a template and manage caching and rendering."""
 
@@ -293,6 +444,7 @@ class Template:
         "template",
         "hass",
         "is_static",
+        "cache_renders",
         "_compiled_code",
         "_compiled",
         "_exc_info",
@@ -310,6 +462,9 @@ class Template:
         self._compiled: jinja2.Template | None = None
         self.hass = hass
         self.is_static = not is_template_string(template)
+        # Opt in to the render cache. Only for templates whose result
+        # depends on nothing but their variables and the states they read.
+        self.cache_renders = False
         self._exc_info = None
         self._limited = None
         self._strict = None
@@ -385,18 +540,75 @@ class Template:
         if variables is not None:
             kwargs.update(variables)
 
+        start = time.perf_counter()
         try:
-            render_result = _render_with_context(self.template, compiled, **kwargs)
-        except Exception as err:
-            raise TemplateError(err) from err
-
-        render_result = render_result.strip()
+            if self.cache_renders:
+                render_result = self._async_render_cached(compiled, kwargs)
+            else:
+                try:
+                    render_result = _render_with_context(
+                        self.template, compiled, **kwargs
+                    ).strip()
+                except Exception as err:
+                    raise TemplateError(err) from err
+        finally:
+            profiling.async_get(self.hass).record(
+                profiling.CATEGORY_TEMPLATE,
+                self.template,
+                time.perf_counter() - start,
+            )
 
         if self.hass.config.legacy_templates or not parse_result:
             return render_result
 
         return self._parse_result(render_result)
 
+    @callback
+    def _async_render_cached(
+        self, compiled: jinja2.Template, variables: dict[str, Any]
+    ) -> str:
+        """Render the template or return the cached result of an earlier render.
+
+        The states read by a render are added to the render info of the
+        caller, whether the result comes from the cache or not.
+        """
+        cache = async_get_render_cache(self.hass)
+        try:
+            key: Hashable | None = (
+                self.template,
+                self._limited,
+                self._strict,
+                _render_cache_key(variables),
+            )
+        except TypeError:
+            cache.uncacheable += 1
+            key = None
+
+        outer_info: RenderInfo | None = self.hass.data.get(_RENDER_INFO)
+        if key is not None and (cached := cache.async_get(key)) is not None:
+            if outer_info is not None:
+                _merge_render_info(outer_info, cached.render_info)
+            return cached.render_result
+
+        render_info = RenderInfo(self)
+        self.hass.data[_RENDER_INFO] = render_info
+        try:
+            render_result = _render_with_context(
+                self.template, compiled, **variables
+            ).strip()
+        except Exception as err:
+            raise TemplateError(err) from err
+        finally:
+            if outer_info is None:
+                del self.hass.data[_RENDER_INFO]
+            else:
+                self.hass.data[_RENDER_INFO] = outer_info
+                _merge_render_info(outer_info, render_info)
+
+        if key is not None and not render_info.has_time and render_info.cacheable:
+            cache.async_set(key, render_info, render_result)
+        return render_result
+
     def _parse_result(self, render_result: str) -> Any:  # pylint: disable=no-self-use
         """Parse the result."""
         try:
@@ -1408,7 +1620,8 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
             undefined = jinja2.StrictUndefined
         super().__init__(undefined=undefined)
         self.hass = hass
-        self.template_cache = weakref.WeakValueDictionary()
+        # Environments of the same kind compile templates the same way
+        self.compile_kind = (hass is not None, bool(limited), bool(strict))
         self.filters["round"] = forgiving_round
         self.filters["multiply"] = multiply
         self.filters["log"] = logarithm
@@ -1483,7 +1696,23 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
 
             return contextfunction(wrapper)
 
-        self.globals["device_entities"] = hassfunction(device_entities)
+        def uncacheable(func):
+            """Wrap function whose result the render cache can not track."""
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                render_info = hass.data.get(_RENDER_INFO)
+                if render_info is not None:
+                    render_info.cacheable = False
+                return func(*args, **kwargs)
+
+            return wrapper
+
+        # Random values, the age of a datetime and the registries
+        # do not change with the states the render cache tracks
+        self.filters["random"] = uncacheable(random_every_time)
+        self.globals["relative_time"] = uncacheable(relative_time)
+        self.globals["device_entities"] = uncacheable(hassfunction(device_entities))
         self.filters["device_entities"] = pass_context(self.globals["device_entities"])
 
         if limited:
@@ -1554,12 +1783,25 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
             # any instance of this.
             return super().compile(source, name, filename, raw, defer_init)
 
-        cached = self.template_cache.get(source)
+        key = (source, self.compile_kind)
+        with _COMPILED_CACHE_LOCK:
+            if (cached := _COMPILED_CACHE.get(key)) is not None:
+                _COMPILED_CACHE.move_to_end(key)
+                return cached
 
-        if cached is None:
-            cached = self.template_cache[source] = super().compile(source)
+        cached = super().compile(source)
+
+        with _COMPILED_CACHE_LOCK:
+            _COMPILED_CACHE[key] = cached
+            if len(_COMPILED_CACHE) > COMPILED_CACHE_SIZE:
+                _COMPILED_CACHE.popitem(last=False)
 
         return cached
 
 
+# Compiled code of templates, shared by all environments of a kind so
+# identical templates are compiled once per process, also across reloads
+_COMPILED_CACHE: OrderedDict[tuple[str, tuple[bool, bool, bool]], Any] = OrderedDict()
+_COMPILED_CACHE_LOCK = threading.Lock()
+
 _NO_HASS_ENV = TemplateEnvironment(None)  # type: ignore[no-untyped-call]
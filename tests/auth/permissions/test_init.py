@@ -0,0 +1,58 @@
+"""Tests for the policy permissions."""
+from unittest.mock import patch
+
+from homeassistant.auth.permissions import PolicyPermissions
+from homeassistant.auth.permissions.models import PermissionLookup
+from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.helpers.entity_registry import RegistryEntry
+
+from tests.common import mock_device_registry, mock_registry
+
+
+def test_check_entity_cached(hass):
+    """Test entity checks are cached until the registries change."""
+    entity_registry = mock_registry(
+        hass,
+        {
+            "light.kitchen": RegistryEntry(
+                entity_id="light.kitchen",
+                unique_id="1234",
+                platform="test_platform",
+                device_id="mock-dev-id",
+            )
+        },
+    )
+    device_registry = mock_device_registry(
+        hass, {"mock-dev-id": DeviceEntry(id="mock-dev-id", area_id="mock-area-id")}
+    )
+    perm_lookup = PermissionLookup(entity_registry, device_registry)
+    perms = PolicyPermissions(
+        {"entities": {"area_ids": {"mock-area-id": {"read": True}}}}, perm_lookup
+    )
+
+    with patch.object(
+        perm_lookup.entity_registry,
+        "async_get",
+        wraps=perm_lookup.entity_registry.async_get,
+    ) as mock_get:
+        assert perms.check_entity("light.kitchen", "read") is True
+        assert perms.check_entity("light.kitchen", "read") is True
+        assert perms.check_entity("light.kitchen", "control") is False
+        assert mock_get.call_count == 2
+
+        device_registry.devices["mock-dev-id"] = DeviceEntry(
+            id="mock-dev-id", area_id="other-area-id"
+        )
+        assert perms.check_entity("light.kitchen", "read") is True
+        perm_lookup.version += 1
+        assert perms.check_entity("light.kitchen", "read") is False
+        assert mock_get.call_count == 3
+
+
+def test_check_entity_without_lookup():
+    """Test entity checks for a user that has no permission lookup."""
+    perms = PolicyPermissions(
+        {"entities": {"entity_ids": {"light.kitchen": True}}}, None
+    )
+    assert perms.check_entity("light.kitchen", "read") is True
+    assert perms.check_entity("light.living_room", "read") is False
@@ -3,6 +3,8 @@ import asyncio
 from unittest.mock import patch
 
 from homeassistant.auth import auth_store
+from homeassistant.helpers.device_registry import EVENT_DEVICE_REGISTRY_UPDATED
+from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 
 
 async def test_loading_no_group_data_format(hass, hass_storage):
@@ -248,3 +250,24 @@ async def test_loading_race_condition(hass):
         mock_dev_registry.assert_called_once_with(hass)
         mock_load.assert_called_once_with()
         assert results[0] == results[1]
+
+
+async def test_registry_updates_invalidate_permission_cache(hass, hass_storage):
+    """Test registry updates invalidate the cached permission checks."""
+    store = auth_store.AuthStore(hass)
+    await store._async_load()
+    perm_lookup = store._perm_lookup
+    assert perm_lookup.version == 0
+
+    hass.bus.async_fire(
+        EVENT_ENTITY_REGISTRY_UPDATED,
+        {"action": "update", "entity_id": "light.kitchen"},
+    )
+    await hass.async_block_till_done()
+    assert perm_lookup.version == 1
+
+    hass.bus.async_fire(
+        EVENT_DEVICE_REGISTRY_UPDATED, {"action": "update", "device_id": "abcd"}
+    )
+    await hass.async_block_till_done()
+    assert perm_lookup.version == 2
@@ -10,6 +10,7 @@ from pytest import approx
 from homeassistant.components import history, recorder
 from homeassistant.components.recorder.history import get_significant_states
 from homeassistant.components.recorder.models import process_timestamp
+from homeassistant.components.recorder.statistics import get_period_bounds
 import homeassistant.core as ha
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.setup import async_setup_component
@@ -613,6 +614,88 @@ async def test_fetch_period_api_with_minimal_response(hass, hass_client):
     assert response.status == 200
 
 
+async def test_fetch_period_api_with_downsampling(hass, hass_client):
+    """Test the fetch period view for history with downsampling."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    start = dt_util.utcnow() - timedelta(minutes=1)
+    for value in ("5", "12", "7"):
+        hass.states.async_set("sensor.power", value)
+        await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    client = await hass_client()
+
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}",
+        params={
+            "filter_entity_id": "sensor.power",
+            "skip_initial_state": "",
+            "max_points": "1",
+            "aggregate": "max",
+        },
+    )
+    assert response.status == 200
+    response_json = await response.json()
+    assert [state["state"] for state in response_json[0]] == ["12"]
+
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}",
+        params={"filter_entity_id": "sensor.power", "bucket_size": "0"},
+    )
+    assert response.status == 400
+
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}",
+        params={"filter_entity_id": "sensor.power", "aggregate": "median"},
+    )
+    assert response.status == 400
+
+
+async def test_fetch_period_api_with_stream(hass, hass_client):
+    """Test the fetch period view for history streams the same states."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    hass.states.async_set("sensor.power", "5")
+    hass.states.async_set("light.kitchen", "off")
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+    for value in ("12", "7"):
+        hass.states.async_set("sensor.power", value)
+        await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    client = await hass_client()
+
+    for params in ({}, {"minimal_response": ""}):
+        response = await client.get(
+            f"/api/history/period/{start.isoformat()}", params=params
+        )
+        assert response.status == 200
+        expected = await response.json()
+
+        response = await client.get(
+            f"/api/history/period/{start.isoformat()}",
+            params={**params, "stream": ""},
+        )
+        assert response.status == 200
+        response_json = await response.json()
+        # The entities with state changes come first
+        assert [states[0]["entity_id"] for states in response_json] == [
+            "sensor.power",
+            "light.kitchen",
+        ]
+        assert sorted(response_json, key=lambda states: states[0]["entity_id"]) == (
+            sorted(expected, key=lambda states: states[0]["entity_id"])
+        )
+        assert [state["state"] for state in response_json[0]] == ["5", "12", "7"]
+
+
 async def test_fetch_period_api_with_no_timestamp(hass, hass_client):
     """Test the fetch period view for history with no timestamp."""
     await hass.async_add_executor_job(init_recorder_component, hass)
@@ -918,6 +1001,56 @@ async def test_statistics_during_period(
         ]
     }
 
+    await client.send_json(
+        {
+            "id": 2,
+            "type": "history/statistics_during_period",
+            "start_time": now.isoformat(),
+            "statistic_ids": ["sensor.test"],
+            "period": "5minute",
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert len(response["result"]["sensor.test"]) == 12
+    assert response["result"]["sensor.test"][1] == {
+        "statistic_id": "sensor.test",
+        "start": (now + timedelta(minutes=5)).isoformat(),
+        "mean": approx(value),
+        "min": approx(value),
+        "max": approx(value),
+        "last_reset": None,
+        "state": None,
+        "sum": None,
+    }
+
+    month_start, _ = get_period_bounds(now, "month")
+    await client.send_json(
+        {
+            "id": 3,
+            "type": "history/statistics_during_period",
+            "start_time": month_start.isoformat(),
+            "statistic_ids": ["sensor.test"],
+            "period": "month",
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] == {
+        "sensor.test": [
+            {
+                "statistic_id": "sensor.test",
+                "start": month_start.isoformat(),
+                "mean": approx(value),
+                "min": approx(value),
+                "max": approx(value),
+                "last_reset": None,
+                "state": None,
+                "sum": None,
+            }
+        ]
+    }
+
 
 async def test_statistics_during_period_bad_start_time(hass, hass_ws_client):
     """Test statistics_during_period."""
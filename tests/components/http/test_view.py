@@ -1,6 +1,7 @@
 """Tests for Safegate Pro View."""
-from unittest.mock import AsyncMock, Mock
+from unittest.mock import AsyncMock, Mock, patch
 
+from aiohttp import ClientPayloadError, web
 from aiohttp.web_exceptions import (
     HTTPBadRequest,
     HTTPInternalServerError,
@@ -9,6 +10,7 @@ from aiohttp.web_exceptions import (
 import pytest
 import voluptuous as vol
 
+from homeassistant.components.http.const import KEY_HASS
 from homeassistant.components.http.view import (
     HomeAssistantView,
     request_handler_factory,
@@ -38,6 +40,55 @@ async def test_invalid_json(caplog):
     assert str(float("NaN")) in caplog.text
 
 
+async def test_json_stream(hass, aiohttp_client):
+    """Test streaming the items of a job as a JSON list."""
+    items_job = Mock(return_value=({"item": i} for i in range(100)))
+
+    async def handler(request):
+        return await HomeAssistantView.json_stream(request, items_job, "arg")
+
+    app = web.Application()
+    app[KEY_HASS] = hass
+    app.router.add_get("/", handler)
+    client = await aiohttp_client(app)
+
+    with patch("homeassistant.components.http.view.JSON_STREAM_CHUNK_SIZE", 50):
+        response = await client.get("/")
+    assert response.status == 200
+    assert await response.json() == [{"item": i} for i in range(100)]
+    items_job.assert_called_once_with("arg")
+
+    items_job.return_value = iter([])
+    response = await client.get("/")
+    assert response.status == 200
+    assert await response.json() == []
+
+
+async def test_json_stream_invalid_json(hass, aiohttp_client, caplog):
+    """Test streaming items that can not be serialized."""
+    items_job = Mock(return_value=iter([object()]))
+
+    async def handler(request):
+        return await HomeAssistantView.json_stream(request, items_job)
+
+    app = web.Application()
+    app[KEY_HASS] = hass
+    app.router.add_get("/", handler)
+    client = await aiohttp_client(app)
+
+    response = await client.get("/")
+    assert response.status == 500
+    assert "Unable to serialize to JSON" in caplog.text
+
+    # The response is not ended when it already started
+    items_job.return_value = iter([*({"item": i} for i in range(100)), object()])
+    with patch("homeassistant.components.http.view.JSON_STREAM_CHUNK_SIZE", 50):
+        response = await client.get("/")
+        assert response.status == 200
+        with pytest.raises(ClientPayloadError):
+            await response.read()
+
+
 async def test_handling_unauthorized(mock_request):
     """Test handling unauth exceptions."""
     with pytest.raises(HTTPUnauthorized):
@@ -277,6 +277,7 @@ def create_state_changed_event_from_old_new(
     row = collections.namedtuple(
         "Row",
         [
+            "event_id"
             "event_type"
             "event_data"
             "time_fired"
@@ -287,14 +288,17 @@ def create_state_changed_event_from_old_new(
             "entity_id"
             "domain"
             "attributes"
+            "shared_attrs"
             "state_id",
             "old_state_id",
         ],
     )
 
+    row.event_id = None
     row.event_type = EVENT_STATE_CHANGED
     row.event_data = "{}"
-    row.attributes = attributes_json
+    row.attributes = None
+    row.shared_attrs = attributes_json
     row.time_fired = event_time_fired
     row.state = new_state and new_state.get("state")
     row.entity_id = entity_id
@@ -317,6 +321,34 @@ async def test_logbook_view(hass, hass_client):
     assert response.status == 200
 
 
+async def test_logbook_view_stream(hass, hass_client):
+    """Test the logbook view streams the same entries."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    for entity_id in ("switch.test", "switch.second"):
+        hass.states.async_set(entity_id, STATE_OFF)
+        hass.states.async_set(entity_id, STATE_ON)
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    start = dt_util.utcnow().date()
+    start_date = datetime(start.year, start.month, start.day)
+
+    response = await client.get(f"/api/logbook/{start_date.isoformat()}")
+    assert response.status == 200
+    expected = await response.json()
+    assert len(expected) == 2
+
+    response = await client.get(f"/api/logbook/{start_date.isoformat()}?stream")
+    assert response.status == 200
+    assert response.headers["Content-Type"].startswith("application/json")
+    assert await response.json() == expected
+
+
 async def test_logbook_view_period_entity(hass, hass_client):
     """Test the logbook view with period and entity."""
     await hass.async_add_executor_job(init_recorder_component, hass)
@@ -1215,6 +1247,76 @@ async def test_logbook_context_from_template(hass, hass_client):
     assert json_dict[5]["context_user_id"] == "9400facee45711eaa9308bfd3d19e474"
 
 
+async def test_logbook_entity_context_of_other_entity(hass, hass_client):
+    """Test the logbook view resolves contexts started by other entities."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    context = ha.Context(
+        id="ac5bd62de45711eaaeb351041eec8dd9",
+        user_id="b400facee45711eaa9308bfd3d19e474",
+    )
+
+    hass.states.async_set("light.kitchen", STATE_OFF)
+    hass.states.async_set("binary_sensor.door", STATE_OFF)
+    await hass.async_block_till_done()
+    hass.states.async_set(
+        "binary_sensor.door",
+        STATE_ON,
+        {ATTR_FRIENDLY_NAME: "Front door"},
+        context=context,
+    )
+    await hass.async_block_till_done()
+    hass.states.async_set("light.kitchen", STATE_ON, context=context)
+    await hass.async_block_till_done()
+
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+
+    start = dt_util.utcnow().date()
+    start_date = datetime(start.year, start.month, start.day)
+    response = await client.get(
+        f"/api/logbook/{start_date.isoformat()}?entity=light.kitchen"
+    )
+    assert response.status == 200
+    json_dict = await response.json()
+
+    assert len(json_dict) == 1
+    assert json_dict[0]["entity_id"] == "light.kitchen"
+    assert json_dict[0]["context_event_type"] == EVENT_STATE_CHANGED
+    assert json_dict[0]["context_entity_id"] == "binary_sensor.door"
+    assert json_dict[0]["context_entity_id_name"] == "Front door"
+    assert json_dict[0]["context_user_id"] == "b400facee45711eaa9308bfd3d19e474"
+
+
+async def test_entity_attribute_cache_invalidation(hass):
+    """Test the shared attribute cache drops entities when attributes change."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+    entity_attr_cache = hass.data[logbook.DATA_ENTITY_ATTR_CACHE]
+
+    hass.states.async_set("light.kitchen", STATE_ON, {ATTR_FRIENDLY_NAME: "Kitchen"})
+    await hass.async_block_till_done()
+    assert entity_attr_cache.get("light.kitchen", ATTR_FRIENDLY_NAME, None) == "Kitchen"
+
+    hass.states.async_set("light.kitchen", STATE_OFF, {ATTR_FRIENDLY_NAME: "Kitchen"})
+    await hass.async_block_till_done()
+    assert "light.kitchen" in entity_attr_cache._cache
+
+    hass.states.async_set("light.kitchen", STATE_OFF, {ATTR_FRIENDLY_NAME: "Cooking"})
+    await hass.async_block_till_done()
+    assert "light.kitchen" not in entity_attr_cache._cache
+    assert entity_attr_cache.get("light.kitchen", ATTR_FRIENDLY_NAME, None) == "Cooking"
+
+    hass.states.async_remove("light.kitchen")
+    await hass.async_block_till_done()
+    assert "light.kitchen" not in entity_attr_cache._cache
+
+
 async def test_logbook_entity_matches_only(hass, hass_client):
     """Test the logbook view with a single entity and entity_matches_only."""
     await hass.async_add_executor_job(init_recorder_component, hass)
@@ -9,13 +9,15 @@ from homeassistant.components.profiler import (
     SERVICE_DUMP_LOG_OBJECTS,
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
     SERVICE_LOG_THREAD_FRAMES,
+    SERVICE_LOG_TIMINGS,
     SERVICE_MEMORY,
     SERVICE_START,
     SERVICE_START_LOG_OBJECTS,
     SERVICE_STOP_LOG_OBJECTS,
 )
 from homeassistant.components.profiler.const import DOMAIN
-from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
+from homeassistant.const import CONF_COUNT, CONF_SCAN_INTERVAL, CONF_TYPE
+from homeassistant.helpers.template import Template
 import homeassistant.util.dt as dt_util
 
 from tests.common import MockConfigEntry, async_fire_time_changed
@@ -192,3 +194,26 @@ async def test_log_scheduled(hass, caplog):
 
     assert await hass.config_entries.async_unload(entry.entry_id)
     await hass.async_block_till_done()
+
+
+async def test_log_timings(hass, caplog):
+    """Test we can log the timings of templates."""
+
+    await setup.async_setup_component(hass, "persistent_notification", {})
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.services.has_service(DOMAIN, SERVICE_LOG_TIMINGS)
+
+    Template("{{ 1 + 1 }}", hass).async_render()
+    await hass.services.async_call(DOMAIN, SERVICE_LOG_TIMINGS, {CONF_COUNT: 5})
+    await hass.async_block_till_done()
+
+    assert "template {{ 1 + 1 }}: 1 calls" in caplog.text
+    caplog.clear()
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
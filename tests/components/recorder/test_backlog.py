@@ -0,0 +1,136 @@
+"""The tests for the recorder backlog policies."""
+from homeassistant.components.recorder.backlog import (
+    CoalesceBacklog,
+    DropBacklog,
+    SpillBacklog,
+)
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Context, Event, State
+
+
+def _state_changed(entity_id, state):
+    """Return a state changed event."""
+    return Event(
+        EVENT_STATE_CHANGED,
+        {
+            "entity_id": entity_id,
+            "old_state": None,
+            "new_state": State(entity_id, state, {"attr": state}),
+        },
+        context=Context(id="context_id"),
+    )
+
+
+def test_coalesce_backlog():
+    """Test pending state changes of an entity are coalesced into the latest."""
+    backlog = CoalesceBacklog(3)
+
+    assert backlog.async_add(_state_changed("sensor.one", "1")) is True
+    assert backlog.async_add(_state_changed("sensor.two", "1")) is False
+    assert backlog.async_add(Event("test_event")) is False
+    assert backlog.async_add(_state_changed("sensor.one", "2")) is False
+    assert backlog.replay_pending
+    assert len(backlog) == 3
+    assert backlog.dropped == 1
+
+    backlog.async_add(_state_changed("sensor.three", "1"))
+    assert backlog.dropped == 2
+
+    events = backlog.pop_all()
+    assert [event.event_type for event in events] == [
+        "test_event",
+        EVENT_STATE_CHANGED,
+        EVENT_STATE_CHANGED,
+    ]
+    assert events[1].data["new_state"].state == "2"
+    assert events[2].data["entity_id"] == "sensor.three"
+    assert not backlog.replay_pending
+    assert len(backlog) == 0
+    assert backlog.async_add(Event("test_event")) is True
+
+
+def test_drop_backlog():
+    """Test low priority events are dropped before state changes."""
+    backlog = DropBacklog(2)
+
+    backlog.async_add(Event("test_event_1"))
+    backlog.async_add(_state_changed("sensor.one", "1"))
+    backlog.async_add(Event("test_event_2"))
+    assert backlog.dropped == 1
+    backlog.async_add(_state_changed("sensor.one", "2"))
+    assert backlog.dropped == 2
+
+    events = backlog.pop_all()
+    assert [event.data["new_state"].state for event in events] == ["1", "2"]
+
+    backlog.async_add(_state_changed("sensor.one", "3"))
+    backlog.async_add(_state_changed("sensor.one", "4"))
+    backlog.async_add(_state_changed("sensor.one", "5"))
+    events = backlog.pop_all()
+    assert [event.data["new_state"].state for event in events] == ["4", "5"]
+
+
+async def test_spill_backlog(hass, tmp_path):
+    """Test events are spilled to the journal and replayed from it."""
+    path = tmp_path / "journal.jsonl"
+    backlog = SpillBacklog(hass, 10, str(path))
+
+    first = _state_changed("sensor.one", "1")
+    assert backlog.async_add(first) is True
+    backlog.async_add(Event("test_event", {"some": "data"}))
+    assert len(backlog) == 2
+    await hass.async_block_till_done()
+    assert len(path.read_text().splitlines()) == 2
+    assert len(backlog) == 2
+
+    backlog.async_add(_state_changed("sensor.one", "2"))
+    events = await hass.async_add_executor_job(backlog.pop_all)
+    await hass.async_block_till_done()
+
+    assert not path.exists()
+    assert len(backlog) == 3
+    events = list(events)
+    assert len(backlog) == 0
+    assert [event.event_type for event in events] == [
+        EVENT_STATE_CHANGED,
+        "test_event",
+        EVENT_STATE_CHANGED,
+    ]
+    assert events[0].data["new_state"] == first.data["new_state"]
+    assert events[0].time_fired == first.time_fired
+    assert events[0].context.id == "context_id"
+    assert events[1].data == {"some": "data"}
+    assert events[2].data["new_state"].state == "2"
+
+
+async def test_spill_backlog_replays_journal_left_behind(hass, tmp_path):
+    """Test a journal left behind by a previous run is replayed."""
+    path = tmp_path / "journal.jsonl"
+    backlog = SpillBacklog(hass, 10, str(path))
+    backlog.async_add(_state_changed("sensor.one", "1"))
+    await hass.async_block_till_done()
+
+    backlog = SpillBacklog(hass, 10, str(path))
+    assert len(backlog) == 0
+    await hass.async_add_executor_job(backlog.load)
+    assert len(backlog) == 1
+
+    events = await hass.async_add_executor_job(lambda: list(backlog.pop_all()))
+    assert len(events) == 1
+    assert events[0].data["new_state"].state == "1"
+    assert len(backlog) == 0
+
+
+async def test_spill_backlog_max_size(hass, tmp_path):
+    """Test the journal stops taking events once it holds max_size events."""
+    path = tmp_path / "journal.jsonl"
+    backlog = SpillBacklog(hass, 2, str(path))
+
+    for state in ("1", "2", "3"):
+        backlog.async_add(_state_changed("sensor.one", state))
+    await hass.async_block_till_done()
+
+    assert len(backlog) == 2
+    assert backlog.dropped == 1
+    events = await hass.async_add_executor_job(lambda: list(backlog.pop_all()))
+    assert [event.data["new_state"].state for event in events] == ["1", "2"]
@@ -358,6 +358,73 @@ def test_get_significant_states_only(hass_recorder):
     assert states == hist[entity_id]
 
 
+def test_get_significant_states_downsampled(hass_recorder):
+    """Test downsampling the states into buckets aggregated in the database."""
+    hass = hass_recorder()
+    start = dt_util.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(
+        hours=1
+    )
+    end = start + timedelta(minutes=10)
+
+    for minute in range(10):
+        point = start + timedelta(minutes=minute, seconds=30)
+        with patch(
+            "homeassistant.components.recorder.dt_util.utcnow", return_value=point
+        ):
+            hass.states.set(
+                "sensor.power",
+                "unavailable" if minute == 9 else str(minute + 1),
+                {"unit_of_measurement": "W"},
+            )
+            hass.states.set("binary_sensor.door", "on" if minute % 2 else "off")
+            wait_recording_done(hass)
+
+    def _states(**kwargs):
+        hist = history.get_significant_states(
+            hass,
+            start,
+            end,
+            include_start_time_state=False,
+            significant_changes_only=False,
+            **kwargs,
+        )
+        return {
+            entity_id: [state.state for state in states]
+            for entity_id, states in hist.items()
+        }
+
+    assert _states(bucket_size=timedelta(minutes=5)) == {
+        "sensor.power": ["5", "unavailable"],
+        "binary_sensor.door": ["off", "on"],
+    }
+    assert _states(max_points=2, aggregate=history.AGGREGATE_MEAN) == {
+        "sensor.power": ["3", "7.5"],
+        "binary_sensor.door": ["off", "on"],
+    }
+    assert _states(max_points=2, aggregate=history.AGGREGATE_MIN) == {
+        "sensor.power": ["1", "6"],
+        "binary_sensor.door": ["off", "on"],
+    }
+    assert _states(max_points=2, aggregate=history.AGGREGATE_MAX) == {
+        "sensor.power": ["5", "9"],
+        "binary_sensor.door": ["off", "on"],
+    }
+
+    hist = history.get_significant_states(
+        hass,
+        start,
+        end,
+        entity_ids=["sensor.power"],
+        include_start_time_state=False,
+        significant_changes_only=False,
+        bucket_size=timedelta(minutes=5),
+        aggregate=history.AGGREGATE_MEAN,
+    )
+    state = hist["sensor.power"][0]
+    assert state.attributes == {"unit_of_measurement": "W"}
+    assert state.last_updated == start + timedelta(minutes=4, seconds=30)
+
+
 def record_states(hass):
     """Record some test states.
 
@@ -25,12 +25,18 @@ from homeassistant.components.recorder import (
     run_information_with_session,
 )
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import (
     EVENT_HOMEASSISTANT_FINAL_WRITE,
     EVENT_HOMEASSISTANT_STARTED,
     EVENT_HOMEASSISTANT_STOP,
+    EVENT_STATE_CHANGED,
     MATCH_ALL,
     STATE_LOCKED,
     STATE_UNLOCKED,
@@ -62,6 +68,8 @@ def _default_recorder(hass):
         auto_purge=True,
         keep_days=7,
         commit_interval=1,
+        batch_insert=False,
+        backlog_policy="stop",
         uri="sqlite://",
         db_max_retries=10,
         db_retry_wait=3,
@@ -141,6 +149,126 @@ async def test_saving_state(
     assert state == _state_empty_context(hass, entity_id)
 
 
+async def test_saving_state_shares_attributes(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test states with the same attributes share one attributes row."""
+    instance = await async_setup_recorder_instance(hass)
+
+    attributes = {"test_attr": 5, "test_attr_10": "nice"}
+
+    hass.states.async_set("test.one", "on", attributes)
+    hass.states.async_set("test.two", "on", attributes)
+    await async_wait_recording_done(hass, instance)
+    hass.states.async_set("test.one", "off", attributes)
+    hass.states.async_set("test.two", "off", {"test_attr": 10})
+    await async_wait_recording_done(hass, instance)
+
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States))
+        assert len(db_states) == 4
+        assert db_states[0].attributes is None
+        assert (
+            db_states[0].attributes_id
+            == db_states[1].attributes_id
+            == db_states[2].attributes_id
+        )
+        assert db_states[3].attributes_id != db_states[0].attributes_id
+        assert session.query(StateAttributes).count() == 2
+        assert db_states[2].to_native() == _state_empty_context(hass, "test.one")
+        assert db_states[3].to_native() == _state_empty_context(hass, "test.two")
+
+
+async def test_saving_state_batch_insert(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test saving states and events with batched inserts."""
+    instance = await async_setup_recorder_instance(
+        hass, {recorder.CONF_BATCH_INSERT: True}
+    )
+
+    attributes = {"test_attr": 5, "test_attr_10": "nice"}
+
+    hass.states.async_set("test.one", "on", attributes)
+    hass.states.async_set("test.two", "on", attributes)
+    hass.bus.async_fire("test_event", {"some_data": 1})
+    hass.states.async_set("test.one", "off", attributes)
+    await async_wait_recording_done(hass, instance)
+    hass.states.async_set("test.two", "off", {"test_attr": 10})
+    hass.states.async_remove("test.one")
+    await async_wait_recording_done(hass, instance)
+    hass.states.async_set("test.one", "on", attributes)
+    await async_wait_recording_done(hass, instance)
+
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States).order_by(States.state_id))
+        assert [(db_state.entity_id, db_state.state) for db_state in db_states] == [
+            ("test.one", "on"),
+            ("test.two", "on"),
+            ("test.one", "off"),
+            ("test.two", "off"),
+            ("test.one", None),
+            ("test.one", "on"),
+        ]
+        assert db_states[0].old_state_id is None
+        assert db_states[2].old_state_id == db_states[0].state_id
+        assert db_states[3].old_state_id == db_states[1].state_id
+        assert db_states[4].old_state_id == db_states[2].state_id
+        assert db_states[5].old_state_id is None
+        assert all(db_state.event_id for db_state in db_states)
+        assert db_states[0].attributes_id == db_states[2].attributes_id
+        assert db_states[3].attributes_id != db_states[0].attributes_id
+        assert session.query(StateAttributes).count() == 3
+        assert db_states[3].to_native() == _state_empty_context(hass, "test.two")
+        assert db_states[5].to_native() == _state_empty_context(hass, "test.one")
+
+        events = list(session.query(Events).filter_by(event_type="test_event"))
+        assert len(events) == 1
+        assert events[0].to_native().data == {"some_data": 1}
+
+        db_events = [
+            db_event
+            for db_event in session.query(Events).order_by(Events.event_id)
+            if db_event.event_type in (EVENT_STATE_CHANGED, "test_event")
+        ]
+        assert [db_event.event_type for db_event in db_events[:4]] == [
+            EVENT_STATE_CHANGED,
+            EVENT_STATE_CHANGED,
+            "test_event",
+            EVENT_STATE_CHANGED,
+        ]
+        time_fired = [db_event.time_fired for db_event in db_events]
+        assert time_fired == sorted(time_fired)
+
+
+async def test_saving_state_spilled_to_backlog(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test states that overflow the queue are spilled and replayed."""
+    instance = await async_setup_recorder_instance(
+        hass, {recorder.CONF_BACKLOG_POLICY: "spill"}
+    )
+
+    with patch.object(recorder, "MAX_QUEUE_BACKLOG", 0), patch.object(
+        recorder, "REPLAY_COMMIT_EVENTS", 2
+    ):
+        hass.states.async_set("test.one", "on", {"test_attr": 5})
+        hass.states.async_set("test.one", "off", {"test_attr": 5})
+        hass.states.async_set("test.two", "on")
+        await async_wait_recording_done(hass, instance)
+
+    assert instance.queue_depth == 0
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States).order_by(States.state_id))
+        assert [(db_state.entity_id, db_state.state) for db_state in db_states] == [
+            ("test.one", "on"),
+            ("test.one", "off"),
+            ("test.two", "on"),
+        ]
+        assert db_states[1].old_state_id == db_states[0].state_id
+        assert db_states[1].to_native() == _state_empty_context(hass, "test.one")
+
+
 async def test_saving_many_states(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
@@ -694,43 +822,45 @@ def test_auto_statistics(hass_recorder):
     tz = dt_util.get_time_zone("Europe/Copenhagen")
     dt_util.set_default_time_zone(tz)
 
-    # Statistics is scheduled to happen at *:12am every hour. Exercise this behavior by
+    # Statistics is scheduled to happen every 5 minutes. Exercise this behavior by
     # firing time changed events and advancing the clock around this time. Pick an
     # arbitrary year in the future to avoid boundary conditions relative to the current
     # date.
     #
-    # The clock is started at 4:15am then advanced forward below
+    # The clock is started at 4:51am then advanced forward below
     now = dt_util.utcnow()
-    test_time = datetime(now.year + 2, 1, 1, 4, 15, 0, tzinfo=tz)
+    test_time = datetime(now.year + 2, 1, 1, 4, 51, 0, tzinfo=tz)
     run_tasks_at_time(hass, test_time)
 
     with patch(
         "homeassistant.components.recorder.statistics.compile_statistics",
         return_value=True,
-    ) as compile_statistics:
-        # Advance one hour, and the statistics task should run
-        test_time = test_time + timedelta(hours=1)
-        run_tasks_at_time(hass, test_time)
-        assert len(compile_statistics.mock_calls) == 1
-
-        compile_statistics.reset_mock()
-
-        # Advance one hour, and the statistics task should run again
-        test_time = test_time + timedelta(hours=1)
+    ) as compile_statistics, patch(
+        "homeassistant.components.recorder.statistics.compile_hourly_statistics",
+        return_value=True,
+    ) as compile_hourly_statistics:
+        # Advance 5 minutes, and the statistics task should run
+        test_time = test_time + timedelta(minutes=5)
         run_tasks_at_time(hass, test_time)
         assert len(compile_statistics.mock_calls) == 1
+        assert len(compile_hourly_statistics.mock_calls) == 0
 
         compile_statistics.reset_mock()
 
-        # Advance less than one full hour. The task should not run.
-        test_time = test_time + timedelta(minutes=50)
+        # Advance less than 5 minutes. The task should not run.
+        test_time = test_time + timedelta(minutes=3)
         run_tasks_at_time(hass, test_time)
         assert len(compile_statistics.mock_calls) == 0
 
-        # Advance to the next hour, and the statistics task should run again
-        test_time = test_time + timedelta(hours=1)
+        # Advance to the next hour, the statistics of the hour
+        # are compiled after the last 5 minutes of it
+        test_time = test_time + timedelta(minutes=2)
         run_tasks_at_time(hass, test_time)
         assert len(compile_statistics.mock_calls) == 1
+        assert len(compile_hourly_statistics.mock_calls) == 1
+        assert compile_hourly_statistics.mock_calls[0][1][1] == datetime(
+            now.year + 2, 1, 1, 4, 0, 0, tzinfo=tz
+        )
 
     dt_util.set_default_time_zone(original_tz)
 
@@ -230,6 +230,38 @@ async def test_events_during_migration_queue_exhausted(hass):
     assert len(db_states) == 2
 
 
+async def test_events_during_migration_queue_exhausted_coalesce(hass):
+    """Test state changes are coalesced when the queue is exhausted during migration."""
+    await async_setup_component(hass, "persistent_notification", {})
+    assert await recorder.async_migration_in_progress(hass) is False
+
+    with patch(
+        "homeassistant.components.recorder.create_engine", new=create_engine_test
+    ), patch.object(recorder, "MAX_QUEUE_BACKLOG", 1):
+        await async_setup_component(
+            hass,
+            "recorder",
+            {"recorder": {"db_url": "sqlite://", "backlog_policy": "coalesce"}},
+        )
+        hass.states.async_set("my.entity", "on", {})
+        hass.states.async_set("my.entity", "off", {})
+        hass.states.async_set("my.other", "on", {})
+        await hass.async_block_till_done()
+        async_fire_time_changed(hass, dt_util.utcnow() + datetime.timedelta(hours=2))
+        await hass.async_block_till_done()
+        async_fire_time_changed(hass, dt_util.utcnow() + datetime.timedelta(hours=4))
+        await hass.async_block_till_done()
+        hass.states.async_set("my.entity", "unavailable", {})
+        await hass.data[DATA_INSTANCE].async_recorder_ready.wait()
+        await async_wait_recording_done_without_instance(hass)
+
+    assert await recorder.async_migration_in_progress(hass) is False
+    db_states = await hass.async_add_executor_job(_get_native_states, hass, "my.entity")
+    assert db_states[-1].state == "unavailable"
+    db_states = await hass.async_add_executor_job(_get_native_states, hass, "my.other")
+    assert len(db_states) == 1
+
+
 async def test_schema_migrate(hass):
     """Test the full schema migration logic.
 
@@ -1,5 +1,7 @@
 """The tests for the Recorder component."""
 from datetime import datetime
+import json
+from unittest.mock import Mock
 
 import pytest
 from sqlalchemy import create_engine
@@ -8,7 +10,9 @@ from sqlalchemy.orm import scoped_session, sessionmaker
 from homeassistant.components.recorder.models import (
     Base,
     Events,
+    LazyState,
     RecorderRuns,
+    StateAttributes,
     States,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
@@ -37,7 +41,31 @@ def test_from_event_to_db_state():
     # We don't restore context unless we need it by joining the
     # events table on the event_id for state_changed events
     state.context = ha.Context(id=None)
-    assert state == States.from_event(event).to_native()
+    db_state = States.from_event(event)
+    assert db_state.attributes is None
+    db_state.state_attributes = StateAttributes.from_event(event)
+    assert state == db_state.to_native()
+
+
+def test_from_event_to_db_state_attributes():
+    """Test converting event to db state attributes."""
+    attrs = {"this_attr": True}
+    state = ha.State("sensor.temperature", "18", attrs)
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "sensor.temperature", "old_state": None, "new_state": state},
+        context=state.context,
+    )
+    db_attrs = StateAttributes.from_event(event)
+    assert db_attrs.to_native() == attrs
+    assert db_attrs.hash == StateAttributes.hash_shared_attrs(db_attrs.shared_attrs)
+
+    other_state = ha.State("sensor.humidity", "50", attrs)
+    other_event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "sensor.humidity", "old_state": None, "new_state": other_state},
+    )
+    assert StateAttributes.from_event(other_event).hash == db_attrs.hash
 
 
 def test_from_event_to_delete_state():
@@ -52,6 +80,7 @@ def test_from_event_to_delete_state():
     )
     db_state = States.from_event(event)
 
+    assert StateAttributes.from_event(event).shared_attrs == "{}"
     assert db_state.entity_id == "sensor.temperature"
     assert db_state.domain == "sensor"
     assert db_state.state == ""
@@ -215,3 +244,19 @@ async def test_event_to_db_model():
     native = Events.from_event(event, event_data="{}").to_native()
     event.data = {}
     assert native == event
+
+
+def test_lazy_state_as_json():
+    """Test a lazy state serializes to JSON."""
+    now = dt_util.utcnow()
+    row = Mock(
+        entity_id="sensor.temperature",
+        state="18",
+        shared_attrs='{"unit_of_measurement": "°C"}',
+        attributes=None,
+        last_changed=now,
+        last_updated=now,
+    )
+    state = LazyState(row)
+    assert json.loads(state.as_json()) == state.as_dict()
+    assert json.loads(state.attributes_json()) == {"unit_of_measurement": "°C"}
@@ -2,7 +2,7 @@
 from datetime import datetime, timedelta
 import json
 import sqlite3
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, Mock, patch
 
 from sqlalchemy.exc import DatabaseError, OperationalError
 from sqlalchemy.orm.session import Session
@@ -10,11 +10,19 @@ from sqlalchemy.orm.session import Session
 from homeassistant.components import recorder
 from homeassistant.components.recorder import PurgeTask
 from homeassistant.components.recorder.const import MAX_ROWS_TO_PURGE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
-from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+    StatisticsMeta,
+    StatisticsShortTerm,
+)
+from homeassistant.components.recorder.purge import PurgeProgress, purge_old_data
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.util import dt as dt_util
 
@@ -26,6 +34,8 @@ from .common import (
 )
 from .conftest import SetupRecorderInstanceT
 
+from tests.common import async_fire_time_changed
+
 
 async def test_purge_old_states(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
@@ -61,6 +71,57 @@ async def test_purge_old_states(
         assert states.count() == 2
 
 
+async def test_purge_old_states_with_shared_attributes(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test deleting old states removes the attributes no state uses anymore."""
+    instance = await async_setup_recorder_instance(hass)
+    await async_wait_recording_done(hass, instance)
+
+    utcnow = dt_util.utcnow()
+    eleven_days_ago = utcnow - timedelta(days=11)
+
+    with recorder.session_scope(hass=hass) as session:
+        only_old = StateAttributes(shared_attrs='{"only": "old"}', hash=1)
+        old_and_new = StateAttributes(shared_attrs='{"old": "new"}', hash=2)
+        session.add_all([only_old, old_and_new])
+        session.flush()
+        for event_id, (timestamp, attributes) in enumerate(
+            [
+                (eleven_days_ago, only_old),
+                (eleven_days_ago, only_old),
+                (eleven_days_ago, old_and_new),
+                (utcnow, old_and_new),
+            ],
+            1000,
+        ):
+            _add_state_and_state_changed_event(
+                session, "sensor.shared", "on", timestamp, event_id
+            )
+            session.flush()
+            session.query(States).filter(States.event_id == event_id).update(
+                {"attributes_id": attributes.attributes_id, "attributes": None}
+            )
+        only_old_id = only_old.attributes_id
+        old_and_new_id = old_and_new.attributes_id
+
+    instance._state_attributes_ids['{"only": "old"}'] = only_old_id
+    instance._state_attributes_ids['{"old": "new"}'] = old_and_new_id
+
+    with session_scope(hass=hass) as session:
+        purge_before = dt_util.utcnow() - timedelta(days=4)
+        finished = purge_old_data(instance, purge_before, repack=False)
+        assert not finished
+
+        assert session.query(States).count() == 1
+        assert [
+            attributes.attributes_id
+            for attributes in session.query(StateAttributes).all()
+        ] == [old_and_new_id]
+
+    assert instance._state_attributes_ids == {'{"old": "new"}': old_and_new_id}
+
+
 async def test_purge_old_states_encouters_database_corruption(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
@@ -154,6 +215,73 @@ async def test_purge_old_states_encounters_operational_error(
     assert "Error executing purge" in caplog.text
 
 
+async def test_purge_yields_and_stores_progress(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: SetupRecorderInstanceT,
+    hass_storage,
+):
+    """Test a purge yields to waiting events and stores its progress."""
+    instance = await async_setup_recorder_instance(hass)
+
+    await _add_test_states(hass, instance)
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    queue = Mock(empty=Mock(return_value=False))
+    with patch.object(instance, "queue", queue), patch(
+        "homeassistant.components.recorder.purge.MAX_ROWS_TO_PURGE", 2
+    ):
+        await hass.async_add_executor_job(
+            instance._run_purge, purge_before, False, False
+        )
+
+    # Only the first chunk is purged as events are waiting
+    queue.put.assert_called_once_with(PurgeTask(purge_before, False, False))
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 4
+
+    progress = instance.purge_progress
+    assert progress.purge_before == purge_before
+    assert progress.purged_rows == 4
+    assert progress.remaining_events == 2
+    assert progress.rows_per_second > 0
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    assert hass_storage["recorder.purge"]["data"] == progress.as_dict()
+
+
+async def test_purge_resumes_stored_progress(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: SetupRecorderInstanceT,
+    hass_storage,
+):
+    """Test a purge interrupted by a restart is resumed."""
+    instance = await async_setup_recorder_instance(hass)
+
+    await _add_test_states(hass, instance)
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    hass_storage["recorder.purge"] = {
+        "version": 1,
+        "key": "recorder.purge",
+        "data": PurgeProgress(
+            purge_before, False, False, purged_rows=10, elapsed=1
+        ).as_dict(),
+    }
+    # The store of the running instance loaded nothing at startup
+    instance._purge_store = Store(hass, 1, "recorder.purge")
+    await instance._async_resume_purge()
+    await async_wait_purge_done(hass, instance)
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 2
+    assert instance.purge_progress is None
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    assert hass_storage["recorder.purge"]["data"] == {}
+
+
 async def test_purge_old_events(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
@@ -179,6 +307,45 @@ async def test_purge_old_events(
         assert events.count() == 2
 
 
+async def test_purge_old_short_term_statistics(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test deleting old short term statistics."""
+    instance = await async_setup_recorder_instance(hass)
+    await async_wait_recording_done(hass, instance)
+
+    utcnow = dt_util.utcnow()
+    with recorder.session_scope(hass=hass) as session:
+        metadata = StatisticsMeta.from_meta(
+            "recorder", "sensor.test", "kWh", False, True
+        )
+        session.add(metadata)
+        session.flush()
+        for days in range(6):
+            session.add(
+                StatisticsShortTerm.from_stats(
+                    metadata.id,
+                    utcnow - timedelta(days=days, minutes=5),
+                    {"state": days, "sum": days},
+                )
+            )
+
+    with session_scope(hass=hass) as session:
+        statistics = session.query(StatisticsShortTerm)
+        assert statistics.count() == 6
+
+        purge_before = utcnow - timedelta(days=4)
+
+        # run purge_old_data()
+        finished = purge_old_data(instance, purge_before, repack=False)
+        assert not finished
+        assert statistics.count() == 4
+
+        finished = purge_old_data(instance, purge_before, repack=False)
+        assert finished
+        assert statistics.count() == 4
+
+
 async def test_purge_old_recorder_runs(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
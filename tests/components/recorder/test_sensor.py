@@ -0,0 +1,57 @@
+"""The tests for the recorder queue and purge sensors."""
+from unittest.mock import Mock, patch
+
+from homeassistant.components import recorder
+from homeassistant.components.recorder.purge import PurgeProgress
+from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
+
+from tests.common import async_init_recorder_component
+
+
+async def test_recorder_queue_sensors(hass):
+    """Test the queue depth and lag sensors."""
+    await async_init_recorder_component(hass)
+    await async_setup_component(hass, "sensor", {"sensor": {"platform": "recorder"}})
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.recorder_queue_depth")
+    assert state.attributes["unit_of_measurement"] == "events"
+    state = hass.states.get("sensor.recorder_lag")
+    assert state.state == "0"
+    assert state.attributes["unit_of_measurement"] == "s"
+
+    instance = hass.data[recorder.DATA_INSTANCE]
+    with patch.object(instance, "queue", Mock(qsize=Mock(return_value=5))):
+        await hass.helpers.entity_component.async_update_entity(
+            "sensor.recorder_queue_depth"
+        )
+    assert hass.states.get("sensor.recorder_queue_depth").state == "5"
+
+
+async def test_recorder_purge_backlog_sensor(hass):
+    """Test the purge backlog sensor."""
+    await async_init_recorder_component(hass)
+    await async_setup_component(hass, "sensor", {"sensor": {"platform": "recorder"}})
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.recorder_purge_backlog")
+    assert state.state == "0"
+    assert state.attributes["unit_of_measurement"] == "events"
+    assert state.attributes["rows_per_second"] == 0
+
+    instance = hass.data[recorder.DATA_INSTANCE]
+    instance.purge_progress = PurgeProgress(
+        dt_util.utcnow(),
+        False,
+        False,
+        purged_rows=1000,
+        elapsed=4,
+        remaining_events=5000,
+    )
+    await hass.helpers.entity_component.async_update_entity(
+        "sensor.recorder_purge_backlog"
+    )
+    state = hass.states.get("sensor.recorder_purge_backlog")
+    assert state.state == "5000"
+    assert state.attributes["rows_per_second"] == 250
@@ -1,17 +1,27 @@
 """The tests for sensor recorder platform."""
 # pylint: disable=protected-access,invalid-name
-from datetime import timedelta
+from datetime import datetime, timedelta
 from unittest.mock import patch, sentinel
 
 from pytest import approx
 
 from homeassistant.components.recorder import history
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import process_timestamp_to_utc_isoformat
+from homeassistant.components.recorder.models import (
+    StatisticsDaily,
+    StatisticsMeta,
+    StatisticsMonthly,
+    StatisticsShortTerm,
+    process_timestamp_to_utc_isoformat,
+)
 from homeassistant.components.recorder.statistics import (
+    compile_hourly_statistics,
+    get_last_short_term_statistics,
     get_last_statistics,
+    rebuild_rollups,
     statistics_during_period,
 )
+from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import TEMP_CELSIUS
 from homeassistant.setup import setup_component
 import homeassistant.util.dt as dt_util
@@ -40,7 +50,7 @@ def test_compile_hourly_statistics(hass_recorder):
     expected_1 = {
         "statistic_id": "sensor.test1",
         "start": process_timestamp_to_utc_isoformat(zero),
-        "mean": approx(14.915254237288135),
+        "mean": approx(14.833333333333334),
         "min": approx(10.0),
         "max": approx(20.0),
         "last_reset": None,
@@ -93,6 +103,137 @@ def test_compile_hourly_statistics(hass_recorder):
     assert stats == {}
 
 
+def test_compile_short_term_statistics(hass_recorder):
+    """Test compiling 5 minute statistics and the hourly ones from them."""
+    hass = hass_recorder()
+    recorder = hass.data[DATA_INSTANCE]
+    setup_component(hass, "sensor", {})
+    zero, four, states = record_states(hass)
+
+    recorder.do_adhoc_statistics(period="5minute", start=zero + timedelta(minutes=15))
+    wait_recording_done(hass)
+    expected = {
+        "statistic_id": "sensor.test1",
+        "start": process_timestamp_to_utc_isoformat(zero + timedelta(minutes=15)),
+        "mean": approx(14.0),
+        "min": approx(10.0),
+        "max": approx(15.0),
+        "last_reset": None,
+        "state": None,
+        "sum": None,
+    }
+    stats = statistics_during_period(
+        hass, zero, statistic_ids=["sensor.test1"], period="5minute"
+    )
+    assert stats == {"sensor.test1": [expected]}
+    assert get_last_short_term_statistics(hass, 1, "sensor.test1") == {
+        "sensor.test1": [expected]
+    }
+    assert statistics_during_period(hass, zero, statistic_ids=["sensor.test1"]) == {}
+
+    with session_scope(hass=hass) as session:
+        session.query(StatisticsShortTerm).delete()
+    recorder.do_adhoc_statistics(period="hourly", start=zero)
+    wait_recording_done(hass)
+    stats = statistics_during_period(
+        hass, zero, statistic_ids=["sensor.test1"], period="5minute"
+    )
+    assert len(stats["sensor.test1"]) == 12
+    stats = statistics_during_period(hass, zero, statistic_ids=["sensor.test1"])
+    assert stats == {
+        "sensor.test1": [
+            {
+                **expected,
+                "start": process_timestamp_to_utc_isoformat(zero),
+                "mean": approx(14.833333333333334),
+                "max": approx(20.0),
+            }
+        ]
+    }
+
+
+def test_compile_daily_weekly_monthly_statistics(hass_recorder):
+    """Test the hourly statistics are rolled up to days, weeks and months."""
+    hass = hass_recorder()
+    recorder = hass.data[DATA_INSTANCE]
+    time_zone = dt_util.get_time_zone("US/Pacific")
+    orig_time_zone = dt_util.DEFAULT_TIME_ZONE
+    dt_util.set_default_time_zone(time_zone)
+
+    def local(*args):
+        return dt_util.as_utc(datetime(*args, tzinfo=time_zone))
+
+    hours = [
+        (local(2021, 9, 30, 10), 10, 5, 15, 1),
+        (local(2021, 9, 30, 22), 20, 10, 30, 2),
+        (local(2021, 10, 1, 1), 30, 20, 40, 3),
+        (local(2021, 10, 4, 9), 40, 35, 45, 4),
+    ]
+    try:
+        with session_scope(hass=hass) as session:
+            session.add(
+                StatisticsMeta.from_meta(
+                    "recorder", "sensor.test1", "kWh", has_mean=True, has_sum=True
+                )
+            )
+            session.flush()
+            metadata_id = session.query(StatisticsMeta.id).scalar()
+            for start, _mean, _min, _max, _sum in hours:
+                session.add(
+                    StatisticsShortTerm.from_stats(
+                        metadata_id,
+                        start,
+                        {"mean": _mean, "min": _min, "max": _max, "sum": _sum},
+                    )
+                )
+        for start, *_ in hours:
+            assert compile_hourly_statistics(recorder, start)
+
+        def expected(start, _mean, _min, _max, _sum):
+            return {
+                "statistic_id": "sensor.test1",
+                "start": start.isoformat(),
+                "mean": approx(_mean),
+                "min": approx(_min),
+                "max": approx(_max),
+                "last_reset": None,
+                "state": None,
+                "sum": approx(_sum),
+            }
+
+        start = local(2021, 9, 1)
+        expected_daily = [
+            expected(local(2021, 9, 30), 15, 5, 30, 2),
+            expected(local(2021, 10, 1), 30, 20, 40, 3),
+            expected(local(2021, 10, 4), 40, 35, 45, 4),
+        ]
+        expected_weekly = [
+            expected(local(2021, 9, 27), 22.5, 5, 40, 3),
+            expected(local(2021, 10, 4), 40, 35, 45, 4),
+        ]
+        expected_monthly = [
+            expected(local(2021, 9, 1), 15, 5, 30, 2),
+            expected(local(2021, 10, 1), 35, 20, 45, 4),
+        ]
+        for period, expected_stats in (
+            ("day", expected_daily),
+            ("week", expected_weekly),
+            ("month", expected_monthly),
+        ):
+            stats = statistics_during_period(hass, start, period=period)
+            assert stats == {"sensor.test1": expected_stats}
+
+        # The rollups are rebuilt from the hourly statistics
+        with session_scope(hass=hass) as session:
+            session.query(StatisticsDaily).delete()
+            session.query(StatisticsMonthly).delete()
+            rebuild_rollups(session)
+        stats = statistics_during_period(hass, start, period="month")
+        assert stats == {"sensor.test1": expected_monthly}
+    finally:
+        dt_util.set_default_time_zone(orig_time_zone)
+
+
 def record_states(hass):
     """Record some test states.
 
@@ -8,11 +8,16 @@ from pytest import approx
 
 from homeassistant.components.recorder import history
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import process_timestamp_to_utc_isoformat
+from homeassistant.components.recorder.models import (
+    Statistics,
+    StatisticsMeta,
+    process_timestamp_to_utc_isoformat,
+)
 from homeassistant.components.recorder.statistics import (
     list_statistic_ids,
     statistics_during_period,
 )
+from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import STATE_UNAVAILABLE
 from homeassistant.setup import setup_component
 import homeassistant.util.dt as dt_util
@@ -44,17 +49,17 @@ TEMPERATURE_SENSOR_ATTRIBUTES = {
 @pytest.mark.parametrize(
     "device_class,unit,native_unit,mean,min,max",
     [
-        ("battery", "%", "%", 16.440677, 10, 30),
-        ("battery", None, None, 16.440677, 10, 30),
-        ("humidity", "%", "%", 16.440677, 10, 30),
-        ("humidity", None, None, 16.440677, 10, 30),
-        ("pressure", "Pa", "Pa", 16.440677, 10, 30),
-        ("pressure", "hPa", "Pa", 1644.0677, 1000, 3000),
-        ("pressure", "mbar", "Pa", 1644.0677, 1000, 3000),
-        ("pressure", "inHg", "Pa", 55674.53, 33863.89, 101591.67),
-        ("pressure", "psi", "Pa", 113354.48, 68947.57, 206842.71),
-        ("temperature", "°C", "°C", 16.440677, 10, 30),
-        ("temperature", "°F", "°C", -8.644068, -12.22222, -1.111111),
+        ("battery", "%", "%", 16.333333, 10, 30),
+        ("battery", None, None, 16.333333, 10, 30),
+        ("humidity", "%", "%", 16.333333, 10, 30),
+        ("humidity", None, None, 16.333333, 10, 30),
+        ("pressure", "Pa", "Pa", 16.333333, 10, 30),
+        ("pressure", "hPa", "Pa", 1633.3333, 1000, 3000),
+        ("pressure", "mbar", "Pa", 1633.3333, 1000, 3000),
+        ("pressure", "inHg", "Pa", 55311.02, 33863.89, 101591.67),
+        ("pressure", "psi", "Pa", 112614.36, 68947.57, 206842.71),
+        ("temperature", "°C", "°C", 16.333333, 10, 30),
+        ("temperature", "°F", "°C", -8.703704, -12.22222, -1.111111),
     ],
 )
 def test_compile_hourly_statistics(
@@ -142,7 +147,7 @@ def test_compile_hourly_statistics_unsupported(hass_recorder, caplog, attributes
             {
                 "statistic_id": "sensor.test1",
                 "start": process_timestamp_to_utc_isoformat(zero),
-                "mean": approx(16.440677966101696),
+                "mean": approx(16.333333333333332),
                 "min": approx(10.0),
                 "max": approx(30.0),
                 "last_reset": None,
@@ -235,6 +240,54 @@ def test_compile_hourly_energy_statistics(
     assert "Error while processing event StatisticsTask" not in caplog.text
 
 
+def test_compile_hourly_energy_statistics_after_migration(hass_recorder, caplog):
+    """Test the sum continues from the hourly statistics without short term ones."""
+    zero = dt_util.utcnow()
+    hass = hass_recorder()
+    recorder = hass.data[DATA_INSTANCE]
+    setup_component(hass, "sensor", {})
+    attributes = {
+        "device_class": "energy",
+        "state_class": "measurement",
+        "unit_of_measurement": "kWh",
+        "last_reset": None,
+    }
+    seq = [10, 15, 20, 10, 30, 40, 50, 60, 70]
+    record_energy_states(hass, zero, "sensor.test1", attributes, seq)
+
+    # Hourly statistics compiled before short term statistics were added
+    with session_scope(hass=hass) as session:
+        metadata = StatisticsMeta.from_meta(
+            "sensor", "sensor.test1", "kWh", False, True
+        )
+        session.add(metadata)
+        session.flush()
+        session.add(
+            Statistics.from_stats(
+                metadata.id,
+                zero - timedelta(hours=1),
+                {"last_reset": zero, "state": seq[0], "sum": 100.0},
+            )
+        )
+
+    recorder.do_adhoc_statistics(period="hourly", start=zero)
+    wait_recording_done(hass)
+    stats = statistics_during_period(hass, zero)
+    assert stats["sensor.test1"] == [
+        {
+            "statistic_id": "sensor.test1",
+            "start": process_timestamp_to_utc_isoformat(zero),
+            "max": None,
+            "mean": None,
+            "min": None,
+            "last_reset": process_timestamp_to_utc_isoformat(zero),
+            "state": approx(seq[2]),
+            "sum": approx(110.0),
+        }
+    ]
+    assert "Error while processing event StatisticsTask" not in caplog.text
+
+
 def test_compile_hourly_energy_statistics_unsupported(hass_recorder, caplog):
     """Test compiling hourly statistics."""
     zero = dt_util.utcnow()
@@ -542,7 +595,7 @@ def test_compile_hourly_statistics_partially_unavailable(hass_recorder, caplog):
             {
                 "statistic_id": "sensor.test1",
                 "start": process_timestamp_to_utc_isoformat(zero),
-                "mean": approx(21.1864406779661),
+                "mean": approx(20.2),
                 "min": approx(10.0),
                 "max": approx(25.0),
                 "last_reset": None,
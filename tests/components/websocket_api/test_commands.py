@@ -18,10 +18,17 @@ from homeassistant.core import Context, HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import entity
 from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.template import Template
 from homeassistant.loader import async_get_integration
 from homeassistant.setup import DATA_SETUP_TIME, async_setup_component
+import homeassistant.util.dt as dt_util
 
-from tests.common import MockEntity, MockEntityPlatform, async_mock_service
+from tests.common import (
+    MockEntity,
+    MockEntityPlatform,
+    async_fire_time_changed,
+    async_mock_service,
+)
 
 
 async def test_call_service(hass, websocket_client):
@@ -393,6 +400,104 @@ async def test_subscribe_unsubscribe_events(hass, websocket_client):
     assert sum(hass.bus.async_listeners().values()) == init_count
 
 
+async def test_subscribe_entities(hass, websocket_client):
+    """Test subscribe_entities sends compact states and then their changes."""
+    hass.states.async_set("light.permitted", "off", {"color": "red"})
+    original_state = hass.states.get("light.permitted")
+
+    await websocket_client.send_json({"id": 7, "type": "subscribe_entities"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {
+        "a": {
+            "light.permitted": {
+                "a": {"color": "red"},
+                "c": original_state.context.id,
+                "lc": original_state.last_changed.timestamp(),
+                "s": "off",
+            }
+        }
+    }
+
+    hass.states.async_set("light.permitted", "on", {"brightness": 100})
+    state = hass.states.get("light.permitted")
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {
+        "c": {
+            "light.permitted": {
+                "+": {
+                    "a": {"brightness": 100},
+                    "c": state.context.id,
+                    "lc": state.last_changed.timestamp(),
+                    "s": "on",
+                },
+                "-": {"a": ["color"]},
+            }
+        }
+    }
+
+    hass.states.async_remove("light.permitted")
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {"r": ["light.permitted"]}
+
+
+async def test_subscribe_entities_with_entity_ids(
+    hass, websocket_client, hass_admin_user
+):
+    """Test subscribe_entities only sends the requested permitted entities."""
+    hass_admin_user.groups = []
+    hass_admin_user.mock_policy(
+        {"entities": {"entity_ids": {"light.permitted": True, "light.other": True}}}
+    )
+    hass.states.async_set("light.permitted", "off")
+    hass.states.async_set("light.other", "off")
+    hass.states.async_set("light.not_permitted", "off")
+
+    await websocket_client.send_json(
+        {
+            "id": 7,
+            "type": "subscribe_entities",
+            "entity_ids": ["light.permitted", "light.not_permitted"],
+        }
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert list(msg["event"]["a"]) == ["light.permitted"]
+
+    hass.states.async_set("light.other", "on")
+    hass.states.async_set("light.not_permitted", "on")
+    hass.states.async_set("light.permitted", "off", {"color": "blue"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "c": {
+            "light.permitted": {
+                "+": {
+                    "a": {"color": "blue"},
+                    "c": hass.states.get("light.permitted").context.id,
+                    "lu": hass.states.get("light.permitted").last_updated.timestamp(),
+                }
+            }
+        }
+    }
+
+
 async def test_get_states(hass, websocket_client):
     """Test get_states command."""
     hass.states.async_set("greeting.hello", "world")
@@ -450,6 +555,109 @@ async def test_get_config(hass, websocket_client):
     assert msg["result"] == hass.config.as_dict()
 
 
+async def test_event_stats(hass, websocket_client):
+    """Test event/stats command."""
+    hass.bus.async_listen("event_with_listener", lambda event: None)
+    hass.bus.async_fire("event_with_listener")
+    hass.bus.async_fire("event_without_listener")
+    await hass.async_block_till_done()
+
+    await websocket_client.send_json({"id": 5, "type": "event/stats"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+    assert msg["result"]["event_with_listener"] == {
+        "fired": 1,
+        "dispatched": 1,
+        "skipped": 0,
+        "coalesced": 0,
+    }
+    assert msg["result"]["event_without_listener"] == {
+        "fired": 1,
+        "dispatched": 0,
+        "skipped": 1,
+        "coalesced": 0,
+    }
+
+
+async def test_event_stats_requires_admin(hass, websocket_client, hass_admin_user):
+    """Test event/stats command requires an admin."""
+    hass_admin_user.groups = []
+
+    await websocket_client.send_json({"id": 5, "type": "event/stats"})
+
+    msg = await websocket_client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_UNAUTHORIZED
+
+
+async def test_polling_stats(hass, websocket_client):
+    """Test polling/stats command."""
+    platform = MockEntityPlatform(hass)
+    await platform.async_add_entities([MockEntity(should_poll=True)])
+    async_fire_time_changed(hass, dt_util.utcnow() + platform.scan_interval)
+    await hass.async_block_till_done()
+
+    await websocket_client.send_json({"id": 5, "type": "polling/stats"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+    assert msg["result"]["test_domain.test_platform"]["polls"] == 1
+    assert msg["result"]["test_domain.test_platform"]["overruns"] == 0
+
+
+async def test_template_cache_stats(hass, websocket_client):
+    """Test template/cache_stats command reports the renders of subscriptions."""
+    hass.states.async_set("light.kitchen", "on")
+
+    for iden in (5, 6):
+        await websocket_client.send_json(
+            {
+                "id": iden,
+                "type": "render_template",
+                "template": "{{ states('light.kitchen') }}",
+            }
+        )
+        msg = await websocket_client.receive_json()
+        assert msg["success"]
+        msg = await websocket_client.receive_json()
+        assert msg["event"]["result"] == "on"
+
+    await websocket_client.send_json({"id": 7, "type": "template/cache_stats"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+    # Each subscription renders when it is set up and when it is refreshed
+    assert msg["result"]["misses"] == 1
+    assert msg["result"]["hits"] == 3
+    assert msg["result"]["size"] == 1
+
+
+async def test_profiling_timings(hass, websocket_client):
+    """Test profiling/timings command reports template render times."""
+    hass.states.async_set("light.kitchen", "on")
+
+    for _ in range(3):
+        Template("{{ states('light.kitchen') }}", hass).async_render()
+
+    await websocket_client.send_json({"id": 5, "type": "profiling/timings"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+    timings = msg["result"]["template"]["{{ states('light.kitchen') }}"]
+    assert timings["count"] == 3
+    assert timings["p99"] <= timings["total"]
+    assert msg["result"]["script_step"] == {}
+
+
 async def test_ping(websocket_client):
     """Test get_panels command."""
     await websocket_client.send_json({"id": 5, "type": "ping"})
@@ -526,15 +734,15 @@ async def test_states_filters_visible(hass, hass_admin_user, websocket_client):
     assert msg["result"][0]["entity_id"] == "test.entity"
 
 
-async def test_get_states_not_allows_nan(hass, websocket_client):
-    """Test get_states command not allows NaN floats."""
+async def test_get_states_nan_as_null(hass, websocket_client):
+    """Test get_states command sends NaN floats as null."""
     hass.states.async_set("greeting.hello", "world", {"hello": float("NaN")})
 
     await websocket_client.send_json({"id": 5, "type": "get_states"})
 
     msg = await websocket_client.receive_json()
-    assert not msg["success"]
-    assert msg["error"]["code"] == const.ERR_UNKNOWN_ERROR
+    assert msg["success"]
+    assert msg["result"][0]["attributes"] == {"hello": None}
 
 
 async def test_subscribe_unsubscribe_events_whitelist(
@@ -600,6 +808,107 @@ async def test_subscribe_unsubscribe_events_state_changed(
     assert msg["event"]["data"]["entity_id"] == "light.permitted"
 
 
+async def test_subscribe_events_state_changed_filtered(hass, websocket_client):
+    """Test subscribe state_changed events with entity filters."""
+    await websocket_client.send_json(
+        {
+            "id": 7,
+            "type": "subscribe_events",
+            "event_type": "state_changed",
+            "entity_ids": ["light.kitchen", "switch.fan"],
+            "domains": [" Light "],
+            "entity_globs": ["sensor.*_temperature", "light.*"],
+        }
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["success"]
+
+    for entity_id in (
+        "light.kitchen",
+        "light.living_room",
+        "switch.fan",
+        "switch.heater",
+        "sensor.outside_temperature",
+        "sensor.outside_humidity",
+    ):
+        hass.states.async_set(entity_id, "on")
+    hass.states.async_set("light.kitchen", "off")
+
+    entity_ids = []
+    for _ in range(5):
+        msg = await websocket_client.receive_json()
+        assert msg["id"] == 7
+        entity_ids.append(msg["event"]["data"]["entity_id"])
+
+    # Every change once, also when matched by several filters
+    assert entity_ids == [
+        "light.kitchen",
+        "light.living_room",
+        "switch.fan",
+        "sensor.outside_temperature",
+        "light.kitchen",
+    ]
+
+
+async def test_subscribe_events_invalid_domain(hass, websocket_client):
+    """Test domains that are not slugs are rejected."""
+    await websocket_client.send_json(
+        {
+            "id": 7,
+            "type": "subscribe_events",
+            "event_type": "state_changed",
+            "domains": ["light.kitchen"],
+        }
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_INVALID_FORMAT
+
+
+async def test_subscribe_events_filter_requires_state_changed(hass, websocket_client):
+    """Test entity filters are only supported for state_changed events."""
+    await websocket_client.send_json(
+        {
+            "id": 7,
+            "type": "subscribe_events",
+            "event_type": "call_service",
+            "entity_ids": ["light.kitchen"],
+        }
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_INVALID_FORMAT
+
+
+async def test_subscribe_events_state_changed_permissions_change(
+    hass, websocket_client, hass_admin_user
+):
+    """Test changed permissions apply to existing state_changed subscriptions."""
+    await websocket_client.send_json(
+        {"id": 7, "type": "subscribe_events", "event_type": "state_changed"}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    hass.states.async_set("light.not_permitted", "on")
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["data"]["entity_id"] == "light.not_permitted"
+
+    hass_admin_user.groups = []
+    hass_admin_user.mock_policy({"entities": {"entity_ids": {"light.permitted": True}}})
+
+    hass.states.async_set("light.not_permitted", "off")
+    hass.states.async_set("light.permitted", "on")
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["data"]["entity_id"] == "light.permitted"
+
+
 async def test_render_template_renders_template(hass, websocket_client):
     """Test simple template is rendered and updated."""
     hass.states.async_set("light.test", "on")
@@ -6,6 +6,8 @@ from aiohttp import WSMsgType
 import pytest
 
 from homeassistant.components.websocket_api import const, http
+from homeassistant.components.websocket_api.auth import TYPE_AUTH
+from homeassistant.setup import async_setup_component
 from homeassistant.util.dt import utcnow
 
 from tests.common import async_fire_time_changed
@@ -80,3 +82,72 @@ async def test_non_json_message(hass, websocket_client, caplog):
         f"Unable to serialize to JSON. Bad data found at $.result[0](State: test_domain.entity).attributes.bad={bad_data}(<class 'object'>"
         in caplog.text
     )
+
+
+async def test_coalesce_messages(hass, websocket_client):
+    """Test queued messages are sent in one frame once the client supports it."""
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "supported_features",
+            "features": {const.FEATURE_COALESCE_MESSAGES: 1},
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["success"]
+
+    await websocket_client.send_json(
+        {"id": 6, "type": "subscribe_events", "event_type": "test_event"}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 6
+    assert msg["success"]
+
+    for idx in range(3):
+        hass.bus.async_fire("test_event", {"idx": idx})
+
+    messages = await websocket_client.receive_json()
+    assert [msg["event"]["data"]["idx"] for msg in messages] == [0, 1, 2]
+    assert all(msg["id"] == 6 for msg in messages)
+
+    # Messages that do not fit are sent in the next frame
+    with patch("homeassistant.components.websocket_api.http.MAX_COALESCED_BYTES", 1800):
+        for idx in range(3):
+            hass.bus.async_fire("test_event", {"idx": idx, "padding": "x" * 500})
+
+        messages = await websocket_client.receive_json()
+        assert [msg["event"]["data"]["idx"] for msg in messages] == [0, 1]
+        msg = await websocket_client.receive_json()
+        assert msg["event"]["data"]["idx"] == 2
+
+
+async def test_compression(hass, aiohttp_client, hass_access_token):
+    """Test large messages are compressed and the bytes sent are counted."""
+    assert await async_setup_component(
+        hass,
+        "websocket_api",
+        {"websocket_api": {"compression": {"min_size": 1000, "level": 9}}},
+    )
+    await hass.async_block_till_done()
+    hass.states.async_set("light.kitchen", "on", {"effect_list": ["colorloop"] * 500})
+
+    client = await aiohttp_client(hass.http.app)
+    websocket_client = await client.ws_connect(const.URL, compress=15)
+    await websocket_client.receive_json()
+    await websocket_client.send_json(
+        {"type": TYPE_AUTH, "access_token": hass_access_token}
+    )
+    await websocket_client.receive_json()
+
+    bytes_sent = hass.data[const.DATA_BYTES_SENT]
+    # Small messages are sent as they are, with a frame header
+    assert 0 < bytes_sent.raw < bytes_sent.wire
+
+    await websocket_client.send_json({"id": 5, "type": "get_states"})
+    msg = await websocket_client.receive_json()
+    assert msg["result"][0]["attributes"]["effect_list"] == ["colorloop"] * 500
+    assert bytes_sent.raw > 6000
+    assert bytes_sent.wire < 1000
+
+    await websocket_client.close()
@@ -3,7 +3,10 @@
 from homeassistant.components.websocket_api.messages import (
     _cached_event_message as lru_event_cache,
     cached_event_message,
+    event_message,
     message_to_json,
+    result_message,
+    states_result_message,
 )
 from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.core import callback
@@ -78,18 +81,88 @@ async def test_cached_event_message_with_different_idens(hass):
     assert cache_info.currsize == 1
 
 
+async def test_cached_state_changed_event_message(hass):
+    """Test state changed event messages use the cached JSON of the states."""
+
+    events = []
+
+    @callback
+    def _event_listener(event):
+        events.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _event_listener)
+
+    hass.states.async_set("light.window", "on", {"brightness": 100})
+    hass.states.async_set("light.window", "off", {"brightness": 100})
+    hass.states.async_remove("light.window")
+    await hass.async_block_till_done()
+
+    assert len(events) == 3
+    lru_event_cache.cache_clear()
+
+    for event in events:
+        assert cached_event_message(2, event) == message_to_json(
+            event_message(2, event)
+        )
+    new_state = events[1].data["new_state"]
+    assert new_state.as_json() in cached_event_message(2, events[1])
+
+
+async def test_cached_state_changed_event_message_bad_data(hass, caplog):
+    """Test state changed events with attributes that can not be serialized."""
+
+    events = []
+
+    @callback
+    def _event_listener(event):
+        events.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _event_listener)
+
+    hass.states.async_set("light.window", "on", {"bad": _Unserializeable()})
+    await hass.async_block_till_done()
+
+    lru_event_cache.cache_clear()
+
+    assert cached_event_message(2, events[0]) == (
+        '{"id":2,"type":"result","success":false,"error":{"code":"unknown_error",'
+        '"message":"Invalid JSON in response"}}'
+    )
+    assert "Unable to serialize to JSON" in caplog.text
+
+
+async def test_states_result_message(hass, caplog):
+    """Test result messages of states use the cached JSON of the states."""
+
+    hass.states.async_set("light.window", "on", {"brightness": 100})
+    hass.states.async_set("light.door", "off")
+    states = hass.states.async_all()
+
+    assert states_result_message(1, states) == message_to_json(
+        result_message(1, states)
+    )
+    assert states_result_message(1, []) == message_to_json(result_message(1, []))
+
+    hass.states.async_set("light.bad", "on", {"bad": _Unserializeable()})
+    assert states_result_message(1, hass.states.async_all()) == (
+        '{"id":1,"type":"result","success":false,"error":{"code":"unknown_error",'
+        '"message":"Invalid JSON in response"}}'
+    )
+    assert "Unable to serialize to JSON" in caplog.text
+
+
 async def test_message_to_json(caplog):
     """Test we can serialize websocket messages."""
 
     json_str = message_to_json({"id": 1, "message": "xyz"})
 
-    assert json_str == '{"id": 1, "message": "xyz"}'
+    assert json_str == '{"id":1,"message":"xyz"}'
 
     json_str2 = message_to_json({"id": 1, "message": _Unserializeable()})
 
     assert (
         json_str2
-        == '{"id": 1, "type": "result", "success": false, "error": {"code": "unknown_error", "message": "Invalid JSON in response"}}'
+        == '{"id":1,"type":"result","success":false,"error":{"code":"unknown_error","message":"Invalid JSON in response"}}'
     )
     assert "Unable to serialize to JSON" in caplog.text
 
@@ -3,9 +3,13 @@
 from homeassistant.bootstrap import async_setup_component
 from homeassistant.components.websocket_api.auth import TYPE_AUTH_REQUIRED
 from homeassistant.components.websocket_api.http import URL
+from homeassistant.components.websocket_api.sensor import SCAN_INTERVAL
+import homeassistant.util.dt as dt_util
 
 from .test_auth import test_auth_active_with_token
 
+from tests.common import async_fire_time_changed
+
 
 async def test_websocket_api(hass, aiohttp_client, hass_access_token, legacy_auth):
     """Test API streams."""
@@ -30,9 +34,24 @@ async def test_websocket_api(hass, aiohttp_client, hass_access_token, legacy_aut
 
     state = hass.states.get("sensor.connected_clients")
     assert state.state == "1"
+    bytes_sent = state.attributes["bytes_sent"]
+    assert state.attributes["bytes_sent_on_wire"] > 0
+    assert len(state.attributes["connections"]) == 1
+    assert state.attributes["connections"][0]["bytes_sent"] == bytes_sent
+
+    # The bytes sent are updated periodically
+    await ws.send_json({"id": 5, "type": "ping"})
+    await ws.receive_json()
+    async_fire_time_changed(hass, dt_util.utcnow() + SCAN_INTERVAL)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.connected_clients")
+    assert state.attributes["bytes_sent"] > bytes_sent
+    assert state.attributes["connections"][0]["bytes_sent"] > bytes_sent
 
     await ws.close()
     await hass.async_block_till_done()
 
     state = hass.states.get("sensor.connected_clients")
     assert state.state == "0"
+    assert state.attributes["connections"] == []
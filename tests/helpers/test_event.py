@@ -1587,6 +1587,72 @@ async def test_track_template_rate_limit(hass):
     assert refresh_runs == [0, 1, 2, 4]
 
 
+async def test_track_template_coalesces_renders(hass):
+    """Test changes in the same loop iteration re-render a template once more."""
+    template_refresh = Template("{{ states('sensor.one') }}", hass)
+    hass.states.async_set("sensor.one", 0)
+
+    refresh_runs = []
+
+    @ha.callback
+    def refresh_listener(event, updates):
+        refresh_runs.append(updates.pop().result)
+
+    info = async_track_template_result(
+        hass, [TrackTemplate(template_refresh, None)], refresh_listener
+    )
+    await hass.async_block_till_done()
+
+    for value in range(1, 11):
+        hass.states.async_set("sensor.one", value)
+    assert refresh_runs == []
+    await hass.async_block_till_done()
+    # The first change renders the latest state, the coalesced re-render
+    # for the other nine changes has the same result
+    assert refresh_runs == [10]
+
+    hass.states.async_set("sensor.one", 11)
+    await hass.async_block_till_done()
+    assert refresh_runs == [10, 11]
+
+    stats = info.render_stats["{{ states('sensor.one') }}"]
+    assert stats.renders == 3
+    assert stats.coalesced == 9
+    assert stats.render_time > 0
+
+
+async def test_track_template_min_interval(hass):
+    """Test the minimum interval also applies to referenced entities."""
+    template_refresh = Template("{{ states('sensor.one') }}", hass)
+
+    refresh_runs = []
+
+    @ha.callback
+    def refresh_listener(event, updates):
+        refresh_runs.append(updates.pop().result)
+
+    async_track_template_result(
+        hass,
+        [TrackTemplate(template_refresh, None, min_interval=timedelta(seconds=0.1))],
+        refresh_listener,
+    )
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.one", 1)
+    await hass.async_block_till_done()
+    assert refresh_runs == [1]
+    hass.states.async_set("sensor.one", 2)
+    await hass.async_block_till_done()
+    assert refresh_runs == [1]
+    next_time = dt_util.utcnow() + timedelta(seconds=0.125)
+    with patch(
+        "homeassistant.helpers.ratelimit.dt_util.utcnow", return_value=next_time
+    ):
+        async_fire_time_changed(hass, next_time)
+        await hass.async_block_till_done()
+    assert refresh_runs == [1, 2]
+
+
 async def test_track_template_rate_limit_suppress_listener(hass):
     """Test template rate limit will suppress the listener during the rate limit."""
     template_refresh = Template("{{ states | count }}", hass)
@@ -1,9 +1,12 @@
 """Test Safegate Pro remote methods and classes."""
 from datetime import timedelta
+import json
+import math
 
 import pytest
 
 from homeassistant import core
+from homeassistant.helpers import json as json_helper
 from homeassistant.helpers.json import ExtendedJSONEncoder, JSONEncoder
 from homeassistant.util import dt as dt_util
 
@@ -63,3 +66,34 @@ def test_trace_json_encoder(hass):
     # Default method falls back to repr(o)
     o = object()
     assert ha_json_enc.default(o) == {"__type": str(type(o)), "repr": repr(o)}
+
+
+@pytest.mark.parametrize(
+    "dumps", [json_helper._stdlib_dumps, json_helper._orjson_dumps]
+)
+def test_json_dumps(dumps):
+    """Test both JSON backends serialize the same way."""
+    state = core.State("test.test", "hello", {"nan": float("nan")})
+    now = dt_util.utcnow()
+
+    assert json.loads(dumps({"state": state, "now": now, "set": {1}, 1: "é"})) == {
+        "state": {**state.as_dict(), "attributes": {"nan": None}},
+        "now": now.isoformat(),
+        "set": [1],
+        "1": "é",
+    }
+    assert dumps({"a": [1], "b": 2 ** 70}) == '{"a":[1],"b":1180591620717411303424}'
+    assert dumps({"a": [1]}, indent=True) == '{\n  "a": [\n    1\n  ]\n}'
+
+    with pytest.raises(TypeError):
+        dumps({"a": object()})
+
+
+def test_json_loads():
+    """Test the JSON codec decodes strings and bytes."""
+    assert json_helper.json_loads('{"a": [1, null]}') == {"a": [1, None]}
+    assert json_helper.json_loads(b'{"a":"\xc3\xa9"}') == {"a": "é"}
+    # Written by the json module with its defaults
+    data = json_helper.json_loads('{"a": NaN, "b": Infinity}')
+    assert math.isnan(data["a"])
+    assert data["b"] == float("inf")
@@ -0,0 +1,166 @@
+"""Tests for the polling scheduler."""
+import asyncio
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+from homeassistant.helpers import polling
+import homeassistant.util.dt as dt_util
+
+from tests.common import (
+    MockEntity,
+    MockEntityPlatform,
+    MockPlatform,
+    async_fire_time_changed,
+)
+
+SCAN_INTERVAL = timedelta(seconds=20)
+
+
+async def test_polls_spread_over_scan_interval(hass):
+    """Test the entities of a platform are polled at different phases."""
+    platform = MockEntityPlatform(hass, scan_interval=SCAN_INTERVAL)
+    ent1 = MockEntity(should_poll=True)
+    ent1.async_update = Mock()
+    ent2 = MockEntity(should_poll=True)
+    ent2.async_update = Mock()
+    await platform.async_add_entities([ent1, ent2])
+
+    now = dt_util.utcnow()
+    async_fire_time_changed(hass, now + SCAN_INTERVAL / 2)
+    await hass.async_block_till_done()
+
+    assert not ent1.async_update.called
+    assert len(ent2.async_update.mock_calls) == 1
+
+    async_fire_time_changed(hass, now + SCAN_INTERVAL)
+    await hass.async_block_till_done()
+
+    assert len(ent1.async_update.mock_calls) == 1
+    assert len(ent2.async_update.mock_calls) == 1
+
+    async_fire_time_changed(hass, now + SCAN_INTERVAL * 2)
+    await hass.async_block_till_done()
+
+    assert len(ent1.async_update.mock_calls) == 2
+    assert len(ent2.async_update.mock_calls) == 2
+    assert polling.async_get(hass).async_stats()["test_domain.test_platform"] == {
+        "polls": 4,
+        "overruns": 0,
+        "average_duration": 0.0,
+        "max_duration": 0.0,
+    }
+
+
+async def test_stop_polling_removed_entities(hass):
+    """Test the scheduler stops polling removed entities and platforms."""
+    platform = MockEntityPlatform(hass, scan_interval=SCAN_INTERVAL)
+    ent1 = MockEntity(should_poll=True)
+    ent1.async_update = Mock()
+    ent2 = MockEntity(should_poll=True)
+    ent2.async_update = Mock()
+    await platform.async_add_entities([ent1, ent2])
+
+    await ent2.async_remove()
+    async_fire_time_changed(hass, dt_util.utcnow() + SCAN_INTERVAL)
+    await hass.async_block_till_done()
+
+    assert len(ent1.async_update.mock_calls) == 1
+    assert not ent2.async_update.called
+
+    await platform.async_reset()
+    async_fire_time_changed(hass, dt_util.utcnow() + SCAN_INTERVAL * 2)
+    await hass.async_block_till_done()
+
+    assert len(ent1.async_update.mock_calls) == 1
+    assert polling.async_get(hass)._phases == {}
+
+
+async def test_backoff_after_overrun(hass, caplog):
+    """Test an entity whose update overruns the scan interval backs off."""
+    platform = MockEntityPlatform(hass, scan_interval=SCAN_INTERVAL)
+    ent = MockEntity(should_poll=True)
+    ent.async_update = Mock()
+    await platform.async_add_entities([ent])
+    now = dt_util.utcnow()
+
+    with patch("homeassistant.helpers.polling.monotonic", side_effect=[0, 30]):
+        async_fire_time_changed(hass, now + SCAN_INTERVAL)
+        await hass.async_block_till_done()
+
+    assert len(ent.async_update.mock_calls) == 1
+    assert f"Updating {ent.entity_id} took 30.0 seconds" in caplog.text
+    assert polling.async_get(hass).async_stats()["test_domain.test_platform"] == {
+        "polls": 1,
+        "overruns": 1,
+        "average_duration": 30.0,
+        "max_duration": 30.0,
+    }
+
+    async_fire_time_changed(hass, now + SCAN_INTERVAL * 2)
+    await hass.async_block_till_done()
+    assert len(ent.async_update.mock_calls) == 1
+
+    async_fire_time_changed(hass, now + SCAN_INTERVAL * 3)
+    await hass.async_block_till_done()
+    assert len(ent.async_update.mock_calls) == 2
+
+    # Polls that finish in time reset the backoff
+    async_fire_time_changed(hass, now + SCAN_INTERVAL * 4)
+    await hass.async_block_till_done()
+    assert len(ent.async_update.mock_calls) == 3
+
+
+async def test_keep_polling_after_error(hass, caplog):
+    """Test an entity is still polled after an update raised."""
+    platform = MockEntityPlatform(hass, scan_interval=SCAN_INTERVAL)
+    ent = MockEntity(should_poll=True)
+    ent.async_update = Mock()
+    await platform.async_add_entities([ent])
+    now = dt_util.utcnow()
+
+    with patch.object(ent, "_async_write_ha_state", side_effect=ValueError):
+        async_fire_time_changed(hass, now + SCAN_INTERVAL)
+        await hass.async_block_till_done()
+
+    assert len(ent.async_update.mock_calls) == 1
+    assert f"Error polling {ent.entity_id}" in caplog.text
+
+    async_fire_time_changed(hass, now + SCAN_INTERVAL * 2)
+    await hass.async_block_till_done()
+    assert len(ent.async_update.mock_calls) == 2
+
+
+async def test_poll_budget(hass):
+    """Test the polls of an integration are limited by its budget."""
+    platform = MockEntityPlatform(
+        hass, platform=MockPlatform(), scan_interval=SCAN_INTERVAL
+    )
+    platform.platform.POLL_BUDGET = 1
+    running = 0
+    max_running = 0
+    release = asyncio.Event()
+
+    async def async_update():
+        """Wait until the updates are released."""
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await release.wait()
+        running -= 1
+
+    entities = [MockEntity(should_poll=True) for _ in range(3)]
+    for ent in entities:
+        ent.async_update = async_update
+    await platform.async_add_entities(entities)
+
+    async_fire_time_changed(hass, dt_util.utcnow() + SCAN_INTERVAL)
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert running == 1
+    release.set()
+    await hass.async_block_till_done()
+
+    assert max_running == 1
+    assert polling.async_get(hass).async_stats()["test_domain.test_platform"][
+        "polls"
+    ] == len(entities)
@@ -0,0 +1,99 @@
+"""Tests for the profiling of templates, script steps and conditions."""
+from unittest.mock import patch
+
+from homeassistant.core import Context
+from homeassistant.helpers import condition, config_validation as cv, profiling, script
+from homeassistant.helpers.template import Template
+
+from tests.common import async_mock_service
+
+
+def test_call_timings():
+    """Test the timings of calls."""
+    call_timings = profiling.CallTimings()
+    assert call_timings.as_dict() == {"count": 0, "total": 0, "mean": 0, "p99": 0}
+
+    for elapsed in range(1, 201):
+        call_timings.record(elapsed / 1000)
+
+    timings = call_timings.as_dict()
+    assert timings["count"] == 200
+    assert round(timings["total"], 3) == 20.1
+    assert round(timings["mean"], 4) == 0.1005
+    # Only the most recent calls are sampled
+    assert timings["p99"] == 0.199
+
+
+def test_profiling_limits():
+    """Test timings are sorted by total time and the number of keys is bounded."""
+    timings = profiling.Profiling()
+    timings.record(profiling.CATEGORY_TEMPLATE, "fast", 0.001)
+    timings.record(profiling.CATEGORY_TEMPLATE, "slow", 0.1)
+    timings.record(profiling.CATEGORY_TEMPLATE, "fast", 0.001)
+
+    assert list(timings.as_dict()[profiling.CATEGORY_TEMPLATE]) == ["slow", "fast"]
+    assert list(timings.as_dict(1)[profiling.CATEGORY_TEMPLATE]) == ["slow"]
+
+    with patch.object(profiling, "MAX_KEYS", 2):
+        timings.record(profiling.CATEGORY_TEMPLATE, "other", 1)
+    assert "other" not in timings.as_dict()[profiling.CATEGORY_TEMPLATE]
+
+    timings.reset()
+    assert timings.as_dict() == {category: {} for category in profiling.CATEGORIES}
+
+
+async def test_profiling_records(hass):
+    """Test templates, conditions and script steps record their timings."""
+    hass.states.async_set("light.kitchen", "on")
+    async_mock_service(hass, "light", "turn_off")
+
+    Template("{{ states('light.kitchen') }}", hass).async_render()
+
+    test = await condition.async_from_config(
+        hass,
+        {
+            "alias": "Kitchen light on",
+            "condition": "state",
+            "entity_id": "light.kitchen",
+            "state": "on",
+        },
+    )
+    assert test(hass)
+
+    for config in (
+        {"condition": "state", "entity_id": "light.kitchen", "state": "on"},
+        {
+            "condition": "template",
+            "value_template": "{{ is_state('light.kitchen', 'on') }}",
+        },
+    ):
+        test = await condition.async_from_config(hass, config)
+        assert test(hass)
+
+    sequence = cv.SCRIPT_SCHEMA(
+        {"service": "light.turn_off", "alias": "Turn off kitchen"}
+    )
+    script_obj = script.Script(hass, sequence, "Test Name", "test_domain")
+    await script_obj.async_run(context=Context())
+    await hass.async_block_till_done()
+
+    timings = profiling.async_get(hass).as_dict()
+    assert timings["template"]["{{ states('light.kitchen') }}"]["count"] == 1
+    assert timings["condition"]["Kitchen light on"]["count"] == 1
+    assert timings["condition"]["state: light.kitchen"]["count"] == 1
+    assert (
+        timings["condition"]["template: {{ is_state('light.kitchen', 'on') }}"]["count"]
+        == 1
+    )
+    assert timings["script_step"]["Test Name: step 1 (Turn off kitchen)"]["count"] == 1
+
+
+async def test_profiling_script_step_waits(hass):
+    """Test the time script steps spend waiting is not recorded."""
+    sequence = cv.SCRIPT_SCHEMA({"delay": {"milliseconds": 100}, "alias": "Wait"})
+    script_obj = script.Script(hass, sequence, "Test Name", "test_domain")
+    await script_obj.async_run(context=Context())
+
+    timings = profiling.async_get(hass).as_dict()
+    assert timings["script_step"]["Test Name: step 1 (Wait)"]["count"] == 1
+    assert timings["script_step"]["Test Name: step 1 (Wait)"]["total"] < 0.1
@@ -4,6 +4,7 @@ import math
 import random
 from unittest.mock import patch
 
+from jinja2.sandbox import ImmutableSandboxedEnvironment
 import pytest
 import voluptuous as vol
 
@@ -2170,35 +2171,39 @@ def test_urlencode(hass):
     assert tpl.async_render() == "the%20quick%20brown%20fox%20%3D%20true"
 
 
-async def test_cache_garbage_collection():
-    """Test caching a template."""
+async def test_compiled_cache(hass):
+    """Test compiled templates are shared and kept after templates are deleted."""
     template_string = (
         "{% set dict = {'foo': 'x&y', 'bar': 42} %} {{ dict | urlencode }}"
     )
-    tpl = template.Template(
-        (template_string),
-    )
-    tpl.ensure_valid()
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
+    template._COMPILED_CACHE.clear()  # pylint: disable=protected-access
 
-    tpl2 = template.Template(
-        (template_string),
-    )
-    tpl2.ensure_valid()
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
+    with patch.object(
+        ImmutableSandboxedEnvironment,
+        "compile",
+        autospec=True,
+        side_effect=ImmutableSandboxedEnvironment.compile,
+    ) as compile_mock:
+        tpl = template.Template(template_string, hass)
+        tpl.ensure_valid()
+        tpl2 = template.Template(template_string, hass)
+        tpl2.ensure_valid()
+        assert compile_mock.call_count == 1
 
-    del tpl
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
-    del tpl2
-    assert not template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
+        # Survives the templates, as on reload
+        del tpl, tpl2
+        template.Template(template_string, hass).ensure_valid()
+        assert compile_mock.call_count == 1
+
+        # Environments of another kind compile their own
+        template.Template(template_string).ensure_valid()
+        assert compile_mock.call_count == 2
+
+        with patch.object(template, "COMPILED_CACHE_SIZE", 2):
+            template.Template("{{ 1 }}", hass).ensure_valid()
+            assert compile_mock.call_count == 3
+            template.Template(template_string, hass).ensure_valid()
+            assert compile_mock.call_count == 4
 
 
 def test_is_template_string():
@@ -2563,3 +2568,124 @@ async def test_undefined_variable(hass, caplog):
         "Template variable warning: 'no_such_variable' is undefined when rendering '{{ no_such_variable }}'"
         in caplog.text
     )
+
+
+def _cached_template(hass, template_str):
+    """Create a template that uses the render cache."""
+    tpl = template.Template(template_str, hass)
+    tpl.cache_renders = True
+    return tpl
+
+
+async def test_render_cache(hass):
+    """Test render results are cached until the states they read change."""
+    hass.states.async_set("sensor.temperature", "20")
+    hass.states.async_set("sensor.humidity", "50")
+    template_str = "{{ states('sensor.temperature') | int + 1 }}"
+    cache = template.async_get_render_cache(hass)
+
+    with patch(
+        "homeassistant.helpers.template._render_with_context",
+        wraps=template._render_with_context,
+    ) as render_mock:
+        assert _cached_template(hass, template_str).async_render() == 21
+        assert _cached_template(hass, template_str).async_render() == 21
+        assert render_mock.call_count == 1
+
+        hass.states.async_set("sensor.humidity", "60")
+        assert _cached_template(hass, template_str).async_render() == 21
+        assert render_mock.call_count == 1
+
+        hass.states.async_set("sensor.temperature", "21")
+        assert _cached_template(hass, template_str).async_render() == 22
+        assert render_mock.call_count == 2
+
+        # Variables are part of the key
+        assert _cached_template(hass, "{{ value + 1 }}").async_render({"value": 1}) == 2
+        assert _cached_template(hass, "{{ value + 1 }}").async_render({"value": 2}) == 3
+        assert render_mock.call_count == 4
+
+    assert cache.async_stats() == {
+        "hits": 2,
+        "misses": 4,
+        "uncacheable": 0,
+        "hit_rate": 0.333,
+        "size": 3,
+    }
+
+
+async def test_render_cache_domains(hass):
+    """Test cached renders of domains are invalidated by changes in the domain."""
+    hass.states.async_set("light.kitchen", "on")
+    template_str = "{{ states.light | selectattr('state', 'eq', 'on') | list | count }}"
+
+    assert _cached_template(hass, template_str).async_render() == 1
+    hass.states.async_set("light.living_room", "on")
+    assert _cached_template(hass, template_str).async_render() == 2
+    hass.states.async_set("light.kitchen", "off")
+    assert _cached_template(hass, template_str).async_render() == 1
+
+    template_str = "{{ states | count }}"
+    assert _cached_template(hass, template_str).async_render() == 2
+    hass.states.async_set("sensor.temperature", "20")
+    assert _cached_template(hass, template_str).async_render() == 3
+
+
+async def test_render_cache_not_cached(hass):
+    """Test renders that read the time or use unhashable variables are not cached."""
+    cache = template.async_get_render_cache(hass)
+
+    with patch(
+        "homeassistant.helpers.template._render_with_context",
+        wraps=template._render_with_context,
+    ) as render_mock:
+        _cached_template(hass, "{{ now() }}").async_render()
+        _cached_template(hass, "{{ now() }}").async_render()
+        assert render_mock.call_count == 2
+
+        hass.states.async_set("sensor.temperature", "20")
+        state = hass.states.get("sensor.temperature")
+        _cached_template(hass, "{{ state.state }}").async_render({"state": state})
+        assert render_mock.call_count == 3
+
+    assert cache.uncacheable == 1
+    assert cache.async_stats()["size"] == 0
+
+
+async def test_render_cache_untracked(hass):
+    """Test renders using values the cache does not track are not cached."""
+    cache = template.async_get_render_cache(hass)
+
+    with patch(
+        "homeassistant.helpers.template._render_with_context",
+        wraps=template._render_with_context,
+    ) as render_mock:
+        for template_str in (
+            "{{ [1, 2, 3] | random }}",
+            "{{ relative_time(as_datetime('2021-01-01T00:00:00+00:00')) }}",
+            "{{ device_entities('abcd') }}",
+        ):
+            _cached_template(hass, template_str).async_render()
+            _cached_template(hass, template_str).async_render()
+        assert render_mock.call_count == 6
+
+    assert cache.async_stats()["size"] == 0
+
+
+async def test_render_cache_render_info(hass):
+    """Test the states read by cached renders are added to the render info."""
+    hass.states.async_set("light.kitchen", "on")
+    template_str = (
+        "{{ is_state('sensor.temperature', '20') }} "
+        "{{ states.light | list | count }} {{ states.switch | count }}"
+    )
+
+    expected = render_to_info(hass, template_str)
+
+    for _ in range(2):
+        info = _cached_template(hass, template_str).async_render_to_info()
+        assert_result_info(info, "False 1 0", ["sensor.temperature"], ["light"])
+        assert info.domains_lifecycle == expected.domains_lifecycle
+        assert info.rate_limit == expected.rate_limit
+
+    assert template.async_get_render_cache(hass).hits == 1
@@ -3,6 +3,7 @@
 import asyncio
 from datetime import datetime, timedelta
 import functools
+import json
 import logging
 import os
 from tempfile import TemporaryDirectory
@@ -383,6 +384,29 @@ def test_state_as_dict():
     assert state.as_dict() is state.as_dict()
 
 
+def test_state_as_json():
+    """Test a State is serialized to JSON once."""
+    state = ha.State("happy.happy", "on", {"pig": "dog"})
+
+    assert json.loads(state.as_json()) == state.as_dict()
+    assert list(json.loads(state.as_json())) == list(state.as_dict())
+    assert state.as_json() is state.as_json()
+    assert state.attributes_json() == '{"pig":"dog"}'
+
+    # The JSON of unchanged attributes is shared with the next state
+    next_state = ha.State.from_trusted(
+        "happy.happy",
+        "off",
+        state.attributes,
+        state.last_changed,
+        state.last_updated,
+        ha.Context(),
+        state,
+    )
+    assert next_state.attributes_json() is state.attributes_json()
+    assert json.loads(next_state.as_json())["state"] == "off"
+
+
 async def test_eventbus_add_remove_listener(hass):
     """Test remove_listener method."""
     old_count = len(hass.bus.async_listeners())
@@ -728,6 +752,48 @@ async def test_statemachine_force_update(hass):
     assert len(events) == 1
 
 
+async def test_statemachine_shares_unchanged_data(hass):
+    """Test states of an entity share their strings and unchanged attributes."""
+    hass.states.async_set("light.bowl", "on", {"brightness": 144})
+    hass.states.async_set("light.ceiling", "on")
+    old_state = hass.states.get("light.bowl")
+
+    hass.states.async_set("light.bowl", "off", {"brightness": 144})
+    new_state = hass.states.get("light.bowl")
+
+    assert new_state.state == "off"
+    assert new_state.attributes is old_state.attributes
+    assert new_state.entity_id is old_state.entity_id
+    assert new_state.object_id is old_state.object_id
+    assert new_state.domain is hass.states.get("light.ceiling").domain
+
+    hass.states.async_set("light.bowl", "off", {"brightness": 100})
+    assert hass.states.get("light.bowl").attributes == {"brightness": 100}
+
+    with pytest.raises(InvalidStateError):
+        hass.states.async_set("light.bowl", "t" * 256)
+
+
+def test_state_from_trusted():
+    """Test creating a state from trusted values."""
+    now = dt_util.utcnow()
+    context = ha.Context()
+    state = ha.State.from_trusted(
+        "light.bowl", "on", {"brightness": 144}, now, now, context
+    )
+
+    assert state == ha.State("light.bowl", "on", {"brightness": 144}, context=context)
+    assert state.domain == "light"
+    assert state.object_id == "bowl"
+    assert state.last_changed == state.last_updated == now
+
+    next_state = ha.State.from_trusted(
+        "light.bowl", "off", state.attributes, now, now, context, state
+    )
+    assert next_state.attributes is state.attributes
+    assert next_state.entity_id is state.entity_id
+
+
 def test_service_call_repr():
     """Test ServiceCall repr."""
     call = ha.ServiceCall("homeassistant", "start")
@@ -1518,6 +1584,157 @@ async def test_async_entity_ids_count(hass):
     assert hass.states.async_entity_ids_count("light") == 3
 
 
+async def test_domain_filter_follows_removed_states(hass):
+    """Test domain filtered lookups drop removed states and keep new ones."""
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("LIGHT.Frog", "on")
+    hass.states.async_set("switch.link", "on")
+
+    hass.states.async_set("light.bowl", "off")
+    assert hass.states.async_entity_ids("Light") == ["light.bowl", "light.frog"]
+    assert [state.state for state in hass.states.async_all("light")] == ["off", "on"]
+
+    assert hass.states.async_remove("light.bowl")
+    assert hass.states.async_remove("switch.link")
+    assert hass.states.async_entity_ids("light") == ["light.frog"]
+    assert hass.states.async_entity_ids(["light", "switch"]) == ["light.frog"]
+    assert hass.states.async_entity_ids_count(("light", "switch")) == 1
+    assert hass.states.async_all("switch") == []
+    assert hass.states.async_entity_ids_count("switch") == 0
+
+    hass.states.async_set("switch.link", "off")
+    assert hass.states.async_entity_ids(["light", "switch"]) == [
+        "light.frog",
+        "switch.link",
+    ]
+
+
+async def test_eventbus_keyed_listeners(hass):
+    """Test keyed listeners are dispatched by the key of the event data."""
+    calls = []
+    domain_calls = []
+
+    @ha.callback
+    def listener(event):
+        calls.append(event)
+
+    @ha.callback
+    def domain_listener(event):
+        domain_calls.append(event)
+
+    def domain_key(event_data):
+        return event_data.get("domain")
+
+    unsub = hass.bus.async_listen_keyed("test_event", ["light.bowl"], listener)
+    unsub_domain = hass.bus.async_listen_keyed(
+        "test_event", ["light", MATCH_ALL], domain_listener, domain_key
+    )
+    assert hass.bus.async_listeners()["test_event"] == 2
+    assert hass.bus.async_keyed_listeners("test_event") == {"light.bowl": 1}
+    assert hass.bus.async_keyed_listeners("test_event", domain_key) == {
+        "light": 1,
+        MATCH_ALL: 1,
+    }
+
+    hass.bus.async_fire("test_event", {"entity_id": "light.bowl", "domain": "light"})
+    hass.bus.async_fire("test_event", {"entity_id": "light.frog", "domain": "switch"})
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+
+    assert [event.data["entity_id"] for event in calls] == ["light.bowl"]
+    assert [event.data["domain"] for event in domain_calls] == [
+        "light",
+        "light",
+        "switch",
+    ]
+
+    unsub()
+    unsub_domain()
+    assert "test_event" not in hass.bus.async_listeners()
+    assert hass.bus.async_keyed_listeners("test_event") == {}
+
+    hass.bus.async_fire("test_event", {"entity_id": "light.bowl", "domain": "light"})
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+    assert len(domain_calls) == 3
+
+
+async def test_eventbus_keyed_listeners_key_error(hass, caplog):
+    """Test a failing key getter is logged and skips only its own listeners."""
+    calls = []
+    domain_calls = []
+
+    def domain_key(event_data):
+        return event_data["domain"]
+
+    hass.bus.async_listen_keyed("test_event", ["light.bowl"], calls.append)
+    hass.bus.async_listen_keyed(
+        "test_event", ["light"], domain_calls.append, domain_key
+    )
+
+    hass.bus.async_fire("test_event", {"entity_id": "light.bowl"})
+    await hass.async_block_till_done()
+
+    assert len(calls) == 1
+    assert domain_calls == []
+    assert "Error getting the key of" in caplog.text
+
+
+async def test_eventbus_skips_events_without_listeners(hass):
+    """Test events without listeners are counted and not created."""
+    with patch.object(ha, "Event") as mock_event:
+        hass.bus.async_fire("test_event")
+        await hass.async_block_till_done()
+
+    assert not mock_event.called
+    assert hass.bus.async_event_stats()["test_event"] == {
+        "fired": 1,
+        "dispatched": 0,
+        "skipped": 1,
+        "coalesced": 0,
+    }
+
+    calls = async_capture_events(hass, "test_event")
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+
+    assert len(calls) == 1
+    assert hass.bus.async_event_stats()["test_event"] == {
+        "fired": 2,
+        "dispatched": 1,
+        "skipped": 1,
+        "coalesced": 0,
+    }
+
+
+async def test_eventbus_coalesce_events(hass):
+    """Test coalesced events only dispatch the latest pending event."""
+    calls = async_capture_events(hass, "test_event")
+    stop_coalescing = hass.bus.async_coalesce_events("test_event")
+
+    for idx in range(5):
+        hass.bus.async_fire("test_event", {"idx": idx})
+    await hass.async_block_till_done()
+
+    assert [event.data["idx"] for event in calls] == [4]
+    assert hass.bus.async_event_stats()["test_event"] == {
+        "fired": 5,
+        "dispatched": 1,
+        "skipped": 0,
+        "coalesced": 4,
+    }
+
+    hass.bus.async_fire("test_event", {"idx": 5})
+    stop_coalescing()
+    await hass.async_block_till_done()
+    assert [event.data["idx"] for event in calls] == [4, 5]
+
+    hass.bus.async_fire("test_event", {"idx": 6})
+    hass.bus.async_fire("test_event", {"idx": 7})
+    await hass.async_block_till_done()
+    assert [event.data["idx"] for event in calls] == [4, 5, 6, 7]
+
+
 async def test_hassjob_forbid_coroutine():
     """Test hassjob forbids coroutines."""
 